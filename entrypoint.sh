@@ -7,4 +7,16 @@ while ! nc -z $POSTGRES_HOST 5432; do
 done
 
 python manage.py migrate
-python manage.py runserver 0.0.0.0:8000
+
+# Sample data, only created once
+if [ -n "$SEED_SALES_RECORDS" ]; then
+  python manage.py seed_sales_data --records $SEED_SALES_RECORDS --if-empty
+fi
+
+# ASGI server, so the async views free their worker while waiting on the database and the cache
+# (uvicorn starts `WEB_CONCURRENCY` worker processes, one by default)
+if [ "$DEBUG" = "1" ]; then
+  exec uvicorn sales.asgi:application --host 0.0.0.0 --port 8000 --reload
+else
+  exec uvicorn sales.asgi:application --host 0.0.0.0 --port 8000
+fi
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 
-from .models import Product
+from .models import Product, ProductCategory
 
 
 @admin.register(Product)
@@ -22,3 +22,12 @@ class ProductAdmin(admin.ModelAdmin):
         return f'{obj.price:.2f}'
 
     get_price.short_description = _('price')
+
+
+@admin.register(ProductCategory)
+class ProductCategoryAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'name',
+    )
+    search_fields = ('name',)
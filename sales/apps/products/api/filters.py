@@ -0,0 +1,61 @@
+from typing import TYPE_CHECKING
+
+from django.utils.translation import gettext_lazy as _
+from django_filters import rest_framework as filters
+
+from sales.utils.filters import DateRangeFilterMixin
+
+from ..models import Product
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet  # pragma: no cover
+
+
+class ProductFilter(DateRangeFilterMixin):
+    category = filters.CharFilter(
+        method='filter_category',
+        label=_('Category'),
+        help_text=_('Filter products by category, matched as per `category_match`'),
+    )
+    category_match = filters.ChoiceFilter(
+        choices=Product.CategoryMatchChoices.choices,
+        method='filter_category_match',
+        label=_('Category match'),
+        help_text=_('How `category` is matched (default: contains)'),
+    )
+    start_date = filters.DateFilter(
+        method='filter_sales_date',
+        label=_('Start date (ISO 8601)'),
+        help_text=_('Summarizes the sales from this date (format: YYYY-MM-DD)'),
+    )
+    end_date = filters.DateFilter(
+        method='filter_sales_date',
+        label=_('End date (ISO 8601)'),
+        help_text=_('Summarizes the sales up to this date (format: YYYY-MM-DD)'),
+    )
+
+    class Meta:
+        model = Product
+        fields = [
+            'category',
+            'category_match',
+            'start_date',
+            'end_date',
+        ]
+
+    def filter_category(self, queryset: 'QuerySet[Product]', name, value):
+        if value:
+            match = (
+                self.form.cleaned_data.get('category_match')
+                or Product.CategoryMatchChoices.CONTAINS
+            )
+            queryset = queryset.filter_by_category(value, match=match)
+        return queryset
+
+    def filter_category_match(self, queryset: 'QuerySet[Product]', name, value):
+        # only tunes the `category` filter
+        return queryset
+
+    def filter_sales_date(self, queryset: 'QuerySet[Product]', name, value):
+        # only scopes the sales summaries, see `filter_date_range`
+        return queryset
@@ -0,0 +1,7 @@
+from rest_framework.routers import DefaultRouter
+
+from .views import ProductViewSet
+
+router = DefaultRouter()
+
+router.register(r'products', ProductViewSet, basename='products')
@@ -1,3 +1,6 @@
+from decimal import Decimal
+
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from ..models import Product
@@ -13,3 +16,28 @@ class ProductSerializer(serializers.ModelSerializer):
             'name',
             'category',
         ]
+
+
+class ProductSalesSummarySerializer(serializers.Serializer):
+    units_sold = serializers.IntegerField(help_text=_('The number of units sold'))
+    revenue = serializers.DecimalField(
+        max_digits=19,
+        decimal_places=2,
+        min_value=Decimal(0),
+        help_text=_('The total sales amount'),
+    )
+    last_sale_date = serializers.DateTimeField(
+        allow_null=True,
+        help_text=_('The date of the last sale, `null` without sales'),
+    )
+
+
+class ProductSalesSerializer(ProductSerializer):
+    sales = ProductSalesSummarySerializer(
+        source='sales_summary',
+        read_only=True,
+        help_text=_('Summary of the sales of the product in the requested date range'),
+    )
+
+    class Meta(ProductSerializer.Meta):
+        fields = ProductSerializer.Meta.fields + ['sales']
@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone as django_timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from sales.apps.sales.api.tests.mixins import AuthenticationTestMixin
+from sales.apps.sales.models import SalesRecord
+
+from ...models import Product
+from ..filters import ProductFilter
+
+
+class ProductAPITest(AuthenticationTestMixin, TestCase):
+    url_name = 'products-list'
+
+    def setUp(self):
+        self.client = APIClient()
+        super().setUp()
+
+        self.phone = Product.objects.create(name='Phone', category='Electronics', price=100)
+        self.cable = Product.objects.create(name='Cable', category='Accessories', price=10)
+        self.book = Product.objects.create(name='Book', category='Books', price=5)
+
+        self._create_sales_record(self.phone, 2, datetime(2024, 9, 1, 10))
+        self._create_sales_record(self.phone, 1, datetime(2024, 9, 15, 18))
+        self._create_sales_record(self.cable, 5, datetime(2024, 8, 20, 8))
+
+    def _create_sales_record(self, product, quantity_sold, date_of_sale):
+        return SalesRecord.objects.create(
+            product=product,
+            quantity_sold=quantity_sold,
+            total_sales_amount=product.price * quantity_sold,
+            date_of_sale=django_timezone.make_aware(date_of_sale, timezone.utc),
+        )
+
+    def _get_sales_by_name(self, response):
+        return {product['name']: product['sales'] for product in response.data['results']}
+
+    def test_list_sales_summaries(self):
+        response = self.client.get(reverse(self.url_name))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            [product['id'] for product in response.data['results']],
+            [str(self.phone.uuid), str(self.cable.uuid), str(self.book.uuid)],
+        )
+        sales = self._get_sales_by_name(response)
+        self.assertEqual(
+            sales['Phone'],
+            {
+                'units_sold': 3,
+                'revenue': Decimal('300.00'),
+                'last_sale_date': '2024-09-15T18:00:00Z',
+            },
+        )
+        self.assertEqual(sales['Cable']['units_sold'], 5)
+        self.assertEqual(
+            sales['Book'], {'units_sold': 0, 'revenue': Decimal('0.00'), 'last_sale_date': None}
+        )
+
+    def test_list_sales_summaries_in_one_query(self):
+        for index in range(10):
+            product = Product.objects.create(name=f'Product {index}', price=1)
+            self._create_sales_record(product, 1, datetime(2024, 9, 1))
+
+        # the user of the access token, the products page and their sales summaries
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse(self.url_name), {'page_size': 10})
+
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_list_sales_summaries_of_date_range(self):
+        response = self.client.get(
+            reverse(self.url_name), {'start_date': '2024-09-01', 'end_date': '2024-09-10'}
+        )
+
+        sales = self._get_sales_by_name(response)
+        self.assertEqual(sales['Phone']['units_sold'], 2)
+        self.assertEqual(sales['Phone']['last_sale_date'], '2024-09-01T10:00:00Z')
+        self.assertEqual(sales['Cable']['units_sold'], 0)
+        # products without sales in the range are listed too
+        self.assertEqual(len(sales), 3)
+
+    def test_sales_summaries_reuse_the_filters_of_the_products(self):
+        with patch.object(
+            ProductFilter, '__init__', autospec=True, side_effect=ProductFilter.__init__
+        ) as mock_init:
+            response = self.client.get(reverse(self.url_name), {'start_date': '2024-09-10'})
+
+        mock_init.assert_called_once()
+        self.assertEqual(self._get_sales_by_name(response)['Phone']['units_sold'], 1)
+
+    def test_list_invalid_date_range(self):
+        response = self.client.get(
+            reverse(self.url_name), {'start_date': '2024-09-10', 'end_date': '2024-09-01'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_filtered_by_category(self):
+        response = self.client.get(
+            reverse(self.url_name), {'category': 'electronics', 'category_match': 'contains'}
+        )
+        self.assertEqual(list(self._get_sales_by_name(response)), ['Phone'])
+
+    def test_list_keyset_pagination(self):
+        first_page = self.client.get(reverse(self.url_name), {'page_size': 2})
+        self.assertNotIn('count', first_page.data)
+        self.assertIsNone(first_page.data['previous'])
+        self.assertEqual(list(self._get_sales_by_name(first_page)), ['Phone', 'Cable'])
+
+        second_page = self.client.get(first_page.data['next'])
+        self.assertEqual(self._get_sales_by_name(second_page)['Book']['units_sold'], 0)
+        self.assertIsNone(second_page.data['next'])
+
+        previous_page = self.client.get(second_page.data['previous'])
+        self.assertEqual(previous_page.data['results'], first_page.data['results'])
+
+    def test_retrieve_sales_summary(self):
+        response = self.client.get(
+            reverse('products-detail', kwargs={'uuid': self.phone.uuid}),
+            {'start_date': '2024-09-10'},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'Phone')
+        self.assertEqual(response.data['sales']['units_sold'], 1)
+        self.assertEqual(response.data['sales']['revenue'], Decimal('100.00'))
@@ -0,0 +1,90 @@
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework.viewsets import ReadOnlyModelViewSet
+
+from sales.apps.sales.models import SalesRecord
+from sales.utils.api import get_schema_responses
+from sales.utils.filters import ViewFilterSetBackend
+from sales.utils.mixins import AuthenticatedViewMixin, ReplicaReadViewMixin
+from sales.utils.pagination import KeysetPagination
+
+from ..models import Product
+from .filters import ProductFilter
+from .serializers import ProductSalesSerializer
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet  # pragma: no cover
+
+
+class ProductPagination(KeysetPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('id',)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary='Products list',
+        description=(
+            'Fetch a keyset paginated list of `Product` entities, with the units sold, revenue '
+            'and last sale date of each product, optionally in a `start_date`/`end_date` range.'
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='cursor',
+                description='The pagination cursor value, from the `next`/`previous` links.',
+            ),
+        ],
+        responses=get_schema_responses(serializer_class=ProductSalesSerializer),
+    ),
+    retrieve=extend_schema(
+        summary='Products retrieve',
+        description=(
+            'Fetch a single `Product` entity by its UUID, with the units sold, revenue and last '
+            'sale date of the product, optionally in a `start_date`/`end_date` range.'
+        ),
+        responses=get_schema_responses(serializer_class=ProductSalesSerializer, detail=True),
+    ),
+)
+class ProductViewSet(ReplicaReadViewMixin, AuthenticatedViewMixin, ReadOnlyModelViewSet):
+    lookup_field = 'uuid'
+    queryset = Product.objects.order_by('id')
+    serializer_class = ProductSalesSerializer
+    pagination_class = ProductPagination
+    filter_backends = [ViewFilterSetBackend]
+    filterset_class = ProductFilter
+
+    empty_sales_summary = {'units_sold': 0, 'revenue': Decimal(0), 'last_sale_date': None}
+
+    def get_sales_queryset(self) -> 'QuerySet[SalesRecord]':
+        """
+        Returns the sales records summarized in the products sales, as per the request filters.
+        """
+
+        # validated when filtering the products
+        return self.filterset.filter_date_range(SalesRecord.objects.all())
+
+    def set_sales_summaries(self, products: 'list[Product]') -> None:
+        """
+        Sets the `sales_summary` of `products`, computed in a single grouped query.
+        """
+
+        sales_summaries = SalesRecord.get_product_sales_summaries(
+            [product.id for product in products], queryset=self.get_sales_queryset()
+        )
+        for product in products:
+            product.sales_summary = sales_summaries.get(product.id, self.empty_sales_summary)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            self.set_sales_summaries(page)
+        return page
+
+    def get_object(self):
+        product = super().get_object()
+        self.set_sales_summaries([product])
+        return product
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.1 on 2026-10-16 22:46
+
+from django.db import migrations, models
+
+CATEGORY_TRIGRAM_INDEX_NAME = 'products_category_trgm_idx'
+
+
+def create_category_trigram_index(apps, schema_editor):
+    # serves the case-insensitive `contains` category matches, which compile to
+    # `UPPER(category) LIKE UPPER(%s)`, hence the index on the expression
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            # contrib modules are not installed, matches fall back to a sequential scan
+            return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {CATEGORY_TRIGRAM_INDEX_NAME} '
+        'ON products_product USING gin (UPPER(category) gin_trgm_ops)'
+    )
+
+
+def drop_category_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(f'DROP INDEX IF EXISTS {CATEGORY_TRIGRAM_INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(
+                fields=['category'],
+                name='products_category_prefix_idx',
+                opclasses=['varchar_pattern_ops'],
+            ),
+        ),
+        migrations.RunPython(create_category_trigram_index, drop_category_trigram_index),
+    ]
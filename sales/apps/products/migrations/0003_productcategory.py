@@ -0,0 +1,39 @@
+# Generated by Django 5.1.1 on 2026-10-16 22:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_product_category_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductCategory',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                (
+                    'name',
+                    models.CharField(blank=True, max_length=255, unique=True, verbose_name='name'),
+                ),
+            ],
+            options={
+                'verbose_name': 'product category',
+                'verbose_name_plural': 'product categories',
+                'indexes': [
+                    models.Index(
+                        fields=['name'],
+                        name='products_cat_name_prefix_idx',
+                        opclasses=['varchar_pattern_ops'],
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+CATEGORY_NAME_TRIGRAM_INDEX_NAME = 'products_cat_name_trgm_idx'
+
+
+def create_category_name_trigram_index(apps, schema_editor):
+    # serves the case-insensitive `contains` category matches of the sales filters, which
+    # resolve categories by name, like `products_category_trgm_idx` for product categories
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            # contrib modules are not installed, matches fall back to a sequential scan
+            return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {CATEGORY_NAME_TRIGRAM_INDEX_NAME} '
+        'ON products_productcategory USING gin (UPPER(name) gin_trgm_ops)'
+    )
+
+
+def drop_category_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(f'DROP INDEX IF EXISTS {CATEGORY_NAME_TRIGRAM_INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_productcategory'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_category_name_trigram_index, drop_category_name_trigram_index),
+    ]
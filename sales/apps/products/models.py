@@ -1,11 +1,51 @@
 import uuid
+from typing import Iterable
 
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 
+def get_category_match_lookup(field_name: str, match: str) -> str:
+    """
+    Returns the lookup matching a category field as per `Product.CategoryMatchChoices`.
+    """
+
+    if match == Product.CategoryMatchChoices.EXACT:
+        return field_name
+
+    if match == Product.CategoryMatchChoices.PREFIX:
+        return f'{field_name}__startswith'
+
+    return f'{field_name}__icontains'
+
+
+class ProductQuerySet(models.QuerySet):
+    def filter_by_category(self, category: str, match: str = 'contains') -> 'ProductQuerySet':
+        """
+        Filters products by category, using the index matching each mode:
+        a trigram index for `contains`, a pattern ops btree for `prefix`
+        and the plain btree for `exact`.
+
+        Args:
+            category (`str`):
+                The category value to match.
+            match (`Product.CategoryMatchChoices`):
+                `contains` (case-insensitive partial match), `prefix` or `exact`.
+
+        Returns:
+            ProductQuerySet: The matching products.
+        """
+
+        return self.filter(**{get_category_match_lookup('category', match): category})
+
+
 class Product(models.Model):
+    class CategoryMatchChoices(models.TextChoices):
+        CONTAINS = 'contains', _('Contains (case-insensitive)')
+        PREFIX = 'prefix', _('Prefix')
+        EXACT = 'exact', _('Exact')
+
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     name = models.CharField(_('name'), max_length=255)
     # depending on business case, it might be better to use category as a separate entity relation
@@ -20,12 +60,85 @@ class Product(models.Model):
         validators=[MinValueValidator(0)],
     )
 
+    objects = ProductQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('product')
         verbose_name_plural = _('products')
+        # case-insensitive `contains` category matches (products API) are served by a trigram
+        # index on `UPPER(category)`, created in migrations for PostgreSQL only
         indexes = [
             models.Index(fields=['uuid']),
             models.Index(fields=['category']),
+            models.Index(
+                fields=['category'],
+                name='products_category_prefix_idx',
+                opclasses=['varchar_pattern_ops'],
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class ProductCategoryQuerySet(models.QuerySet):
+    def filter_by_name(self, name: str, match: str = 'contains') -> 'ProductCategoryQuerySet':
+        """
+        Filters categories by name, matched as per `Product.CategoryMatchChoices`.
+        """
+
+        return self.filter(**{get_category_match_lookup('name', match): name})
+
+    def get_ids(self, names: 'Iterable[str]') -> 'dict[str, int]':
+        """
+        Returns the ids of the categories with the given names, creating the missing ones.
+
+        Args:
+            names (`Iterable[str]`):
+                The category names to encode.
+
+        Returns:
+            dict[str, int]: The category ids, by name.
+        """
+
+        names = set(names)
+        ids = dict(self.filter(name__in=names).values_list('name', 'id'))
+
+        missing_names = names.difference(ids)
+        if missing_names:
+            # concurrent writers may create the same categories, so they are read back
+            self.bulk_create(
+                [self.model(name=name) for name in missing_names],
+                ignore_conflicts=True,
+            )
+            ids.update(self.filter(name__in=missing_names).values_list('name', 'id'))
+
+        return ids
+
+
+class ProductCategory(models.Model):
+    """
+    Dictionary of the distinct product category names.
+
+    Sales records reference the category of their product at the time of sale by its integer id,
+    so category filters and aggregations do not need to join and compare product category text.
+    """
+
+    name = models.CharField(_('name'), max_length=255, unique=True, blank=True)
+
+    objects = ProductCategoryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _('product category')
+        verbose_name_plural = _('product categories')
+        # like for `Product.category`, `contains` matches of the sales category filters are
+        # served by a trigram index on `UPPER(name)`, created in migrations for PostgreSQL only
+        indexes = [
+            models.Index(
+                fields=['name'],
+                name='products_cat_name_prefix_idx',
+                opclasses=['varchar_pattern_ops'],
+            ),
         ]
 
     def __str__(self) -> str:
@@ -1,7 +1,7 @@
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 
-from .models import Product
+from .models import Product, ProductCategory
 
 
 class ProductModelTest(TestCase):
@@ -30,3 +30,33 @@ class ProductModelTest(TestCase):
             price=-50.00,
         )
         self.assertEqual(str(product), 'Test Product')
+
+    def test_filter_by_category(self):
+        Product.objects.create(name='Phone', category='Electronics', price=10)
+        Product.objects.create(name='Cable', category='Electronics Accessories', price=1)
+        Product.objects.create(name='Book', category='Books', price=5)
+
+        cases = (
+            ('electronics', Product.CategoryMatchChoices.CONTAINS, {'Phone', 'Cable'}),
+            ('Electronics', Product.CategoryMatchChoices.PREFIX, {'Phone', 'Cable'}),
+            ('Electronics', Product.CategoryMatchChoices.EXACT, {'Phone'}),
+            ('electronics', Product.CategoryMatchChoices.EXACT, set()),
+        )
+        for category, match, expected_names in cases:
+            with self.subTest(category=category, match=match):
+                products = Product.objects.filter_by_category(category, match=match)
+                self.assertEqual(set(products.values_list('name', flat=True)), expected_names)
+
+
+class ProductCategoryModelTest(TestCase):
+    def test_get_ids(self):
+        existing = ProductCategory.objects.create(name='Books')
+
+        ids = ProductCategory.objects.get_ids(['Books', 'Electronics', 'Electronics'])
+
+        self.assertEqual(set(ids), {'Books', 'Electronics'})
+        self.assertEqual(ids['Books'], existing.id)
+        self.assertEqual(ids['Electronics'], ProductCategory.objects.get(name='Electronics').id)
+        self.assertEqual(
+            ProductCategory.objects.get_ids(['Electronics']), {'Electronics': ids['Electronics']}
+        )
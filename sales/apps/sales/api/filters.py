@@ -1,33 +1,39 @@
+from datetime import timedelta
+from decimal import Decimal
 from typing import TYPE_CHECKING
 
+from django import forms
+from django.conf import settings
+from django.db import connections, router
+from django.utils import timezone as django_timezone
 from django.utils.translation import gettext_lazy as _
 from django_filters import rest_framework as filters
 from rest_framework.exceptions import ValidationError
 
-from sales.utils.helpers import convert_date_to_utc
+from sales.apps.products.models import Product, ProductCategory
+from sales.utils.filters import DateRangeFilterMixin
 
-from ..models import SalesRecord
+from ..models import SalesRecord, SalesRecordDailyRollup, SalesRecordMonthlySummary
 
 if TYPE_CHECKING:
+    from django.db.backends.base.base import BaseDatabaseWrapper  # pragma: no cover
     from django.db.models import QuerySet  # pragma: no cover
 
 
-class SalesRecordFilter(filters.FilterSet):
-    start_date = filters.DateFilter(
-        method='filter_start_date',
-        label=_('Start date (ISO 8601)'),
-        help_text=_('Filters records from this date (format: YYYY-MM-DD)'),
-    )
-    end_date = filters.DateFilter(
-        method='filter_end_date',
-        label=_('End date (ISO 8601)'),
-        help_text=_('Filter records up to this date (format: YYYY-MM-DD)'),
-    )
+class SalesRecordFilter(DateRangeFilterMixin):
     category = filters.CharFilter(
-        field_name='product__category',
-        lookup_expr='icontains',
+        method='filter_category',
         label=_('Category'),
-        help_text=_('Filter records by partial match on their product category'),
+        help_text=_(
+            'Filter records by the category of their product at the time of sale '
+            '(not its current category), matched as per `category_match`'
+        ),
+    )
+    category_match = filters.ChoiceFilter(
+        choices=Product.CategoryMatchChoices.choices,
+        method='filter_category_match',
+        label=_('Category match'),
+        help_text=_('How `category` is matched (default: contains)'),
     )
 
     class Meta:
@@ -36,32 +42,39 @@ class SalesRecordFilter(filters.FilterSet):
             'start_date',
             'end_date',
             'category',
+            'category_match',
         ]
 
-    def filter_start_date(self, queryset: 'QuerySet[SalesRecord]', name, value):
+    def filter_category(self, queryset: 'QuerySet[SalesRecord]', name, value):
         if value:
-            start_datetime = convert_date_to_utc(date=value)
-            queryset = queryset.filter(date_of_sale__gte=start_datetime)
+            queryset = queryset.filter(category_id__in=self.get_category_ids())
         return queryset
 
-    def filter_end_date(self, queryset: 'QuerySet[SalesRecord]', name, value):
-        if value:
-            end_datetime = convert_date_to_utc(date=value, is_end_of_day=True)
-            queryset = queryset.filter(date_of_sale__lte=end_datetime)
+    def filter_category_match(self, queryset: 'QuerySet[SalesRecord]', name, value):
+        # only tunes the `category` filter
         return queryset
 
-    def filter_queryset(self, queryset: 'QuerySet[SalesRecord]'):
-        start_date = self.form.cleaned_data.get('start_date')
-        end_date = self.form.cleaned_data.get('end_date')
+    def get_category_ids(self) -> 'list[int]':
+        """
+        Resolves the `category` filter against the (small) category dictionary first, so the
+        sales records are filtered by their category at the time of sale with
+        `category_id IN (...)`, rather than a join evaluating the predicate for every record.
+        """
 
-        if start_date and end_date and start_date > end_date:
-            raise ValidationError(
-                detail={
-                    'start_date': ['Must be before or equal to end_date.'],
-                }
+        category = self.form.cleaned_data.get('category')
+        match = (
+            self.form.cleaned_data.get('category_match') or Product.CategoryMatchChoices.CONTAINS
+        )
+
+        return list(
+            ProductCategory.objects.filter_by_name(category, match=match).values_list(
+                'id', flat=True
             )
+        )
 
-        return super().filter_queryset(queryset)
+
+class IntegerFilter(filters.NumberFilter):
+    field_class = forms.IntegerField
 
 
 class SalesRecordAggregateFilter(SalesRecordFilter):
@@ -71,6 +84,45 @@ class SalesRecordAggregateFilter(SalesRecordFilter):
         method='filter_aggregate_by',
         label=_('Aggregation parameter'),
     )
+    approximate = filters.BooleanFilter(
+        method='filter_sampling',
+        label=_('Approximate'),
+        help_text=_(
+            'Estimate the aggregates from a random sample of the sales records, '
+            'with 95% confidence margins (PostgreSQL only, exact otherwise)'
+        ),
+    )
+    sample_percent = filters.NumberFilter(
+        method='filter_sampling',
+        min_value=Decimal('0.0001'),
+        max_value=Decimal(100),
+        label=_('Sample percent'),
+        help_text=_('Percentage of the sales records sampled in approximate mode'),
+    )
+    order_by = filters.ChoiceFilter(
+        choices=SalesRecord.AggregateOrderingChoices.choices,
+        method='filter_ordering',
+        label=_('Order by'),
+        help_text=_('Orders the groups by their value (default) or an aggregate, `-` descending'),
+    )
+    limit = IntegerFilter(
+        min_value=1,
+        method='filter_ordering',
+        label=_('Limit'),
+        help_text=_('Returns the first `limit` groups only'),
+    )
+    top = IntegerFilter(
+        min_value=1,
+        method='filter_ordering',
+        label=_('Top'),
+        help_text=_(
+            'Returns the `top` products or categories with the highest total sales, '
+            'like `order_by=-total_sales&limit=top` (`aggregate_by` product or category only)'
+        ),
+    )
+
+    # set when the aggregates are read from the materialized view
+    data_refreshed_at = None
 
     class Meta:
         model = SalesRecord
@@ -78,8 +130,178 @@ class SalesRecordAggregateFilter(SalesRecordFilter):
             'start_date',
             'end_date',
             'category',
+            'category_match',
             'aggregate_by',
+            'approximate',
+            'sample_percent',
+            'order_by',
+            'limit',
+            'top',
         ]
 
     def filter_aggregate_by(self, queryset: 'QuerySet[SalesRecord]', name: str, value: str):
+        if self.is_approximate():
+            return SalesRecord.get_approximate_data_aggregated_queryset(
+                queryset=queryset,
+                aggregate_by=value,
+                sample_percent=(
+                    self.form.cleaned_data.get('sample_percent')
+                    or settings.SALES_AGGREGATE_SAMPLE_PERCENT
+                ),
+                sample_method=settings.SALES_AGGREGATE_SAMPLE_METHOD,
+            )
+
         return SalesRecord.get_data_aggregated_queryset(queryset=queryset, aggregate_by=value)
+
+    def filter_sampling(self, queryset: 'QuerySet[SalesRecord]', name: str, value):
+        # only tunes the `aggregate_by` filter
+        return queryset
+
+    def filter_ordering(self, queryset: 'QuerySet[SalesRecord]', name: str, value):
+        # applied to the aggregated groups, see `order_groups`
+        return queryset
+
+    def validate_ordering(self):
+        top = self.form.cleaned_data.get('top')
+        if not top:
+            return
+
+        if self.form.cleaned_data.get('aggregate_by') not in SalesRecord.TOP_AGGREGATIONS:
+            raise ValidationError(
+                detail={
+                    'top': ['Only available with aggregate_by product or category.'],
+                }
+            )
+        if self.form.cleaned_data.get('limit'):
+            raise ValidationError(
+                detail={
+                    'top': ['Cannot be combined with limit.'],
+                }
+            )
+
+    def order_groups(self, queryset: 'QuerySet') -> 'QuerySet':
+        """
+        Orders and limits the aggregated groups of `queryset` in the database, so only
+        the requested groups are fetched and serialized.
+        """
+
+        top = self.form.cleaned_data.get('top')
+        order_by = self.form.cleaned_data.get('order_by') or (
+            SalesRecord.AggregateOrderingChoices.TOTAL_SALES_DESC if top else None
+        )
+        limit = top or self.form.cleaned_data.get('limit')
+
+        if order_by and order_by != SalesRecord.AggregateOrderingChoices.GROUP:
+            # ties are ordered by group, so limited results are deterministic
+            queryset = queryset.order_by(order_by, 'group')
+        if limit:
+            queryset = queryset[:limit]
+        return queryset
+
+    def get_read_connection(self) -> 'BaseDatabaseWrapper':
+        # the database the aggregations are read from, a replica for routed requests
+        return connections[router.db_for_read(SalesRecord)]
+
+    def is_approximate(self) -> bool:
+        # `TABLESAMPLE` is PostgreSQL specific, other databases answer exactly
+        return (
+            bool(self.form.cleaned_data.get('approximate'))
+            and self.get_read_connection().vendor == 'postgresql'
+        )
+
+    def can_use_rollup(self) -> bool:
+        """
+        Rollup rows are keyed by UTC day, so they can only answer requests
+        whose date boundaries and month buckets are UTC based.
+        """
+
+        return (
+            settings.SALES_AGGREGATE_USE_ROLLUP
+            and not self.is_approximate()
+            and self.form.cleaned_data.get('aggregate_by')
+            in SalesRecordDailyRollup.SUPPORTED_AGGREGATIONS
+            and django_timezone.get_current_timezone_name() == 'UTC'
+        )
+
+    def filter_rollup_queryset(self) -> 'QuerySet[SalesRecordDailyRollup]':
+        start_date = self.form.cleaned_data.get('start_date')
+        end_date = self.form.cleaned_data.get('end_date')
+        category = self.form.cleaned_data.get('category')
+
+        queryset = SalesRecordDailyRollup.objects.all()
+        if start_date:
+            queryset = queryset.filter(day__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(day__lte=end_date)
+        if category:
+            queryset = queryset.filter(category_id__in=self.get_category_ids())
+
+        return SalesRecordDailyRollup.get_data_aggregated_queryset(
+            queryset=queryset,
+            aggregate_by=self.form.cleaned_data['aggregate_by'],
+        )
+
+    def can_use_materialized_view(self) -> bool:
+        """
+        The materialized view holds UTC month totals, so it can only answer requests whose
+        date boundaries are whole UTC months, once it has been refreshed.
+        """
+
+        start_date = self.form.cleaned_data.get('start_date')
+        end_date = self.form.cleaned_data.get('end_date')
+
+        if not (
+            settings.SALES_AGGREGATE_USE_MATERIALIZED_VIEW
+            and self.get_read_connection().vendor == 'postgresql'
+            and not self.is_approximate()
+            and self.form.cleaned_data.get('aggregate_by')
+            in SalesRecordMonthlySummary.SUPPORTED_AGGREGATIONS
+            and django_timezone.get_current_timezone_name() == 'UTC'
+            and (not start_date or start_date.day == 1)
+            and (not end_date or (end_date + timedelta(days=1)).day == 1)
+        ):
+            return False
+
+        self.data_refreshed_at = SalesRecordMonthlySummary.objects.get_refreshed_at()
+        return self.data_refreshed_at is not None
+
+    def filter_materialized_view_queryset(self) -> 'QuerySet[SalesRecordMonthlySummary]':
+        start_date = self.form.cleaned_data.get('start_date')
+        end_date = self.form.cleaned_data.get('end_date')
+        category = self.form.cleaned_data.get('category')
+
+        queryset = SalesRecordMonthlySummary.objects.all()
+        if start_date:
+            queryset = queryset.filter(month__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(month__lte=end_date)
+        if category:
+            queryset = queryset.filter(category_id__in=self.get_category_ids())
+
+        return SalesRecordMonthlySummary.get_data_aggregated_queryset(
+            queryset=queryset,
+            aggregate_by=self.form.cleaned_data['aggregate_by'],
+        )
+
+    def filter_queryset(self, queryset: 'QuerySet[SalesRecord]'):
+        self.validate_ordering()
+        return self.order_groups(self.filter_groups(queryset))
+
+    def filter_groups(self, queryset: 'QuerySet[SalesRecord]') -> 'QuerySet':
+        """
+        Returns the aggregated groups, read from the materialized view or the rollup
+        when they can answer the request, otherwise aggregated from `queryset`.
+        """
+
+        if self.can_use_materialized_view():
+            self.validate_date_range()
+            if self.request is not None:
+                # reported by the view, the data is only as recent as the last refresh
+                self.request.data_refreshed_at = self.data_refreshed_at
+            return self.filter_materialized_view_queryset()
+
+        if self.can_use_rollup():
+            self.validate_date_range()
+            return self.filter_rollup_queryset()
+
+        return super().filter_queryset(queryset)
@@ -1,7 +1,14 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import SalesDataAggregateView, SalesRecordViewSet
+from .views import (
+    AsyncSalesDataAggregateView,
+    AsyncSalesRecordListView,
+    SalesDataAggregateView,
+    SalesRecordExportView,
+    SalesRecordIngestView,
+    SalesRecordViewSet,
+)
 
 router = DefaultRouter()
 
@@ -9,4 +16,12 @@ router.register(r'sales-data', SalesRecordViewSet, basename='sales-data')
 
 generic_routes = [
     path('sales-data/aggregate/', SalesDataAggregateView.as_view(), name='sales-data-aggregate'),
+    path('sales-data/ingest/', SalesRecordIngestView.as_view(), name='sales-data-ingest'),
+    path('sales-data/export/', SalesRecordExportView.as_view(), name='sales-data-export'),
+    path('async/sales-data/', AsyncSalesRecordListView.as_view(), name='async-sales-data-list'),
+    path(
+        'async/sales-data/aggregate/',
+        AsyncSalesDataAggregateView.as_view(),
+        name='async-sales-data-aggregate',
+    ),
 ]
@@ -1,6 +1,9 @@
-from datetime import datetime
+from datetime import date
 from decimal import Decimal
+from typing import Optional
+from uuid import UUID
 
+from django.db import models
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.utils import OpenApiExample, extend_schema_serializer
 from rest_framework import serializers
@@ -36,6 +39,63 @@ class SalesRecordSerializer(serializers.ModelSerializer):
         ]
 
 
+class SalesRecordValuesListSerializer(serializers.ListSerializer):
+    """
+    Serializes `values()` rows of `SalesRecordValuesSerializer.source_fields` into the same
+    representation as `SalesRecordSerializer`, building the dictionaries directly instead of
+    going through the (nested) fields of every row.
+    """
+
+    def to_representation(self, data):
+        fields = self.child.fields
+        # bound once per list, they convert values like the fields of `SalesRecordSerializer`
+        represent_amount = fields['total_sales_amount'].to_representation
+        represent_date_of_sale = fields['date_of_sale'].to_representation
+
+        rows = data.all() if isinstance(data, models.manager.BaseManager) else data
+        return [
+            {
+                'id': str(row['uuid']),
+                'product': (
+                    None
+                    if row['product__uuid'] is None
+                    else {
+                        'id': str(row['product__uuid']),
+                        'name': row['product__name'],
+                        'category': row['product__category'],
+                    }
+                ),
+                'quantity_sold': row['quantity_sold'],
+                'total_sales_amount': represent_amount(row['total_sales_amount']),
+                'date_of_sale': represent_date_of_sale(row['date_of_sale']),
+            }
+            for row in rows
+        ]
+
+
+class SalesRecordValuesSerializer(SalesRecordSerializer):
+    """
+    `SalesRecordSerializer` of lists of `values(*source_fields)` rows, which skip model
+    instantiation (and the decoding of the unused `product_snapshot` JSON).
+    Single records are serialized like by `SalesRecordSerializer`.
+    """
+
+    # `id` is the pagination key
+    source_fields = (
+        'id',
+        'uuid',
+        'product__uuid',
+        'product__name',
+        'product__category',
+        'quantity_sold',
+        'total_sales_amount',
+        'date_of_sale',
+    )
+
+    class Meta(SalesRecordSerializer.Meta):
+        list_serializer_class = SalesRecordValuesListSerializer
+
+
 @extend_schema_serializer(
     examples=[
         OpenApiExample(
@@ -46,6 +106,30 @@ class SalesRecordSerializer(serializers.ModelSerializer):
                 'average_price': '500.00',
             },
         ),
+        OpenApiExample(
+            _('Aggregated Sales Data by Week'),
+            value={
+                'group': '2024-W35',
+                'total_sales': '10000.00',
+                'average_price': '500.00',
+            },
+        ),
+        OpenApiExample(
+            _('Aggregated Sales Data by Quarter'),
+            value={
+                'group': '2024-Q3',
+                'total_sales': '10000.00',
+                'average_price': '500.00',
+            },
+        ),
+        OpenApiExample(
+            _('Aggregated Sales Data by Product'),
+            value={
+                'group': '3fa85f64-5717-4562-b3fc-2c963f66afa6',
+                'total_sales': '10000.00',
+                'average_price': '500.00',
+            },
+        ),
         OpenApiExample(
             _('Aggregated Sales Data by Category'),
             value={
@@ -70,10 +154,95 @@ class SalesDataAggregateSerializer(serializers.Serializer):
         min_value=Decimal(0),
         help_text=_('Average price of sales'),
     )
+    # only present in approximate mode, the 95% confidence interval of a value is `value ± margin`
+    total_sales_margin = serializers.DecimalField(
+        max_digits=19,
+        decimal_places=2,
+        required=False,
+        help_text=_('Margin of error of the estimated total sales (approximate mode)'),
+    )
+    average_price_margin = serializers.DecimalField(
+        max_digits=19,
+        decimal_places=2,
+        required=False,
+        help_text=_('Margin of error of the estimated average price (approximate mode)'),
+    )
+    sample_size = serializers.IntegerField(
+        required=False,
+        help_text=_('Number of sampled sales records of the group (approximate mode)'),
+    )
 
-    def get_group(self, obj: SalesRecord) -> str:
+    group_date_formats = {
+        SalesRecord.AggregateByChoices.DAY: '%Y-%m-%d',
+        SalesRecord.AggregateByChoices.WEEK: '%G-W%V',
+        SalesRecord.AggregateByChoices.MONTH: '%Y-%m',
+        SalesRecord.AggregateByChoices.YEAR: '%Y',
+    }
+
+    def get_group(self, obj: SalesRecord) -> Optional[str]:
         group = obj['group']
-        if isinstance(group, datetime):
-            return group.strftime('%Y-%m')
+        if isinstance(group, date):
+            aggregate_by = self.context.get('aggregate_by', SalesRecord.AggregateByChoices.MONTH)
+            if aggregate_by == SalesRecord.AggregateByChoices.QUARTER:
+                return f'{group.year}-Q{(group.month - 1) // 3 + 1}'
+
+            return group.strftime(self.group_date_formats.get(aggregate_by, '%Y-%m'))
+
+        if isinstance(group, UUID):
+            return str(group)
 
         return group
+
+
+class SalesRecordIngestSerializer(serializers.Serializer):
+    id = serializers.UUIDField(
+        help_text=_('Client generated sales record UUID, used for deduplication')
+    )
+    product = serializers.UUIDField(help_text=_('Product UUID'))
+    quantity_sold = serializers.IntegerField(min_value=1, help_text=_('Quantity sold'))
+    total_sales_amount = serializers.DecimalField(
+        max_digits=19,
+        decimal_places=4,
+        min_value=Decimal(0),
+        help_text=_('Total sales amount'),
+    )
+    date_of_sale = serializers.DateTimeField(help_text=_('Date of sale (ISO 8601)'))
+
+
+class SalesRecordIngestResultSerializer(serializers.Serializer):
+    received = serializers.IntegerField(help_text=_('Number of rows in the request body'))
+    created = serializers.IntegerField(help_text=_('Number of created sales records'))
+    duplicates = serializers.IntegerField(
+        help_text=_('Number of rows skipped because their `id` already exists')
+    )
+
+
+class SalesRecordExportRowSerializer(serializers.Serializer):
+    """
+    Flat representation of an exported `SalesRecord`, built from `values_list` rows
+    to avoid model instantiation for large exports.
+    """
+
+    source_fields = (
+        'uuid',
+        'product__uuid',
+        'product__name',
+        'product__category',
+        'quantity_sold',
+        'total_sales_amount',
+        'date_of_sale',
+    )
+
+    id = serializers.UUIDField()
+    product_id = serializers.UUIDField(allow_null=True)
+    product_name = serializers.CharField(allow_null=True)
+    product_category = serializers.CharField(allow_null=True)
+    quantity_sold = serializers.IntegerField()
+    total_sales_amount = serializers.DecimalField(max_digits=19, decimal_places=2)
+    date_of_sale = serializers.DateTimeField()
+
+    def to_row(self, values: tuple) -> dict:
+        return {
+            field_name: None if value is None else field.to_representation(value)
+            for (field_name, field), value in zip(self.fields.items(), values)
+        }
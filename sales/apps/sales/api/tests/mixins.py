@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from unittest.mock import call, patch
+from unittest.mock import patch
 
 from django.contrib.auth.models import User
 from django.core.cache import cache
@@ -9,7 +9,9 @@ from rest_framework import status
 from rest_framework_simplejwt.tokens import AccessToken
 
 from sales.apps.products.models import Product
+from sales.utils.cache import get_cache_generation
 
+from ...cache import SALESRECORD_API_CACHE_PREFIXES
 from ...models import SalesRecord
 
 
@@ -72,6 +74,49 @@ class SalesRecordAPITestMixin:
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(self._get_response_data(response=response)), 0)
 
+    def test_list_filtered_by_category_match(self):
+        cases = (
+            ({'category': 'test cat'}, 1),
+            ({'category': 'Test', 'category_match': 'prefix'}, 1),
+            ({'category': 'Category', 'category_match': 'prefix'}, 0),
+            ({'category': 'Test Category', 'category_match': 'exact'}, 1),
+            ({'category': 'test category', 'category_match': 'exact'}, 0),
+        )
+
+        for params, expected_count in cases:
+            with self.subTest(**params):
+                response = self.client.get(
+                    reverse(self.url_name),
+                    {**self._default_params, **params},
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(len(self._get_response_data(response=response)), expected_count)
+
+    def test_list_filtered_by_category_at_time_of_sale(self):
+        self.product.category = 'Other Category'
+        self.product.save()
+        cache.clear()
+
+        for category, expected_count in (('Test Category', 1), ('Other Category', 0)):
+            with self.subTest(category=category):
+                response = self.client.get(
+                    reverse(self.url_name),
+                    {**self._default_params, 'category': category, 'category_match': 'exact'},
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(len(self._get_response_data(response=response)), expected_count)
+
+    def test_list_invalid_category_match(self):
+        response = self.client.get(
+            reverse(self.url_name),
+            {
+                **self._default_params,
+                'category': 'Test',
+                'category_match': 'regex',
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_list_invalid_start_date(self):
         response = self.client.get(
             reverse(self.url_name),
@@ -157,14 +202,21 @@ class SalesRecordAPITestMixin:
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertEqual(len(self._get_response_data(response)), 0)
 
-    @patch('django.core.cache.cache.delete_pattern')
-    def test_cache_invalidation_on_create(self, mock_delete_pattern):
+    def _get_cache_generations(self):
+        return [get_cache_generation(prefix) for prefix in SALESRECORD_API_CACHE_PREFIXES]
+
+    def _assert_cache_generations_bumped(self, previous_generations):
+        for previous, current in zip(previous_generations, self._get_cache_generations()):
+            self.assertGreater(current, previous)
+
+    def test_cache_invalidation_on_create(self):
         cache.clear()
 
-        self.client.get(
+        response = self.client.get(
             reverse(self.url_name),
             self._default_params,
         )
+        generations = self._get_cache_generations()
         SalesRecord.objects.create(
             product=self.product,
             quantity_sold=10,
@@ -172,51 +224,55 @@ class SalesRecordAPITestMixin:
             date_of_sale=django_timezone.now(),
         )
 
-        mock_delete_pattern.assert_has_calls(
-            [
-                call('*api_salesrecord_list*'),
-                call('*api_salesdataaggregate_list*'),
-            ],
-            any_order=True,
+        self._assert_cache_generations_bumped(generations)
+        self.assertNotEqual(
+            self.client.get(reverse(self.url_name), self._default_params).data,
+            response.data,
         )
 
-    @patch('django.core.cache.cache.delete_pattern')
-    def test_cache_invalidation_on_update(self, mock_delete_pattern):
+    def test_cache_invalidation_on_update(self):
         cache.clear()
 
         self.client.get(
             reverse(self.url_name),
             self._default_params,
         )
+        generations = self._get_cache_generations()
         sales_record = SalesRecord.objects.last()
         sales_record.quantity_sold = 10
         sales_record.save()
 
-        mock_delete_pattern.assert_has_calls(
-            [
-                call('*api_salesrecord_list*'),
-                call('*api_salesdataaggregate_list*'),
-            ],
-            any_order=True,
-        )
+        self._assert_cache_generations_bumped(generations)
 
-    @patch('django.core.cache.cache.delete_pattern')
-    def test_cache_invalidation_on_delete(self, mock_delete_pattern):
+    def test_cache_invalidation_on_delete(self):
         cache.clear()
 
         self.client.get(
             reverse(self.url_name),
             self._default_params,
         )
+        generations = self._get_cache_generations()
         SalesRecord.objects.last().delete()
 
-        mock_delete_pattern.assert_has_calls(
-            [
-                call('*api_salesrecord_list*'),
-                call('*api_salesdataaggregate_list*'),
-            ],
-            any_order=True,
+        self._assert_cache_generations_bumped(generations)
+        self.assertEqual(
+            len(
+                self._get_response_data(
+                    self.client.get(reverse(self.url_name), self._default_params)
+                )
+            ),
+            0,
+        )
+
+    @patch('django.core.cache.cache.delete_pattern', create=True)
+    def test_cache_invalidation_does_not_scan_keyspace(self, mock_delete_pattern):
+        SalesRecord.objects.create(
+            product=self.product,
+            quantity_sold=10,
+            total_sales_amount=1000.00,
+            date_of_sale=django_timezone.now(),
         )
+        mock_delete_pattern.assert_not_called()
 
 
 class AuthenticationTestMixin:
@@ -0,0 +1,105 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ...models import SalesRecord
+from .mixins import AuthenticationTestMixin, SalesRecordAPITestMixin
+
+
+class AsyncSalesRecordAPITest(AuthenticationTestMixin, SalesRecordAPITestMixin, TestCase):
+    url_name = 'async-sales-data-list'
+
+    def setUp(self):
+        self.client = APIClient()
+        super().setUp()
+
+    def _create_records(self):
+        for index in range(25):
+            SalesRecord.objects.create(
+                product=self.product,
+                quantity_sold=5,
+                total_sales_amount=self.product.price * 5,
+                date_of_sale=timezone.now() - timezone.timedelta(hours=index // 5),
+            )
+
+    def test_list_matches_sync_view(self):
+        self._create_records()
+        cases = (
+            {'page_size': 10, 'page': 2},
+            {'page': 'last'},
+            {'pagination': 'cursor', 'page_size': 7},
+            {'category': 'Test', 'category_match': 'prefix'},
+        )
+
+        for params in cases:
+            with self.subTest(**params):
+                response = self.client.get(reverse(self.url_name), params)
+                sync_response = self.client.get(reverse('sales-data-list'), params)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.data.get('count'), sync_response.data.get('count'))
+                self.assertEqual(response.data['results'], sync_response.data['results'])
+                if response.data['next']:
+                    self.assertIn(reverse(self.url_name), response.data['next'])
+
+    def test_list_cursor_pagination(self):
+        self._create_records()
+        response = self.client.get(reverse(self.url_name), {'pagination': 'cursor'})
+        second_page = self.client.get(response.data['next'])
+
+        self.assertEqual(second_page.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(second_page.data['previous']).data, response.data)
+
+    def test_list_invalid_page(self):
+        response = self.client.get(reverse(self.url_name), {'page': 100})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_is_cached(self):
+        cache.clear()
+        response = self.client.get(reverse(self.url_name))
+        self.assertIn('max-age=1200', response['Cache-Control'])
+
+        with self.assertNumQueries(1):  # the user of the access token
+            cached_response = self.client.get(reverse(self.url_name))
+
+        self.assertEqual(cached_response.data, response.data)
+
+    def test_list_conditional_get(self):
+        cache.clear()
+        response = self.client.get(reverse(self.url_name))
+
+        with self.assertNumQueries(1):  # the user of the access token
+            not_modified_response = self.client.get(
+                reverse(self.url_name), headers={'If-None-Match': response['ETag']}
+            )
+
+        self.assertEqual(not_modified_response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified_response['ETag'], response['ETag'])
+
+
+class AsyncSalesDataAggregateAPITest(AuthenticationTestMixin, SalesRecordAPITestMixin, TestCase):
+    url_name = 'async-sales-data-aggregate'
+    default_aggregate_by = SalesRecord.AGGREGATE_BY_CHOICES.MONTH
+
+    def setUp(self):
+        self.client = APIClient()
+        super().setUp()
+
+    def test_required_aggregate_by_parameter(self):
+        response = self.client.get(reverse(self.url_name))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_aggregate_matches_sync_view(self):
+        for aggregate_by in SalesRecord.AggregateByChoices.values:
+            with self.subTest(aggregate_by=aggregate_by):
+                response = self.client.get(reverse(self.url_name), {'aggregate_by': aggregate_by})
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    response.data,
+                    self.client.get(
+                        reverse('sales-data-aggregate'), {'aggregate_by': aggregate_by}
+                    ).data,
+                )
@@ -1,12 +1,20 @@
+import gzip
 import random
+from unittest import skipUnless
+from unittest.mock import patch
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from ...models import SalesRecord
+from sales.apps.products.models import Product
+
+from ...models import SalesRecord, SalesRecordDailyRollup, SalesRecordMonthlySummary
 from .mixins import AuthenticationTestMixin, SalesRecordAPITestMixin
 
 
@@ -68,6 +76,35 @@ class SalesDataAggregateAPITest(AuthenticationTestMixin, SalesRecordAPITestMixin
         self.assertEquals('Test Category', response.data[0]['group'])
         self.assertIn('total_sales', response.data[0])
 
+    def test_aggregate_sales_group_formats(self):
+        # the record created in `setUp` was sold on Sunday 2024-09-01, UTC
+        expected_groups = {
+            'day': '2024-09-01',
+            'week': '2024-W35',
+            'month': '2024-09',
+            'quarter': '2024-Q3',
+            'year': '2024',
+            'product': str(self.product.uuid),
+            'category': 'Test Category',
+        }
+
+        for use_rollup in (True, False):
+            for aggregate_by, expected_group in expected_groups.items():
+                with self.subTest(aggregate_by=aggregate_by, use_rollup=use_rollup):
+                    with override_settings(SALES_AGGREGATE_USE_ROLLUP=use_rollup):
+                        response, _ = self._get_aggregate_queries({'aggregate_by': aggregate_by})
+
+                    self.assertEqual(
+                        response.json(),
+                        [
+                            {
+                                'group': expected_group,
+                                'total_sales': 500.0,
+                                'average_price': 100.0,
+                            }
+                        ],
+                    )
+
     def test_aggregate_sales_with_zero_values(self):
         SalesRecord.objects.create(
             product=self.product,
@@ -104,3 +141,284 @@ class SalesDataAggregateAPITest(AuthenticationTestMixin, SalesRecordAPITestMixin
             record for record in response.data if record.get('product') is None
         ]
         self.assertTrue(len(missing_product_records) > 0)
+
+    def _get_aggregate_queries(self, params):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse(self.url_name), params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, ' '.join(query['sql'] for query in context.captured_queries)
+
+    def test_aggregate_served_from_rollup(self):
+        rollup_table = SalesRecordDailyRollup._meta.db_table
+        raw_table = SalesRecord._meta.db_table
+
+        for aggregate_by in SalesRecord.AggregateByChoices.values:
+            response, sql = self._get_aggregate_queries(
+                {'aggregate_by': aggregate_by, 'start_date': '2024-09-01'}
+            )
+            self.assertIn(rollup_table, sql)
+            self.assertNotIn(f'FROM "{raw_table}"', sql)
+            self.assertEqual(len(response.data), 1)
+
+    def test_aggregate_rollup_matches_raw_fallback(self):
+        for _ in range(50):
+            quantity_sold = random.randint(1, 10)
+            SalesRecord.objects.create(
+                product=self.product,
+                quantity_sold=quantity_sold,
+                total_sales_amount=self.product.price * quantity_sold,
+                date_of_sale=timezone.now() - timezone.timedelta(days=random.randint(1, 90)),
+            )
+
+        for aggregate_by in SalesRecord.AggregateByChoices.values:
+            params = {'aggregate_by': aggregate_by, 'category': 'test'}
+            rollup_response, _ = self._get_aggregate_queries(params)
+            with override_settings(SALES_AGGREGATE_USE_ROLLUP=False):
+                raw_response, sql = self._get_aggregate_queries(params)
+
+            self.assertNotIn(SalesRecordDailyRollup._meta.db_table, sql)
+            self.assertEqual(rollup_response.json(), raw_response.json())
+
+    def test_aggregate_non_utc_timezone_uses_raw_table(self):
+        with timezone.override('Europe/Sofia'):
+            _, sql = self._get_aggregate_queries({'aggregate_by': 'month'})
+
+        self.assertNotIn(SalesRecordDailyRollup._meta.db_table, sql)
+
+    @skipUnless(connection.vendor == 'postgresql', 'Materialized views require PostgreSQL')
+    @override_settings(SALES_AGGREGATE_USE_MATERIALIZED_VIEW=True)
+    def test_aggregate_served_from_materialized_view(self):
+        view_table = SalesRecordMonthlySummary._meta.db_table
+        params = {'aggregate_by': 'month', 'start_date': '2024-09-01', 'end_date': '2024-09-30'}
+
+        # never refreshed
+        response, sql = self._get_aggregate_queries(params)
+        self.assertNotIn(f'FROM "{view_table}"', sql)
+        self.assertNotIn('X-Data-Refreshed-At', response)
+
+        refreshed_at = SalesRecordMonthlySummary.objects.refresh()
+        SalesRecord.objects.create(
+            product=self.product,
+            quantity_sold=1,
+            total_sales_amount=100,
+            date_of_sale=timezone.now(),
+        )
+
+        for aggregate_by in SalesRecordMonthlySummary.SUPPORTED_AGGREGATIONS:
+            params = {'aggregate_by': aggregate_by, 'category': 'test'}
+            response, sql = self._get_aggregate_queries(params)
+            self.assertIn(view_table, sql)
+            self.assertEqual(response['X-Data-Refreshed-At'], refreshed_at.isoformat())
+            # the record created after the refresh is missing
+            self.assertEqual(len(response.data), 1)
+
+            with override_settings(SALES_AGGREGATE_USE_MATERIALIZED_VIEW=False):
+                raw_response, _ = self._get_aggregate_queries({**params, 'end_date': '2024-09-30'})
+            self.assertEqual(response.json(), raw_response.json())
+
+        # not whole months
+        response, sql = self._get_aggregate_queries(
+            {'aggregate_by': 'month', 'end_date': '2024-09-15'}
+        )
+        self.assertNotIn(f'FROM "{view_table}"', sql)
+        response, sql = self._get_aggregate_queries({'aggregate_by': 'day'})
+        self.assertNotIn(f'FROM "{view_table}"', sql)
+
+    @skipUnless(connection.vendor == 'postgresql', 'Table sampling requires PostgreSQL')
+    def test_aggregate_approximate_samples_raw_table(self):
+        response, sql = self._get_aggregate_queries(
+            {'aggregate_by': 'month', 'approximate': 'true', 'sample_percent': '5'}
+        )
+
+        self.assertIn('TABLESAMPLE SYSTEM', sql)
+        self.assertNotIn(SalesRecordDailyRollup._meta.db_table, sql)
+
+    @skipUnless(connection.vendor == 'postgresql', 'Table sampling requires PostgreSQL')
+    def test_aggregate_approximate_full_sample_matches_exact(self):
+        for _ in range(20):
+            quantity_sold = random.randint(1, 10)
+            SalesRecord.objects.create(
+                product=self.product,
+                quantity_sold=quantity_sold,
+                total_sales_amount=self.product.price * quantity_sold,
+                date_of_sale=timezone.now() - timezone.timedelta(days=random.randint(1, 90)),
+            )
+
+        for aggregate_by in ('month', 'category', 'product'):
+            exact_response, _ = self._get_aggregate_queries({'aggregate_by': aggregate_by})
+            approximate_response, _ = self._get_aggregate_queries(
+                {'aggregate_by': aggregate_by, 'approximate': 'true', 'sample_percent': '100'}
+            )
+
+            for exact_group, approximate_group in zip(
+                exact_response.json(), approximate_response.json(), strict=True
+            ):
+                self.assertEqual(approximate_group['total_sales_margin'], 0)
+                self.assertEqual(approximate_group['average_price_margin'], 0)
+                self.assertGreater(approximate_group['sample_size'], 0)
+                self.assertEqual(
+                    exact_group,
+                    {
+                        key: value
+                        for key, value in approximate_group.items()
+                        if key not in ('total_sales_margin', 'average_price_margin', 'sample_size')
+                    },
+                )
+
+    def test_aggregate_invalid_sample_percent(self):
+        for sample_percent in ('0', '101', 'abc'):
+            response = self.client.get(
+                reverse(self.url_name),
+                {'aggregate_by': 'month', 'approximate': 'true', 'sample_percent': sample_percent},
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _create_category_sales(self):
+        # `Test Category` has total sales of 500.00, at an average price of 100.00
+        for category, price, quantity_sold in (
+            ('Alpha', 20, 30),
+            ('Beta', 150, 2),
+            ('Gamma', 300, 3),
+        ):
+            product = Product.objects.create(name=category, category=category, price=price)
+            SalesRecord.objects.create(
+                product=product,
+                quantity_sold=quantity_sold,
+                total_sales_amount=price * quantity_sold,
+                date_of_sale=timezone.now(),
+            )
+
+    def test_aggregate_order_by_and_limit(self):
+        self._create_category_sales()
+
+        cases = (
+            ({'order_by': '-total_sales', 'limit': 2}, ['Gamma', 'Alpha']),
+            ({'order_by': 'total_sales'}, ['Beta', 'Test Category', 'Alpha', 'Gamma']),
+            ({'order_by': '-average_price', 'limit': 3}, ['Gamma', 'Beta', 'Test Category']),
+            ({'order_by': 'group', 'limit': 1}, ['Alpha']),
+            ({'top': 2}, ['Gamma', 'Alpha']),
+            ({'top': 2, 'order_by': 'average_price'}, ['Alpha', 'Test Category']),
+        )
+        # from the rollup and from the sales records
+        for use_rollup in (True, False):
+            for params, expected_groups in cases:
+                with (
+                    self.subTest(use_rollup=use_rollup, **params),
+                    override_settings(SALES_AGGREGATE_USE_ROLLUP=use_rollup),
+                ):
+                    cache.clear()
+                    response = self.client.get(
+                        reverse(self.url_name), {'aggregate_by': 'category', **params}
+                    )
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    self.assertEqual([group['group'] for group in response.data], expected_groups)
+
+    def test_aggregate_invalid_ordering(self):
+        for params in (
+            {'aggregate_by': 'month', 'top': 10},
+            {'aggregate_by': 'product', 'top': 10, 'limit': 5},
+            {'aggregate_by': 'product', 'limit': 0},
+            {'aggregate_by': 'product', 'order_by': 'quantity_sold'},
+        ):
+            with self.subTest(**params):
+                response = self.client.get(reverse(self.url_name), params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_equivalent_queries_share_cache_entry(self):
+        cache.clear()
+        response = self.client.get(
+            f'{reverse(self.url_name)}?start_date=2024-09-01&aggregate_by=month&category='
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(1):  # the user of the access token
+            cached_response = self.client.get(
+                f'{reverse(self.url_name)}?aggregate_by=month&start_date=2024-9-1'
+            )
+
+        self.assertEqual(cached_response.data, response.data)
+
+    def test_conditional_get(self):
+        cache.clear()
+        response = self.client.get(reverse(self.url_name), self._default_params)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+
+        with self.assertNumQueries(1):  # the user of the access token
+            not_modified_response = self.client.get(
+                reverse(self.url_name), self._default_params, headers={'If-None-Match': etag}
+            )
+        self.assertEqual(not_modified_response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified_response.content, b'')
+        self.assertEqual(not_modified_response['ETag'], etag)
+        self.assertIn('max-age=1200', not_modified_response['Cache-Control'])
+
+        not_modified_response = self.client.get(
+            reverse(self.url_name),
+            self._default_params,
+            headers={'If-Modified-Since': response['Last-Modified']},
+        )
+        self.assertEqual(not_modified_response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # other queries have other versions
+        other_response = self.client.get(
+            reverse(self.url_name), {'aggregate_by': 'category'}, headers={'If-None-Match': etag}
+        )
+        self.assertEqual(other_response.status_code, status.HTTP_200_OK)
+
+        SalesRecord.objects.create(
+            product=self.product,
+            quantity_sold=10,
+            total_sales_amount=1000.00,
+            date_of_sale=timezone.now(),
+        )
+        modified_response = self.client.get(
+            reverse(self.url_name), self._default_params, headers={'If-None-Match': etag}
+        )
+        self.assertEqual(modified_response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(modified_response['ETag'], etag)
+
+    def test_cached_response_is_compressed(self):
+        cache.clear()
+        response = self.client.get(reverse(self.url_name), self._default_params)
+        self.assertNotIn('Content-Encoding', response)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        compressed_response = self.client.get(
+            reverse(self.url_name), self._default_params, headers={'Accept-Encoding': 'gzip, br'}
+        )
+        self.assertEqual(compressed_response['Content-Encoding'], 'gzip')
+        self.assertEqual(compressed_response['Content-Type'], 'application/json')
+        self.assertEqual(gzip.decompress(compressed_response.content), response.content)
+
+        browsable_response = self.client.get(
+            reverse(self.url_name),
+            self._default_params,
+            headers={'Accept': 'text/html', 'Accept-Encoding': 'gzip'},
+        )
+        self.assertNotIn('Content-Encoding', browsable_response)
+        self.assertEqual(browsable_response.data, response.data)
+
+    @override_settings(SALES_AGGREGATE_CACHE_STALE_TIMEOUT=60)
+    @patch('sales.utils.cache.run_in_background')
+    def test_stale_while_revalidate(self, mock_run_in_background):
+        cache.clear()
+        response = self.client.get(reverse(self.url_name), self._default_params)
+        SalesRecord.objects.create(
+            product=self.product,
+            quantity_sold=10,
+            total_sales_amount=1000.00,
+            date_of_sale=timezone.now(),
+        )
+
+        with self.assertNumQueries(1):  # the user of the access token
+            stale_response = self.client.get(reverse(self.url_name), self._default_params)
+        self.assertEqual(stale_response.data, response.data)
+        self.assertIn('max-age=0', stale_response['Cache-Control'])
+
+        mock_run_in_background.call_args.args[0]()
+        fresh_response = self.client.get(reverse(self.url_name), self._default_params)
+        self.assertNotEqual(fresh_response.data, response.data)
+        self.assertIn('max-age=1200', fresh_response['Cache-Control'])
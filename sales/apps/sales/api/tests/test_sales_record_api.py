@@ -1,12 +1,16 @@
 import random
+from decimal import Decimal
 
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 
 from ...models import SalesRecord
+from ..serializers import SalesRecordSerializer
 from ..views import PageBasedPagination
 from .mixins import AuthenticationTestMixin, SalesRecordAPITestMixin
 
@@ -84,3 +88,91 @@ class SalesRecordAPITest(AuthenticationTestMixin, SalesRecordAPITestMixin, TestC
             {'page': 'invalid'},
         )
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def _create_records_with_ties(self):
+        date_of_sale = timezone.now()
+        for index in range(25):
+            SalesRecord.objects.create(
+                product=self.product,
+                quantity_sold=5,
+                total_sales_amount=self.product.price * 5,
+                # groups of 5 records share the same date to exercise ordering ties
+                date_of_sale=date_of_sale - timezone.timedelta(hours=index // 5),
+            )
+
+    def test_list_cursor_pagination(self):
+        self._create_records_with_ties()
+        expected_ids = [
+            str(uuid)
+            for uuid in SalesRecord.objects.order_by('-date_of_sale', 'id').values_list(
+                'uuid', flat=True
+            )
+        ]
+
+        fetched_ids = []
+        response = self.client.get(
+            reverse(self.url_name),
+            {'pagination': 'cursor', 'page_size': 7},
+        )
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            fetched_ids += [record['id'] for record in response.data['results']]
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+
+        self.assertEqual(fetched_ids, expected_ids)
+
+    def test_list_cursor_pagination_previous_page(self):
+        self._create_records_with_ties()
+
+        first_page = self.client.get(
+            reverse(self.url_name),
+            {'pagination': 'cursor', 'page_size': 7},
+        )
+        self.assertIsNone(first_page.data['previous'])
+
+        second_page = self.client.get(first_page.data['next'])
+        previous_page = self.client.get(second_page.data['previous'])
+
+        self.assertEqual(previous_page.status_code, status.HTTP_200_OK)
+        self.assertEqual(previous_page.data['results'], first_page.data['results'])
+        self.assertIsNone(previous_page.data['previous'])
+        self.assertEqual(self.client.get(previous_page.data['next']).data, second_page.data)
+
+    def test_list_cursor_pagination_invalid_cursor(self):
+        response = self.client.get(
+            reverse(self.url_name),
+            {'pagination': 'cursor', 'cursor': 'invalid'},
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_page_pagination_is_default(self):
+        response = self.client.get(reverse(self.url_name))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('count', response.data)
+
+    def test_list_matches_model_serializer(self):
+        SalesRecord.objects.create(
+            product=None,
+            quantity_sold=3,
+            total_sales_amount=Decimal('10.125'),
+            date_of_sale=timezone.now() - timezone.timedelta(days=1),
+        )
+        SalesRecord.objects.create(
+            product=self.product,
+            quantity_sold=7,
+            total_sales_amount=Decimal('700.0049'),
+            date_of_sale=timezone.now().replace(microsecond=0),
+        )
+        records = SalesRecord.objects.select_related('product').order_by('-date_of_sale', 'id')
+
+        for time_zone in ('UTC', 'Europe/Sofia'):
+            with self.subTest(time_zone=time_zone), timezone.override(time_zone):
+                cache.clear()
+                response = self.client.get(reverse(self.url_name))
+                expected = JSONRenderer().render(SalesRecordSerializer(records, many=True).data)
+
+                self.assertEqual(JSONRenderer().render(response.data['results']), expected)
+                self.assertIsNone(response.data['results'][1]['product'])
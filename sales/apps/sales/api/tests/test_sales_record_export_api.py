@@ -0,0 +1,140 @@
+import csv
+import io
+import json
+import warnings
+from datetime import datetime, timezone
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from sales.apps.products.models import Product
+
+from ...models import SalesRecord
+from .mixins import AuthenticationTestMixin
+
+
+class SalesRecordExportAPITest(AuthenticationTestMixin, TestCase):
+    url_name = 'sales-data-export'
+
+    def setUp(self):
+        self.client = APIClient()
+        super().setUp()
+        self.product = Product.objects.create(
+            name='Test Product',
+            category='Test Category',
+            price=100.00,
+        )
+        self.other_product = Product.objects.create(
+            name='Other Product',
+            category='Other Category',
+            price=10.00,
+        )
+        for day in range(1, 11):
+            product = self.product if day % 2 else self.other_product
+            SalesRecord.objects.create(
+                product=product,
+                quantity_sold=day,
+                total_sales_amount=product.price * day,
+                date_of_sale=datetime(2024, 9, day, 12, 0, 0, tzinfo=timezone.utc),
+            )
+
+    def _get_content(self, response):
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_export_csv(self):
+        response = self.client.get(reverse(self.url_name))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+
+        rows = list(csv.DictReader(io.StringIO(self._get_content(response))))
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[0]['date_of_sale'], '2024-09-10T12:00:00Z')
+        self.assertEqual(rows[0]['product_category'], 'Other Category')
+        self.assertEqual(rows[0]['total_sales_amount'], '100.00')
+
+    async def test_export_streamed_by_asgi_application(self):
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.api_user)}'}
+
+        with warnings.catch_warnings():
+            # raised when the whole iterator is consumed before streaming
+            warnings.simplefilter('error')
+            response = await self.async_client.get(reverse(self.url_name), headers=headers)
+            # iterated like the ASGI handler, which the test client does not emulate
+            content = b''.join([chunk async for chunk in response])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = list(csv.DictReader(io.StringIO(content.decode('utf-8'))))
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[0]['date_of_sale'], '2024-09-10T12:00:00Z')
+
+    def test_export_ndjson_matches_list_endpoint(self):
+        response = self.client.get(reverse(self.url_name), {'format': 'ndjson'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+
+        rows = [json.loads(line) for line in self._get_content(response).splitlines()]
+        list_response = self.client.get(reverse('sales-data-list'), {'page_size': 100})
+        self.assertEqual(
+            [row['id'] for row in rows],
+            [record['id'] for record in list_response.data['results']],
+        )
+        self.assertEqual(rows[0]['total_sales_amount'], 100.0)
+        self.assertEqual(rows[0]['product_id'], str(self.other_product.uuid))
+
+    def test_export_filters(self):
+        response = self.client.get(
+            reverse(self.url_name),
+            {
+                'format': 'ndjson',
+                'start_date': '2024-09-03',
+                'end_date': '2024-09-06',
+                'category': 'other',
+            },
+        )
+
+        rows = [json.loads(line) for line in self._get_content(response).splitlines()]
+        self.assertEqual(
+            [row['date_of_sale'] for row in rows],
+            ['2024-09-06T12:00:00Z', '2024-09-04T12:00:00Z'],
+        )
+
+    def test_export_filtered_by_category_at_time_of_sale(self):
+        self.other_product.category = 'Renamed Category'
+        self.other_product.save()
+
+        response = self.client.get(
+            reverse(self.url_name),
+            {'format': 'ndjson', 'category': 'other', 'start_date': '2024-09-07'},
+        )
+
+        rows = [json.loads(line) for line in self._get_content(response).splitlines()]
+        self.assertEqual(
+            [row['date_of_sale'] for row in rows],
+            ['2024-09-10T12:00:00Z', '2024-09-08T12:00:00Z'],
+        )
+        # exported with the current category of their product
+        self.assertEqual({row['product_category'] for row in rows}, {'Renamed Category'})
+
+    def test_export_invalid_filters(self):
+        response = self.client.get(
+            reverse(self.url_name),
+            {'start_date': '2024-09-06', 'end_date': '2024-09-03'},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('start_date', response.json())
+
+    def test_export_missing_product(self):
+        SalesRecord.objects.update(product=None)
+
+        response = self.client.get(reverse(self.url_name), {'format': 'ndjson'})
+
+        row = json.loads(self._get_content(response).splitlines()[0])
+        self.assertIsNone(row['product_id'])
+        self.assertIsNone(row['product_name'])
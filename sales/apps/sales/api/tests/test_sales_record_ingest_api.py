@@ -0,0 +1,194 @@
+import json
+import uuid
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from sales.apps.products.models import Product, ProductCategory
+
+from ...models import SalesRecord, SalesRecordDailyRollup, SalesRecordUUID
+from .mixins import AuthenticationTestMixin
+
+
+class SalesRecordIngestAPITest(AuthenticationTestMixin, TestCase):
+    url_name = 'sales-data-ingest'
+
+    def setUp(self):
+        self.client = APIClient()
+        super().setUp()
+        self.api_user.user_permissions.add(Permission.objects.get(codename='add_salesrecord'))
+        self.product = Product.objects.create(
+            name='Test Product',
+            category='Test Category',
+            price=100.00,
+        )
+
+    def _build_rows(self, count, product=None, date_of_sale='2024-09-01T10:00:00Z'):
+        return [
+            {
+                'id': str(uuid.uuid4()),
+                'product': str((product or self.product).uuid),
+                'quantity_sold': 2,
+                'total_sales_amount': '200.00',
+                'date_of_sale': date_of_sale,
+            }
+            for _ in range(count)
+        ]
+
+    def _post_ndjson(self, rows):
+        return self.client.post(
+            reverse(self.url_name),
+            data='\n'.join(json.dumps(row) for row in rows),
+            content_type='application/x-ndjson',
+        )
+
+    def _post_csv(self, rows):
+        columns = ['id', 'product', 'quantity_sold', 'total_sales_amount', 'date_of_sale']
+        lines = [','.join(columns)] + [
+            ','.join(str(row[column]) for column in columns) for row in rows
+        ]
+        return self.client.post(
+            reverse(self.url_name),
+            data='\n'.join(lines),
+            content_type='text/csv',
+        )
+
+    def test_ingest_ndjson(self):
+        rows = self._build_rows(3)
+        response = self._post_ndjson(rows)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'received': 3, 'created': 3, 'duplicates': 0})
+
+        sales_record = SalesRecord.objects.get(uuid=rows[0]['id'])
+        self.assertEqual(sales_record.product, self.product)
+        self.assertEqual(sales_record.total_sales_amount, Decimal('200.00'))
+        self.assertEqual(sales_record.product_snapshot['category'], 'Test Category')
+        self.assertEqual(sales_record.category.name, 'Test Category')
+
+        rollup = SalesRecordDailyRollup.objects.get()
+        self.assertEqual(rollup.records_count, 3)
+        self.assertEqual(rollup.quantity_sold, 6)
+
+    def test_ingest_csv(self):
+        response = self._post_csv(self._build_rows(4))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 4)
+        self.assertEqual(SalesRecord.objects.count(), 4)
+
+    def test_ingest_is_idempotent(self):
+        rows = self._build_rows(3)
+        self._post_ndjson(rows)
+
+        response = self._post_ndjson(rows + self._build_rows(1))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'received': 4, 'created': 1, 'duplicates': 3})
+        self.assertEqual(SalesRecord.objects.count(), 4)
+        self.assertEqual(SalesRecordDailyRollup.objects.get().records_count, 4)
+
+    def test_ingest_is_idempotent_with_changed_date_of_sale(self):
+        rows = self._build_rows(1)
+        self._post_ndjson(rows)
+
+        response = self._post_ndjson([{**rows[0], 'date_of_sale': '2024-10-01T10:00:00Z'}])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'received': 1, 'created': 0, 'duplicates': 1})
+        self.assertEqual(SalesRecord.objects.get().date_of_sale.month, 9)
+
+    def test_ingest_skips_uuids_of_created_records(self):
+        rows = self._build_rows(1)
+        SalesRecord.objects.create(
+            uuid=rows[0]['id'], product=self.product, total_sales_amount=Decimal('200.00')
+        )
+
+        response = self._post_ndjson(rows)
+
+        self.assertEqual(response.data, {'received': 1, 'created': 0, 'duplicates': 1})
+        self.assertEqual(SalesRecord.objects.count(), 1)
+
+    def test_ingest_skips_uuids_claimed_by_concurrent_batch(self):
+        rows = self._build_rows(2)
+        # claimed by a batch whose records are not visible yet
+        SalesRecordUUID.objects.create(uuid=rows[0]['id'])
+
+        response = self._post_ndjson(rows)
+
+        self.assertEqual(response.data, {'received': 2, 'created': 1, 'duplicates': 1})
+        self.assertEqual(SalesRecord.objects.get().uuid, uuid.UUID(rows[1]['id']))
+        self.assertEqual(SalesRecordDailyRollup.objects.get().records_count, 1)
+        self.assertEqual(SalesRecordUUID.objects.count(), 2)
+
+    def test_ingest_skips_duplicates_within_body(self):
+        rows = self._build_rows(2)
+        response = self._post_ndjson(rows + rows)
+
+        self.assertEqual(response.data, {'received': 4, 'created': 2, 'duplicates': 2})
+
+    def test_ingest_invalid_row_creates_nothing(self):
+        rows = self._build_rows(3)
+        rows[1]['quantity_sold'] = 0
+
+        response = self._post_ndjson(rows)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('quantity_sold', response.json()['rows']['2'])
+        self.assertFalse(SalesRecord.objects.exists())
+
+    def test_ingest_unknown_product_creates_nothing(self):
+        rows = self._build_rows(2)
+        rows[1]['product'] = str(uuid.uuid4())
+
+        response = self._post_ndjson(rows)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('product', response.json()['rows']['2'])
+        self.assertFalse(SalesRecord.objects.exists())
+
+    def test_ingest_malformed_body(self):
+        response = self.client.post(
+            reverse(self.url_name),
+            data='{"id": \n',
+            content_type='application/x-ndjson',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ingest_unsupported_media_type(self):
+        response = self.client.post(reverse(self.url_name), data={}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_ingest_requires_add_permission(self):
+        self.api_user.user_permissions.clear()
+
+        response = self._post_ndjson(self._build_rows(1))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @patch('sales.apps.sales.ingestion.bump_cache_generation')
+    def test_ingest_invalidates_cache_once(self, mock_bump_cache_generation):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._post_ndjson(self._build_rows(5))
+
+        mock_bump_cache_generation.assert_called_once()
+
+    def test_ingest_query_count_does_not_depend_on_rows(self):
+        other_product = Product.objects.create(name='Other Product', price=10)
+        ProductCategory.objects.get_ids([self.product.category, other_product.category])
+
+        with CaptureQueriesContext(connection) as small_batch:
+            self._post_ndjson(self._build_rows(2) + self._build_rows(2, product=other_product))
+        with CaptureQueriesContext(connection) as large_batch:
+            self._post_ndjson(
+                self._build_rows(50, date_of_sale='2024-09-02T10:00:00Z')
+                + self._build_rows(50, product=other_product, date_of_sale='2024-09-02T10:00:00Z')
+            )
+
+        self.assertEqual(len(small_batch.captured_queries), len(large_batch.captured_queries))
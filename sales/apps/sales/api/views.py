@@ -1,21 +1,93 @@
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from rest_framework.generics import ListAPIView
-from rest_framework.pagination import PageNumberPagination
+from collections.abc import Mapping
+from itertools import islice
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiResponse,
+    extend_schema,
+    extend_schema_view,
+)
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView, ListAPIView
+from rest_framework.permissions import DjangoModelPermissions, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ReadOnlyModelViewSet
-from sales.utils.api import get_schema_responses
-from sales.utils.mixins import AuthenticatedViewMixin
+from sales.utils.api import (
+    BadRequestResponseSerializer,
+    ConflictError,
+    ForbiddenResponseSerializer,
+    UnauthorizedResponseSerializer,
+    get_schema_responses,
+)
+from sales.utils.mixins import (
+    AuthenticatedViewMixin,
+    CachedListMixin,
+    PaginationModeViewMixin,
+    ReplicaReadViewMixin,
+)
+from sales.utils.pagination import AsyncPageNumberPagination, KeysetPagination
+from sales.utils.parsers import CSVParser, NDJSONParser
+from sales.utils.renderers import CSVRenderer, NDJSONRenderer
+from sales.utils.responses import IteratorStreamingHttpResponse
+from sales.utils.views import AsyncListAPIView
 
+from ..cache import SALESDATA_AGGREGATE_CACHE_PREFIX, SALESRECORD_LIST_CACHE_PREFIX
+from ..ingestion import SalesRecordIngestor
 from ..models import SalesRecord
 from .filters import SalesRecordAggregateFilter, SalesRecordFilter
-from .serializers import SalesDataAggregateSerializer, SalesRecordSerializer
+from .serializers import (
+    SalesDataAggregateSerializer,
+    SalesRecordExportRowSerializer,
+    SalesRecordIngestResultSerializer,
+    SalesRecordIngestSerializer,
+    SalesRecordSerializer,
+    SalesRecordValuesSerializer,
+)
+
+
+class PageBasedPagination(AsyncPageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
 
 
-class PageBasedPagination(PageNumberPagination):
+class SalesRecordCursorPagination(KeysetPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
+    ordering = ('-date_of_sale', 'id')
+
+
+class AggregateBySerializerContextMixin:
+    """
+    Passes the `aggregate_by` parameter to the serializer, which formats groups accordingly.
+    """
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # validated by the filterset, which rejects unknown values
+        context['aggregate_by'] = self.request.query_params.get('aggregate_by')
+        return context
+
+
+class DataRefreshedAtHeaderMixin:
+    """
+    Reports when the data was last refreshed in the `X-Data-Refreshed-At` header (ISO 8601),
+    for responses computed from a periodically refreshed materialized view.
+    """
+
+    def get_response_headers(self, request):
+        headers = super().get_response_headers(request)
+        # set by `SalesRecordAggregateFilter`
+        data_refreshed_at = getattr(request, 'data_refreshed_at', None)
+        if data_refreshed_at is not None:
+            headers['X-Data-Refreshed-At'] = data_refreshed_at.isoformat()
+        return headers
 
 
 @extend_schema_view(
@@ -25,6 +97,21 @@ class PageBasedPagination(PageNumberPagination):
             'Fetch a paginated list of `SalesRecord` entities, including sales quantity, '
             'total sales amount, and product details.',
         ),
+        parameters=[
+            OpenApiParameter(
+                name='pagination',
+                description=(
+                    'Pagination mode. `cursor` returns opaque `next`/`previous` cursors '
+                    'without a total `count` and keeps deep pages fast.'
+                ),
+                enum=['page', 'cursor'],
+                default='page',
+            ),
+            OpenApiParameter(
+                name='cursor',
+                description='The pagination cursor value (only with `pagination=cursor`).',
+            ),
+        ],
         responses=get_schema_responses(serializer_class=SalesRecordSerializer),
     ),
     retrieve=extend_schema(
@@ -36,32 +123,274 @@ class PageBasedPagination(PageNumberPagination):
         responses=get_schema_responses(serializer_class=SalesRecordSerializer, detail=True),
     ),
 )
-class SalesRecordViewSet(AuthenticatedViewMixin, ReadOnlyModelViewSet):
+class SalesRecordViewSet(
+    ReplicaReadViewMixin,
+    AuthenticatedViewMixin,
+    PaginationModeViewMixin,
+    CachedListMixin,
+    ReadOnlyModelViewSet,
+):
     lookup_field = 'uuid'
-    queryset = SalesRecord.objects.select_related('product').order_by('-date_of_sale')
+    queryset = SalesRecord.objects.select_related('product').order_by('-date_of_sale', 'id')
+    # pages are serialized from the selected columns, without model instances
+    list_queryset = SalesRecord.objects.order_by('-date_of_sale', 'id').values(
+        *SalesRecordValuesSerializer.source_fields
+    )
     serializer_class = SalesRecordSerializer
     pagination_class = PageBasedPagination
+    pagination_modes = {
+        'page': PageBasedPagination,
+        'cursor': SalesRecordCursorPagination,
+    }
     filterset_class = SalesRecordFilter
+    cache_key_prefix = SALESRECORD_LIST_CACHE_PREFIX
+    cache_timeout = 60 * 20
 
-    @method_decorator(cache_page(60 * 20, key_prefix='api_salesrecord_list'), name='list')
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+    def get_queryset(self):
+        if self.action == 'list':
+            return self.list_queryset.all()
+        return super().get_queryset()
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return SalesRecordValuesSerializer
+        return super().get_serializer_class()
 
 
 @extend_schema_view(
     get=extend_schema(
         summary='Aggregate Sales Data',
         description=(
-            'Endpoint for data aggregation of `SalesRecord` instances by grouping parameter.'
+            'Endpoint for data aggregation of `SalesRecord` instances by grouping parameter. '
+            'Groups are formatted as `YYYY-MM-DD` (day), `YYYY-Www` (ISO week), `YYYY-MM` (month), '
+            '`YYYY-Qn` (quarter), `YYYY` (year), product UUID (product) or category name. '
+            'Responses computed from the periodically refreshed materialized view report '
+            'when its data was refreshed in the `X-Data-Refreshed-At` header.'
         ),
         responses=get_schema_responses(serializer_class=SalesDataAggregateSerializer),
     )
 )
-class SalesDataAggregateView(AuthenticatedViewMixin, ListAPIView):
+class SalesDataAggregateView(
+    AggregateBySerializerContextMixin,
+    DataRefreshedAtHeaderMixin,
+    ReplicaReadViewMixin,
+    AuthenticatedViewMixin,
+    CachedListMixin,
+    ListAPIView,
+):
     queryset = SalesRecord.objects.select_related('product').order_by('-date_of_sale')
     serializer_class = SalesDataAggregateSerializer
     filterset_class = SalesRecordAggregateFilter
+    cache_key_prefix = SALESDATA_AGGREGATE_CACHE_PREFIX
+    cache_timeout = 60 * 20
+
+    @property
+    def cache_stale_timeout(self):
+        return settings.SALES_AGGREGATE_CACHE_STALE_TIMEOUT
+
+
+class AsyncSalesRecordListView(
+    ReplicaReadViewMixin, AuthenticatedViewMixin, PaginationModeViewMixin, AsyncListAPIView
+):
+    queryset = SalesRecordViewSet.list_queryset
+    serializer_class = SalesRecordValuesSerializer
+    pagination_class = PageBasedPagination
+    pagination_modes = SalesRecordViewSet.pagination_modes
+    filterset_class = SalesRecordFilter
+    cache_key_prefix = SalesRecordViewSet.cache_key_prefix
+    cache_timeout = SalesRecordViewSet.cache_timeout
+
+    # not through `extend_schema_view`, which would wrap the handler in a sync method
+    @extend_schema(
+        summary='Sales Records list (async)',
+        description=(
+            'Same as `GET /api/sales-data/`, served asynchronously: while the database '
+            'and the cache are queried, the worker serves other requests.'
+        ),
+        parameters=[
+            OpenApiParameter(name='pagination', enum=['page', 'cursor'], default='page'),
+            OpenApiParameter(name='cursor'),
+        ],
+        responses=get_schema_responses(serializer_class=SalesRecordSerializer),
+    )
+    async def get(self, request, *args, **kwargs):
+        return await super().get(request, *args, **kwargs)
+
+
+class AsyncSalesDataAggregateView(
+    AggregateBySerializerContextMixin,
+    DataRefreshedAtHeaderMixin,
+    ReplicaReadViewMixin,
+    AuthenticatedViewMixin,
+    AsyncListAPIView,
+):
+    queryset = SalesDataAggregateView.queryset
+    serializer_class = SalesDataAggregateSerializer
+    filterset_class = SalesRecordAggregateFilter
+    cache_key_prefix = SalesDataAggregateView.cache_key_prefix
+    cache_timeout = SalesDataAggregateView.cache_timeout
+    cache_stale_timeout = SalesDataAggregateView.cache_stale_timeout
+
+    @extend_schema(
+        summary='Aggregate Sales Data (async)',
+        description=(
+            'Same as `GET /api/sales-data/aggregate/`, served asynchronously: while the database '
+            'and the cache are queried, the worker serves other requests.'
+        ),
+        responses=get_schema_responses(serializer_class=SalesDataAggregateSerializer),
+    )
+    async def get(self, request, *args, **kwargs):
+        return await super().get(request, *args, **kwargs)
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary='Sales Records bulk ingestion',
+        description=(
+            'Creates `SalesRecord` entities from a streamed NDJSON (`application/x-ndjson`) '
+            'or CSV (`text/csv`, with a header row) body. Rows are written in batches, '
+            'in a single transaction: if any row is invalid, nothing is created. '
+            'Rows whose `id` already exists are skipped, so failed requests can be retried safely.'
+        ),
+        request={
+            NDJSONParser.media_type: SalesRecordIngestSerializer,
+            CSVParser.media_type: SalesRecordIngestSerializer,
+        },
+        responses={
+            status.HTTP_201_CREATED: SalesRecordIngestResultSerializer,
+            status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+                description='Bad Request',
+                response=BadRequestResponseSerializer,
+            ),
+            status.HTTP_401_UNAUTHORIZED: OpenApiResponse(
+                description='Unauthorized - Authentication credentials were not provided.',
+                response=UnauthorizedResponseSerializer,
+            ),
+            status.HTTP_403_FORBIDDEN: OpenApiResponse(
+                description='Forbidden - You do not have permission to perform this action.',
+                response=ForbiddenResponseSerializer,
+            ),
+        },
+    )
+)
+class SalesRecordIngestView(ReplicaReadViewMixin, AuthenticatedViewMixin, APIView):
+    queryset = SalesRecord.objects.none()  # required by `DjangoModelPermissions`
+    permission_classes = [IsAuthenticated, DjangoModelPermissions]
+    parser_classes = [NDJSONParser, CSVParser]
+    batch_size = 5000
+    max_reported_errors = 100
+
+    def post(self, request, *args, **kwargs):
+        # streaming parsers return a lazy iterator of rows, an empty body is parsed as a mapping
+        rows = iter(()) if isinstance(request.data, Mapping) else iter(request.data)
+        ingestor = SalesRecordIngestor(batch_size=self.batch_size)
+        errors = []
+
+        try:
+            with transaction.atomic():
+                row_offset = 0
+                while len(errors) + len(ingestor.errors) < self.max_reported_errors:
+                    batch = list(islice(rows, self.batch_size))
+                    if not batch:
+                        break
+
+                    serializer = SalesRecordIngestSerializer(data=batch, many=True)
+                    if not serializer.is_valid():
+                        errors += [
+                            {'row': row_offset + index, **row_errors}
+                            for index, row_errors in enumerate(serializer.errors, start=1)
+                            if row_errors
+                        ]
+                    elif not errors:
+                        ingestor.ingest(
+                            list(enumerate(serializer.validated_data, start=row_offset + 1))
+                        )
+                    row_offset += len(batch)
+
+                errors = sorted(errors + ingestor.errors, key=lambda error: error['row'])
+                if errors:
+                    raise ValidationError(
+                        {
+                            'rows': {
+                                error.pop('row'): error
+                                for error in errors[: self.max_reported_errors]
+                            }
+                        }
+                    )
+        except IntegrityError:
+            # a concurrent request inserted some of the same records, a retry skips them
+            raise ConflictError()
+
+        return Response(
+            SalesRecordIngestResultSerializer(
+                {
+                    'received': row_offset,
+                    'created': ingestor.created,
+                    'duplicates': ingestor.duplicates,
+                }
+            ).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary='Sales Records export',
+        description=(
+            'Streams all `SalesRecord` entities matching the filters as CSV (default) or NDJSON '
+            '(`?format=ndjson` or `Accept: application/x-ndjson`), ordered by date of sale. '
+            'Rows are read with a server-side cursor, in chunks, so exports of any size '
+            'need a single request.'
+        ),
+        responses={
+            (status.HTTP_200_OK, CSVRenderer.media_type): SalesRecordExportRowSerializer,
+            (status.HTTP_200_OK, NDJSONRenderer.media_type): SalesRecordExportRowSerializer,
+            status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+                description='Bad Request',
+                response=BadRequestResponseSerializer,
+            ),
+            status.HTTP_401_UNAUTHORIZED: OpenApiResponse(
+                description='Unauthorized - Authentication credentials were not provided.',
+                response=UnauthorizedResponseSerializer,
+            ),
+            status.HTTP_403_FORBIDDEN: OpenApiResponse(
+                description='Forbidden - You do not have permission to perform this action.',
+                response=ForbiddenResponseSerializer,
+            ),
+        },
+    )
+)
+class SalesRecordExportView(ReplicaReadViewMixin, AuthenticatedViewMixin, GenericAPIView):
+    queryset = SalesRecord.objects.order_by('-date_of_sale', 'id')
+    filterset_class = SalesRecordFilter
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+    throttle_scope = 'sales_export'
+    chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).values_list(
+            *SalesRecordExportRowSerializer.source_fields
+        )
+        # rows are read while the response is streamed, after the view routed its reads
+        queryset = queryset.using(queryset.db)
+        row_serializer = SalesRecordExportRowSerializer()
+        # `iterator` reads through a server-side cursor on PostgreSQL, `chunk_size` rows at a time
+        rows = (
+            row_serializer.to_row(values)
+            for values in queryset.iterator(chunk_size=self.chunk_size)
+        )
+
+        renderer = request.accepted_renderer
+        response = IteratorStreamingHttpResponse(
+            renderer.iter_render(rows, fieldnames=list(row_serializer.fields)),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        response['Content-Disposition'] = f'attachment; filename="sales-data.{renderer.format}"'
+        return response
 
-    @method_decorator(cache_page(60 * 20, key_prefix='api_salesdataaggregate_list'), name='list')
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+    def finalize_response(self, request, response, *args, **kwargs):
+        if isinstance(response, Response) and response.exception:
+            # errors are not rows, render them like the rest of the API
+            request.accepted_renderer = JSONRenderer()
+            request.accepted_media_type = JSONRenderer.media_type
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,8 @@
+SALESRECORD_LIST_CACHE_PREFIX = 'api_salesrecord_list'
+SALESDATA_AGGREGATE_CACHE_PREFIX = 'api_salesdataaggregate_list'
+
+# every cached response that depends on `SalesRecord` data
+SALESRECORD_API_CACHE_PREFIXES = (
+    SALESRECORD_LIST_CACHE_PREFIX,
+    SALESDATA_AGGREGATE_CACHE_PREFIX,
+)
@@ -0,0 +1,81 @@
+from django.db import transaction
+
+from sales.apps.products.models import Product, ProductCategory
+from sales.utils.cache import bump_cache_generation
+
+from .cache import SALESRECORD_API_CACHE_PREFIXES
+from .models import SalesRecord, SalesRecordDailyRollup, SalesRecordUUID
+
+
+class SalesRecordIngestor:
+    """
+    Writes batches of validated sales record rows.
+
+    Per batch, products and their category ids are resolved with a couple of queries, product
+    snapshots are built in memory, records are inserted with one `bulk_create` and the daily
+    rollup is updated once.
+    Rows whose `uuid` is already claimed in `SalesRecordUUID` are skipped, so a re-sent batch
+    does not create duplicates, as the partitioned table only enforces their uniqueness per date
+    of sale: a row re-sent with another date, or by a concurrent batch, is skipped too.
+
+    Must be used inside a transaction - the API cache is invalidated once, when it commits.
+
+    Rows are `(row_number, data)` tuples, where `data` contains `id` (record uuid),
+    `product` (product uuid), `quantity_sold`, `total_sales_amount` and `date_of_sale`.
+    """
+
+    def __init__(self, batch_size: int = 5000):
+        self.batch_size = batch_size
+        self.created = 0
+        self.duplicates = 0
+        self.errors: list[dict] = []
+
+    def ingest(self, rows: 'list[tuple[int, dict]]') -> None:
+        products = Product.objects.in_bulk({data['product'] for _, data in rows}, field_name='uuid')
+        category_ids = ProductCategory.objects.get_ids(
+            product.category for product in products.values()
+        )
+
+        records: dict = {}
+        for row_number, data in rows:
+            product = products.get(data['product'])
+            if product is None:
+                self.errors.append({'row': row_number, 'product': ['Product does not exist.']})
+                continue
+
+            if data['id'] in records:
+                self.duplicates += 1
+                continue
+
+            records[data['id']] = SalesRecord(
+                uuid=data['id'],
+                product=product,
+                product_snapshot=SalesRecord.build_product_snapshot(product),
+                category_id=category_ids[product.category],
+                quantity_sold=data['quantity_sold'],
+                total_sales_amount=data['total_sales_amount'],
+                date_of_sale=data['date_of_sale'],
+            )
+
+        if self.errors or not records:
+            # nothing is committed once a row failed, so there is no point in writing
+            return
+
+        claimed_uuids = SalesRecordUUID.objects.claim(records)
+        self.duplicates += len(records) - len(claimed_uuids)
+        records = {
+            record_uuid: record
+            for record_uuid, record in records.items()
+            if record_uuid in claimed_uuids
+        }
+        if not records:
+            return
+
+        SalesRecord.objects.bulk_create(records.values(), batch_size=self.batch_size)
+        SalesRecordDailyRollup.objects.apply_deltas(
+            record.get_rollup_delta() for record in records.values()
+        )
+
+        if not self.created:
+            transaction.on_commit(lambda: bump_cache_generation(*SALESRECORD_API_CACHE_PREFIXES))
+        self.created += len(records)
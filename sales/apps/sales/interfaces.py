@@ -1,7 +1,23 @@
-from typing import Optional, TypedDict
+from datetime import date
+from decimal import Decimal
+from typing import NamedTuple, Optional, TypedDict
 
 
 class ProductSnapshot(TypedDict):
     name: str
     category: Optional[str] = ''
     price: str
+
+
+class SalesRollupDelta(NamedTuple):
+    """
+    Signed contribution of one or more `SalesRecord` rows to a `SalesRecordDailyRollup` row.
+    """
+
+    day: date
+    category_id: Optional[int]
+    product_id: Optional[int]
+    total_sales_amount: Decimal
+    quantity_sold: int
+    records_count: int
+    unit_price_sum: Decimal
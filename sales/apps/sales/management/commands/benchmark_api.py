@@ -0,0 +1,287 @@
+import json
+import statistics
+import subprocess
+import time
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.throttling import UserRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken
+
+from sales.apps.sales.cache import SALESRECORD_API_CACHE_PREFIXES
+from sales.apps.sales.models import SalesRecord
+from sales.apps.sales.seeding import seed_sales_data
+from sales.utils.cache import bump_cache_generation
+
+CACHE_STATES = ('cold', 'warm')
+
+ISOLATED_CACHE = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'benchmark_api',
+    'TIMEOUT': 60 * 60,
+}
+
+
+def get_scenarios(today, record_uuid) -> 'list[tuple[str, str, dict]]':
+    """
+    Returns the benchmarked requests, as `(name, url, query parameters)` tuples.
+    """
+
+    list_url = reverse('sales-data-list')
+    aggregate_url = reverse('sales-data-aggregate')
+    last_month = {
+        'start_date': (today - timedelta(days=30)).isoformat(),
+        'end_date': today.isoformat(),
+    }
+
+    return [
+        ('list', list_url, {}),
+        ('list_last_page', list_url, {'page': 'last', 'page_size': 100}),
+        ('list_cursor', list_url, {'pagination': 'cursor', 'page_size': 100}),
+        ('list_category', list_url, {'category': 'category 1', 'category_match': 'exact'}),
+        ('list_last_month', list_url, last_month),
+        ('detail', reverse('sales-data-detail', kwargs={'uuid': record_uuid}), {}),
+        ('aggregate_month', aggregate_url, {'aggregate_by': 'month'}),
+        ('aggregate_day_last_month', aggregate_url, {'aggregate_by': 'day', **last_month}),
+        ('aggregate_category', aggregate_url, {'aggregate_by': 'category'}),
+        (
+            'aggregate_product_category',
+            aggregate_url,
+            {'aggregate_by': 'product', 'category': 'category', 'category_match': 'prefix'},
+        ),
+        (
+            'aggregate_month_approximate',
+            aggregate_url,
+            {'aggregate_by': 'month', 'approximate': 'true', 'sample_percent': 10},
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a throwaway test database with a configurable dataset, then measures latency '
+        'percentiles, throughput and SQL query counts of the sales API endpoints, with a cold '
+        '(invalidated) and a warm response cache. Results are written as JSON, which can be '
+        'compared with the results of another commit with --compare. '
+        'The run never writes to the configured cache: it uses a local-memory cache, or the '
+        'dedicated cache of --cache-location. '
+        'Set LOCAL_BACKENDS=1 to run against SQLite.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--records', type=int, default=10000, help='Seeded sales records.')
+        parser.add_argument('--products', type=int, default=100, help='Seeded products.')
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Measured requests per scenario and cache state.',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated dataset.')
+        parser.add_argument(
+            '--scenarios',
+            help='Comma separated names of the scenarios to run, defaults to all of them.',
+        )
+        parser.add_argument(
+            '--cache-location',
+            help=(
+                'Location of a dedicated cache of the configured backend to run against, '
+                'e.g. an unused Redis database, instead of a local-memory cache. '
+                'Its entries are invalidated and written by the run.'
+            ),
+        )
+        parser.add_argument('--output', help='Write the JSON results to this file.')
+        parser.add_argument(
+            '--compare',
+            metavar='BASELINE',
+            help='JSON results of a previous run, to print the latency changes against.',
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as baseline_file:
+                baseline = json.load(baseline_file)
+
+        caches_settings = {'default': self._get_cache_settings(options['cache_location'])}
+
+        setup_test_environment()
+        old_database_name = connection.settings_dict['NAME']
+        if connection.vendor != 'sqlite':
+            # SQLite test databases live in memory
+            test_settings = connection.settings_dict.setdefault('TEST', {})
+            test_settings['NAME'] = f'benchmark_{old_database_name}'
+
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+        try:
+            # cold runs invalidate the response cache and every run resets throttling,
+            # which must not affect the cache of the API
+            with override_settings(CACHES=caches_settings):
+                results = self._run(options)
+        finally:
+            connection.creation.destroy_test_db(old_database_name, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(results, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output)
+        else:
+            self.stdout.write(output)
+
+        if baseline is not None:
+            self._compare(baseline, results)
+
+    @staticmethod
+    def _get_cache_settings(location: Optional[str]) -> dict:
+        if location is None:
+            return ISOLATED_CACHE
+
+        default_settings = settings.CACHES['default']
+        if location == default_settings.get('LOCATION'):
+            raise CommandError(
+                '--cache-location must be a dedicated cache, not the one of the API.'
+            )
+        return {**default_settings, 'LOCATION': location}
+
+    def _run(self, options: dict) -> dict:
+        start_time = time.perf_counter()
+        seed_sales_data(
+            products=options['products'],
+            records=options['records'],
+            seed=options['seed'],
+        )
+        self.stderr.write(
+            f'Seeded {options["records"]} sales records in {time.perf_counter() - start_time:.1f}s.'
+        )
+
+        user = get_user_model().objects.create_user(username='benchmark')
+        client = APIClient()
+        client.raise_request_exception = False
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        # throttling would reject requests long before the end of the run
+        throttle_key = UserRateThrottle.cache_format % {'scope': 'user', 'ident': user.pk}
+
+        scenarios = get_scenarios(
+            today=timezone.now().date(),
+            record_uuid=SalesRecord.objects.order_by('uuid').values_list('uuid', flat=True)[0],
+        )
+        if options['scenarios']:
+            names = options['scenarios'].split(',')
+            unknown_names = set(names) - {name for name, _, _ in scenarios}
+            if unknown_names:
+                raise CommandError(f'Unknown scenarios: {", ".join(sorted(unknown_names))}.')
+            scenarios = [scenario for scenario in scenarios if scenario[0] in names]
+
+        results = []
+        for name, url, params in scenarios:
+            for cache_state in CACHE_STATES:
+                timings, query_counts, status_codes = [], [], []
+                if cache_state == 'warm':
+                    client.get(url, params)
+
+                for _ in range(options['iterations']):
+                    if cache_state == 'cold':
+                        bump_cache_generation(*SALESRECORD_API_CACHE_PREFIXES)
+                    cache.delete(throttle_key)
+
+                    with CaptureQueriesContext(connection) as queries:
+                        request_start_time = time.perf_counter()
+                        response = client.get(url, params)
+                        timings.append(time.perf_counter() - request_start_time)
+                    query_counts.append(len(queries))
+                    status_codes.append(response.status_code)
+
+                results.append(
+                    {
+                        'scenario': name,
+                        'cache': cache_state,
+                        **self._summarize(timings, query_counts, status_codes),
+                    }
+                )
+                self.stderr.write(
+                    f'{name} ({cache_state}): p50 {results[-1]["p50_ms"]:.1f}ms, '
+                    f'{results[-1]["queries"]} queries'
+                )
+
+        return {
+            'meta': {
+                'commit': self._get_commit(),
+                'created_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'cache': settings.CACHES['default']['BACKEND'],
+                'records': options['records'],
+                'products': options['products'],
+                'iterations': options['iterations'],
+                'seed': options['seed'],
+            },
+            'results': results,
+        }
+
+    @staticmethod
+    def _summarize(timings: 'list[float]', query_counts: 'list[int]', status_codes: 'list[int]'):
+        percentiles = (
+            statistics.quantiles(timings, n=100, method='inclusive')
+            if len(timings) > 1
+            else timings * 99
+        )
+        return {
+            'requests': len(timings),
+            'p50_ms': round(percentiles[49] * 1000, 3),
+            'p95_ms': round(percentiles[94] * 1000, 3),
+            'p99_ms': round(percentiles[98] * 1000, 3),
+            'requests_per_second': round(len(timings) / sum(timings), 2),
+            'queries': round(statistics.median(query_counts)),
+            'errors': sum(status_code >= 400 for status_code in status_codes),
+        }
+
+    @staticmethod
+    def _get_commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def _compare(self, baseline: dict, results: dict) -> None:
+        baseline_results = {
+            (result['scenario'], result['cache']): result for result in baseline['results']
+        }
+
+        self.stdout.write(
+            f'\n{"scenario":<30} {"cache":<5} {"p50 (ms)":>20} {"p95 (ms)":>20} {"queries":>9}'
+        )
+        for result in results['results']:
+            previous = baseline_results.get((result['scenario'], result['cache']))
+            if previous is None:
+                continue
+
+            columns = [
+                f'{previous[key]:.1f} -> {result[key]:.1f} '
+                f'({(result[key] / previous[key] - 1) * 100 if previous[key] else 0:+.0f}%)'
+                for key in ('p50_ms', 'p95_ms')
+            ]
+            self.stdout.write(
+                f'{result["scenario"]:<30} {result["cache"]:<5} {columns[0]:>20} {columns[1]:>20} '
+                f'{previous["queries"]:>4} -> {result["queries"]}'
+            )
@@ -0,0 +1,263 @@
+import asyncio
+import io
+import json
+import statistics
+import sys
+import threading
+import time
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+ENDPOINTS = {
+    'list': ('sales-data-list', 'async-sales-data-list', {}),
+    'aggregate': ('sales-data-aggregate', 'async-sales-data-aggregate', {'aggregate_by': 'day'}),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the concurrent throughput of the sync list or aggregate view, served by the WSGI '
+        'handler, with its async counterpart, served by the ASGI handler, at equal worker counts. '
+        'WSGI workers are threads serving one request at a time, ASGI workers are event loops. '
+        'Both handlers run in-process, with the configured database and cache, so absolute numbers '
+        'are lower than behind a real server. Creates a throwaway user for the duration of the run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', choices=ENDPOINTS, default='aggregate')
+        parser.add_argument(
+            '--query',
+            help='Query string of the requests, e.g. "aggregate_by=category".',
+        )
+        parser.add_argument('--workers', type=int, default=4, help='Workers per handler.')
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=32,
+            help='Number of clients sending requests concurrently.',
+        )
+        parser.add_argument('--requests', type=int, default=400, help='Requests per handler.')
+        parser.add_argument(
+            '--cached',
+            action='store_true',
+            help=(
+                'Send identical requests, answered from the cache after the first one. '
+                'By default each request has a unique query string, so it misses the cache.'
+            ),
+        )
+        parser.add_argument('--host', help='Host header, defaults to the first allowed host.')
+        parser.add_argument('--json', action='store_true', help='Output results as JSON.')
+
+    def handle(self, *args, **options):
+        sync_url_name, async_url_name, default_query = ENDPOINTS[options['endpoint']]
+        query = options['query'] if options['query'] is not None else urlencode(default_query)
+        queries = [
+            query if options['cached'] else '&'.join(filter(None, [query, f'_={index}']))
+            for index in range(options['requests'])
+        ]
+        host = options['host'] or next(
+            (host.lstrip('.') for host in settings.ALLOWED_HOSTS if host and host != '*'),
+            'localhost',
+        )
+
+        # a fresh user starts without throttling history
+        user = get_user_model().objects.create_user(username=f'benchmark-{uuid4().hex[:12]}')
+        headers = {'host': host, 'authorization': f'Bearer {AccessToken.for_user(user)}'}
+        try:
+            results = [
+                self._run_wsgi(reverse(sync_url_name), queries, headers, options),
+                self._run_asgi(reverse(async_url_name), queries, headers, options),
+            ]
+        finally:
+            user.delete()
+
+        for result in results:
+            if result['errors']:
+                self.stderr.write(
+                    f'{result["errors"]} {result["handler"]} requests failed, status codes: '
+                    f'{", ".join(map(str, result["error_statuses"]))} '
+                    '(is --host an allowed host?)'
+                )
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f'{"handler":>8} {"requests/s":>11} {"p50 (ms)":>9} {"p95 (ms)":>9} {"errors":>7}'
+        )
+        for result in results:
+            self.stdout.write(
+                f'{result["handler"]:>8} {result["requests_per_second"]:>11.1f} '
+                f'{result["p50_ms"]:>9.1f} {result["p95_ms"]:>9.1f} {result["errors"]:>7}'
+            )
+
+    def _run_wsgi(self, path: str, queries: 'list[str]', headers: dict, options: dict) -> dict:
+        handler = WSGIHandler()
+        # each worker serves one request at a time, other clients wait for a free worker
+        workers = threading.Semaphore(options['workers'])
+
+        def send(query: str) -> int:
+            statuses = []
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'SCRIPT_NAME': '',
+                'PATH_INFO': path,
+                'QUERY_STRING': query,
+                'SERVER_NAME': headers['host'],
+                'SERVER_PORT': '80',
+                'SERVER_PROTOCOL': 'HTTP/1.1',
+                'REMOTE_ADDR': '127.0.0.1',
+                **{f'HTTP_{name.upper()}': value for name, value in headers.items()},
+                'wsgi.version': (1, 0),
+                'wsgi.url_scheme': 'http',
+                'wsgi.input': io.BytesIO(),
+                'wsgi.errors': sys.stderr,
+                'wsgi.multithread': True,
+                'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+            }
+            with workers:
+                response = handler(
+                    environ, lambda status, *args: statuses.append(int(status.split()[0]))
+                )
+                try:
+                    for _ in response:
+                        pass
+                finally:
+                    response.close()
+            return statuses[0]
+
+        def client(pending, latencies, statuses):
+            for query in pending:
+                start_time = time.perf_counter()
+                statuses.append(send(query))
+                latencies.append(time.perf_counter() - start_time)
+
+        return self._run_clients('wsgi', client, queries, options)
+
+    def _run_asgi(self, path: str, queries: 'list[str]', headers: dict, options: dict) -> dict:
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'root_path': '',
+            'headers': [(name.encode(), value.encode()) for name, value in headers.items()],
+            'client': ('127.0.0.1', 0),
+            'server': (headers['host'], 80),
+        }
+
+        async def send(handler: ASGIHandler, query: str) -> int:
+            statuses = []
+            disconnected = asyncio.Event()
+            messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                # the client never disconnects before the response is complete
+                await disconnected.wait()
+
+            async def send_message(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+
+            await handler({**scope, 'query_string': query.encode()}, receive, send_message)
+            return statuses[0]
+
+        def worker(pending, latencies, statuses, clients: int):
+            # one event loop per worker, serving `clients` concurrent clients
+            handler = ASGIHandler()
+
+            async def client():
+                for query in pending:
+                    start_time = time.perf_counter()
+                    statuses.append(await send(handler, query))
+                    latencies.append(time.perf_counter() - start_time)
+
+            async def serve():
+                await asyncio.gather(*(client() for _ in range(clients)))
+
+            asyncio.run(serve())
+
+        return self._run_clients('asgi', worker, queries, options, per_worker=True)
+
+    def _run_clients(
+        self,
+        name: str,
+        target,
+        queries: 'list[str]',
+        options: dict,
+        per_worker: bool = False,
+    ) -> dict:
+        pending = _SharedIterator(queries)
+        latencies: 'list[float]' = []
+        statuses: 'list[int]' = []
+
+        if per_worker:
+            workers, concurrency = options['workers'], options['concurrency']
+            threads = [
+                threading.Thread(
+                    target=target,
+                    args=(pending, latencies, statuses, clients),
+                )
+                for clients in [
+                    concurrency // workers + (index < concurrency % workers)
+                    for index in range(workers)
+                ]
+                if clients
+            ]
+        else:
+            threads = [
+                threading.Thread(target=target, args=(pending, latencies, statuses))
+                for _ in range(options['concurrency'])
+            ]
+
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start_time
+
+        percentiles = (
+            statistics.quantiles(latencies, n=20) if len(latencies) > 1 else latencies * 19
+        )
+        return {
+            'handler': name,
+            'requests': len(latencies),
+            'requests_per_second': len(latencies) / elapsed,
+            'p50_ms': statistics.median(latencies) * 1000,
+            'p95_ms': percentiles[18] * 1000,
+            'errors': sum(status != 200 for status in statuses),
+            'error_statuses': sorted({status for status in statuses if status != 200}),
+        }
+
+
+class _SharedIterator:
+    """
+    Thread safe iterator, handing out each item once across all clients.
+    """
+
+    def __init__(self, items):
+        self._items = iter(items)
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self._lock:
+            return next(self._items)
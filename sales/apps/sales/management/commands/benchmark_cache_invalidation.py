@@ -0,0 +1,87 @@
+import json
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from sales.utils.cache import bump_cache_generation
+
+BENCHMARK_KEY_PREFIX = 'benchmark_cache_invalidation'
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the cost of invalidating cached API responses with `delete_pattern` '
+        '(keyspace SCAN) and with a generation counter (single INCR) for growing keyspace sizes. '
+        'Writes throwaway keys to the configured cache - do not run it against production.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keyspace-sizes',
+            default='1000,10000,100000',
+            help='Comma separated numbers of unrelated keys stored next to the cached responses.',
+        )
+        parser.add_argument(
+            '--cached-responses',
+            type=int,
+            default=100,
+            help='Number of cached responses matching the invalidated prefix.',
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per keyspace size.')
+        parser.add_argument('--json', action='store_true', help='Output results as JSON.')
+
+    def handle(self, *args, **options):
+        if not hasattr(cache, 'delete_pattern'):
+            self.stderr.write('The configured cache backend does not support `delete_pattern`.')
+            return
+
+        results = []
+        for keyspace_size in [int(size) for size in options['keyspace_sizes'].split(',')]:
+            self._populate(keyspace_size, prefix='filler')
+
+            delete_pattern_timings = []
+            generation_timings = []
+            for _ in range(options['repeat']):
+                self._populate(options['cached_responses'], prefix='api_salesrecord_list')
+
+                start_time = time.perf_counter()
+                cache.delete_pattern(f'{BENCHMARK_KEY_PREFIX}:api_salesrecord_list:*')
+                delete_pattern_timings.append(time.perf_counter() - start_time)
+
+                start_time = time.perf_counter()
+                bump_cache_generation(f'{BENCHMARK_KEY_PREFIX}:api_salesrecord_list')
+                generation_timings.append(time.perf_counter() - start_time)
+
+            results.append(
+                {
+                    'keyspace_size': keyspace_size,
+                    'delete_pattern_ms': statistics.median(delete_pattern_timings) * 1000,
+                    'generation_bump_ms': statistics.median(generation_timings) * 1000,
+                }
+            )
+            cache.delete_pattern(f'{BENCHMARK_KEY_PREFIX}:*')
+
+        cache.delete(f'cache_generation:{BENCHMARK_KEY_PREFIX}:api_salesrecord_list')
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f'{"keyspace size":>14} {"delete_pattern (ms)":>20} {"INCR (ms)":>10}')
+        for result in results:
+            self.stdout.write(
+                f'{result["keyspace_size"]:>14} {result["delete_pattern_ms"]:>20.3f} '
+                f'{result["generation_bump_ms"]:>10.3f}'
+            )
+
+    def _populate(self, size: int, prefix: str, batch_size: int = 1000):
+        for start in range(0, size, batch_size):
+            cache.set_many(
+                {
+                    f'{BENCHMARK_KEY_PREFIX}:{prefix}:{index}': b'x' * 64
+                    for index in range(start, min(start + batch_size, size))
+                },
+                timeout=60 * 10,
+            )
@@ -0,0 +1,99 @@
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from sales.apps.products.models import Product
+from sales.apps.sales.api.serializers import SalesRecordSerializer
+from sales.apps.sales.models import SalesRecord
+from sales.utils.renderers import MessagePackRenderer, ORJSONRenderer
+
+
+def build_sales_records(count: int, rng: random.Random) -> 'list[SalesRecord]':
+    """
+    Returns `count` unsaved sales records of random products, like a page of the list endpoint.
+    """
+
+    products = [
+        Product(
+            uuid=uuid.UUID(int=rng.getrandbits(128)),
+            name=f'product {index}',
+            category=f'category {index % 10}',
+            price=Decimal(rng.randint(100, 100000)) / 100,
+        )
+        for index in range(max(count // 4, 1))
+    ]
+    now = timezone.now()
+
+    records = []
+    for _ in range(count):
+        product = rng.choice(products)
+        quantity_sold = rng.randint(1, 10)
+        records.append(
+            SalesRecord(
+                uuid=uuid.UUID(int=rng.getrandbits(128)),
+                product=product,
+                quantity_sold=quantity_sold,
+                total_sales_amount=product.price * quantity_sold,
+                date_of_sale=now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600)),
+            )
+        )
+    return records
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures the CPU time spent rendering a page of the sales records list endpoint '
+        'with each renderer: the DRF JSON renderer, the orjson renderer and the '
+        'MessagePack renderer. Pages are built in memory, no database is needed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100, help='Records per page.')
+        parser.add_argument('--iterations', type=int, default=500, help='Renders per renderer.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated page.')
+
+    def handle(self, *args, **options):
+        records = build_sales_records(options['page_size'], rng=random.Random(options['seed']))
+        page = {
+            'count': 100000,
+            'next': 'http://localhost:8000/api/sales-data/?page=3',
+            'previous': 'http://localhost:8000/api/sales-data/?page=1',
+            'results': SalesRecordSerializer(records, many=True).data,
+        }
+
+        renderers = [
+            ('drf_json', JSONRenderer()),
+            ('orjson', ORJSONRenderer()),
+            ('msgpack', MessagePackRenderer()),
+        ]
+
+        self.stdout.write(
+            f'{"renderer":<10} {"mean (ms)":>10} {"p50 (ms)":>10} {"p95 (ms)":>10} '
+            f'{"size (B)":>10} {"speedup":>8}'
+        )
+        baseline = None
+        for name, renderer in renderers:
+            timings = []
+            for _ in range(options['iterations']):
+                start_time = time.process_time()
+                content = renderer.render(page, renderer.media_type, {})
+                timings.append(time.process_time() - start_time)
+
+            mean = statistics.fmean(timings)
+            percentiles = (
+                statistics.quantiles(timings, n=100, method='inclusive')
+                if len(timings) > 1
+                else timings * 99
+            )
+            baseline = baseline or mean
+            self.stdout.write(
+                f'{name:<10} {mean * 1000:>10.3f} {percentiles[49] * 1000:>10.3f} '
+                f'{percentiles[94] * 1000:>10.3f} {len(content):>10} {baseline / mean:>7.1f}x'
+            )
@@ -0,0 +1,69 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from sales.apps.sales.api.serializers import SalesRecordSerializer, SalesRecordValuesSerializer
+from sales.apps.sales.api.views import SalesRecordViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures the time spent fetching and serializing a page of the sales records list, '
+        'from model instances with `SalesRecordSerializer` and from `values()` rows with '
+        '`SalesRecordValuesSerializer`, on the existing records of the database (read only). '
+        'CPU time is the time of this process, wall time includes the database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100, help='Records per page.')
+        parser.add_argument('--iterations', type=int, default=200, help='Pages per path.')
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        paths = [
+            (
+                'model_instances',
+                lambda: SalesRecordSerializer(
+                    list(SalesRecordViewSet.queryset[:page_size]), many=True
+                ).data,
+            ),
+            (
+                'values_rows',
+                lambda: SalesRecordValuesSerializer(
+                    list(SalesRecordViewSet.list_queryset[:page_size]), many=True
+                ).data,
+            ),
+        ]
+
+        outputs = [JSONRenderer().render(serialize()) for _, serialize in paths]
+        if outputs[0] == b'[]':
+            raise CommandError('No sales records to serialize, seed some with seed_sales_data.')
+        if outputs[0] != outputs[1]:
+            raise CommandError('The serialized pages differ.')
+
+        self.stdout.write(
+            f'{"path":<16} {"cpu mean (ms)":>14} {"cpu p95 (ms)":>13} {"wall mean (ms)":>15} '
+            f'{"speedup":>8}'
+        )
+        baseline = None
+        for name, serialize in paths:
+            cpu_timings, wall_timings = [], []
+            for _ in range(options['iterations']):
+                start_cpu_time, start_time = time.process_time(), time.perf_counter()
+                serialize()
+                cpu_timings.append(time.process_time() - start_cpu_time)
+                wall_timings.append(time.perf_counter() - start_time)
+
+            cpu_mean = statistics.fmean(cpu_timings)
+            cpu_p95 = (
+                statistics.quantiles(cpu_timings, n=100, method='inclusive')[94]
+                if len(cpu_timings) > 1
+                else cpu_timings[0]
+            )
+            baseline = baseline or cpu_mean
+            self.stdout.write(
+                f'{name:<16} {cpu_mean * 1000:>14.3f} {cpu_p95 * 1000:>13.3f} '
+                f'{statistics.fmean(wall_timings) * 1000:>15.3f} {baseline / cpu_mean:>7.1f}x'
+            )
@@ -0,0 +1,110 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from sales.apps.sales.cache import SALESRECORD_API_CACHE_PREFIXES
+from sales.apps.sales.models import SalesRecordDailyRollup
+from sales.apps.sales.partitions import (
+    add_months,
+    create_month_partition,
+    detach_month_partition,
+    get_month_partitions,
+    get_month_start,
+    is_partitioned,
+)
+from sales.utils.cache import bump_cache_generation
+
+
+def parse_month(value: str):
+    try:
+        return datetime.strptime(value, '%Y-%m').date()
+    except ValueError:
+        raise CommandError(f'Invalid month "{value}", expected YYYY-MM.')
+
+
+class Command(BaseCommand):
+    help = (
+        'Pre-creates the upcoming monthly partitions of the sales records table '
+        'and optionally detaches the old ones (PostgreSQL only). '
+        'Run it periodically (e.g. daily) so new records never land in the default partition.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Number of months after the current one to create partitions for.',
+        )
+        parser.add_argument(
+            '--start',
+            help=(
+                'First month (YYYY-MM) to create partitions for, defaults to the current month. '
+                'Rows of these months are moved out of the default partition.'
+            ),
+        )
+        parser.add_argument(
+            '--detach-older-than',
+            type=int,
+            metavar='MONTHS',
+            help=(
+                'Detach the partitions of months ending more than MONTHS months ago. '
+                'Their records are removed from the API and the daily rollup, '
+                'but kept in standalone tables unless --drop is set.'
+            ),
+        )
+        parser.add_argument(
+            '--drop',
+            action='store_true',
+            help='Drop the detached partitions instead of keeping them as standalone tables.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Table partitioning is only supported on PostgreSQL.')
+
+        current_month = get_month_start(timezone.now().date())
+        month = parse_month(options['start']) if options['start'] else current_month
+        last_month = add_months(current_month, options['months_ahead'])
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            if not is_partitioned(cursor):
+                raise CommandError('The sales records table is not partitioned, run `migrate`.')
+
+            # pending deferred foreign key checks would make PostgreSQL refuse the DDL below,
+            # when running inside a transaction which already wrote sales records
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+            while month <= last_month:
+                partition = create_month_partition(cursor, month)
+                if partition is not None:
+                    self.stdout.write(f'Created partition {partition.name}.')
+                month = add_months(month, 1)
+
+            if options['detach_older_than'] is not None:
+                self._detach_old_partitions(
+                    cursor,
+                    before=add_months(current_month, -options['detach_older_than']),
+                    drop=options['drop'],
+                )
+
+        self.stdout.write(self.style.SUCCESS('Sales record partitions are up to date.'))
+
+    def _detach_old_partitions(self, cursor, before, drop: bool) -> None:
+        detached_partitions = [
+            partition for partition in get_month_partitions(cursor) if partition.end <= before
+        ]
+
+        for partition in detached_partitions:
+            detach_month_partition(cursor, partition, drop=drop)
+            # rollup days are UTC based, like the partition bounds
+            SalesRecordDailyRollup.objects.filter(
+                day__gte=partition.start,
+                day__lt=partition.end,
+            ).delete()
+            self.stdout.write(f'{"Dropped" if drop else "Detached"} partition {partition.name}.')
+
+        if detached_partitions:
+            transaction.on_commit(lambda: bump_cache_generation(*SALESRECORD_API_CACHE_PREFIXES))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from sales.apps.sales.models import SalesRecordDailyRollup
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes `SalesRecordDailyRollup` rows from the raw `SalesRecord` table. '
+        'Run it after writes that bypass model signals (bulk inserts, queryset updates).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of rollup rows inserted per query.',
+        )
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+        created = SalesRecordDailyRollup.objects.rebuild(batch_size=options['batch_size'])
+        elapsed_time = time.time() - start_time
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {created} rollup rows in {elapsed_time:.2f} seconds.')
+        )
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from sales.apps.sales.cache import SALESDATA_AGGREGATE_CACHE_PREFIX
+from sales.apps.sales.models import SalesRecordMonthlySummary
+from sales.utils.cache import bump_cache_generation
+
+
+class Command(BaseCommand):
+    help = (
+        'Refreshes the `SalesRecordMonthlySummary` materialized view from the `SalesRecord` '
+        'table (PostgreSQL only), then invalidates the cached aggregate responses. '
+        'Refreshes are concurrent, so aggregations keep reading the previous data meanwhile. '
+        'Meant to be run periodically, e.g. by cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-concurrently',
+            action='store_false',
+            dest='concurrently',
+            help='Lock the view while refreshing it, which is faster.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Materialized views require PostgreSQL.')
+
+        start_time = time.time()
+        refreshed_at = SalesRecordMonthlySummary.objects.refresh(
+            concurrently=options['concurrently']
+        )
+        bump_cache_generation(SALESDATA_AGGREGATE_CACHE_PREFIX)
+        elapsed_time = time.time() - start_time
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Refreshed {SalesRecordMonthlySummary._meta.db_table} as of '
+                f'{refreshed_at.isoformat()} in {elapsed_time:.2f} seconds.'
+            )
+        )
@@ -0,0 +1,209 @@
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from sales.apps.sales.cache import SALESRECORD_API_CACHE_PREFIXES
+from sales.apps.sales.models import SalesRecord, SalesRecordDailyRollup
+from sales.apps.sales.partitions import (
+    add_months,
+    create_month_partition,
+    get_month_start,
+    is_partitioned,
+)
+from sales.apps.sales.seeding import (
+    copy_sales_records,
+    create_products,
+    create_sales_records,
+    generate_sales_record_rows,
+    get_product_cum_weights,
+)
+from sales.utils.cache import bump_cache_generation
+
+
+def parse_date(value: str) -> datetime:
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=dt_timezone.utc)
+    except ValueError:
+        raise CommandError(f'Invalid date "{value}", expected YYYY-MM-DD.')
+
+
+def copy_sales_records_chunk(products, cum_weights, count, start, end, seed) -> int:
+    # runs in a worker process, with its own database connection
+    with transaction.atomic(), connection.cursor() as cursor:
+        copy_sales_records(
+            cursor,
+            generate_sales_record_rows(
+                products,
+                cum_weights=cum_weights,
+                count=count,
+                start=start,
+                end=end,
+                rng=random.Random(seed),
+            ),
+        )
+    return count
+
+
+class Command(BaseCommand):
+    help = (
+        'Creates sample products and sales records, then rebuilds the daily sales rollup. '
+        'On PostgreSQL, records are generated by a pool of worker processes, each loading '
+        'its chunks with COPY, so benchmark databases of 10M+ records take minutes. '
+        'Chunks are committed independently: a failed run leaves the loaded chunks behind.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=1000, help='Number of products.')
+        parser.add_argument(
+            '--categories',
+            type=int,
+            default=100,
+            help='Number of product categories.',
+        )
+        parser.add_argument(
+            '--records',
+            type=int,
+            default=1_000_000,
+            help='Number of sales records.',
+        )
+        parser.add_argument(
+            '--start-date',
+            help='First day of sale (YYYY-MM-DD), defaults to 365 days before the end date.',
+        )
+        parser.add_argument(
+            '--end-date',
+            help='Last day of sale (YYYY-MM-DD), defaults to now.',
+        )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=0,
+            help=(
+                'Zipf exponent of the product popularity: the n-th product sells n^skew times '
+                'less than the first one. 0 (default) gives every product the same popularity.'
+            ),
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Number of worker processes generating and loading records (PostgreSQL only).',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=100_000,
+            help='Number of records generated and loaded per COPY.',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated data.')
+        parser.add_argument(
+            '--if-empty',
+            action='store_true',
+            help='Do nothing if sales records already exist.',
+        )
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and SalesRecord.objects.exists():
+            self.stdout.write('Sales records already exist, skipping.')
+            return
+
+        end = (
+            parse_date(options['end_date']) + timedelta(days=1)
+            if options['end_date']
+            else timezone.now()
+        )
+        start = (
+            parse_date(options['start_date'])
+            if options['start_date']
+            else end - timedelta(days=365)
+        )
+        if start >= end:
+            raise CommandError('The start date must be before the end date.')
+
+        start_time = time.time()
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            products = create_products(
+                options['products'], categories=options['categories'], rng=rng
+            )
+        cum_weights = get_product_cum_weights(len(products), skew=options['skew'])
+
+        if connection.vendor == 'postgresql':
+            self._create_partitions(start, end)
+            self._copy_sales_records(products, cum_weights, start, end, options)
+        else:
+            self.stdout.write('COPY requires PostgreSQL, inserting records from a single process.')
+            with transaction.atomic():
+                create_sales_records(
+                    generate_sales_record_rows(
+                        products,
+                        cum_weights=cum_weights,
+                        count=options['records'],
+                        start=start,
+                        end=end,
+                        rng=rng,
+                    )
+                )
+        records_time = time.time()
+
+        SalesRecordDailyRollup.objects.rebuild()
+        bump_cache_generation(*SALESRECORD_API_CACHE_PREFIXES)
+        end_time = time.time()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Created {len(products)} products and {options["records"]} sales records '
+                f'in {records_time - start_time:.2f} seconds, '
+                f'rebuilt the daily rollup in {end_time - records_time:.2f} seconds.'
+            )
+        )
+
+    def _create_partitions(self, start: datetime, end: datetime) -> None:
+        # so records land in their month partition, rather than in the default one
+        with transaction.atomic(), connection.cursor() as cursor:
+            if not is_partitioned(cursor):
+                return
+
+            month = get_month_start(start.date())
+            while month < end.date():
+                create_month_partition(cursor, month)
+                month = add_months(month, 1)
+
+    def _copy_sales_records(self, products, cum_weights, start, end, options) -> None:
+        chunk_sizes = [
+            min(options['chunk_size'], options['records'] - offset)
+            for offset in range(0, options['records'], options['chunk_size'])
+        ]
+
+        # worker processes must not share the connections of this process
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=options['workers'], initializer=django.setup
+        ) as executor:
+            futures = [
+                executor.submit(
+                    copy_sales_records_chunk,
+                    products,
+                    cum_weights,
+                    count,
+                    start,
+                    end,
+                    # chunks get the same records, whatever the number of workers
+                    seed=f'{options["seed"]}:{index}',
+                )
+                for index, count in enumerate(chunk_sizes)
+            ]
+
+            copied = 0
+            for future in as_completed(futures):
+                copied += future.result()
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'Copied {copied}/{options["records"]} sales records.')
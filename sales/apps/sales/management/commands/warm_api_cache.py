@@ -0,0 +1,156 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from urllib.parse import parse_qsl, urlsplit
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from sales.apps.sales.models import SalesRecord
+from sales.utils.cache import refreshing_cache
+
+
+def parse_list(value: str) -> 'list[str]':
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def get_warmup_requests(
+    today: date, days: 'list[int]', aggregate_by: 'list[str]', list_pages: int
+) -> 'list[tuple[str, str, dict]]':
+    """
+    Returns the warmed up requests, as `(name, path, query parameters)` tuples:
+    aggregations of the last `days` days by each `aggregate_by` group,
+    and the first `list_pages` pages of the sales records list.
+    """
+
+    aggregate_url = reverse('sales-data-aggregate')
+    list_url = reverse('sales-data-list')
+
+    requests = [
+        (
+            f'aggregate_{group}_last_{period}_days',
+            aggregate_url,
+            {'aggregate_by': group, 'start_date': (today - timedelta(days=period)).isoformat()},
+        )
+        for period in days
+        for group in aggregate_by
+    ]
+    requests.extend(
+        # like clients, the first page has no `page` parameter
+        (f'list_page_{page}', list_url, {'page': page} if page > 1 else {})
+        for page in range(1, list_pages + 1)
+    )
+    return requests
+
+
+class Command(BaseCommand):
+    help = (
+        'Computes and stores the cached responses of common aggregate and list requests, '
+        'e.g. after a deploy or a write burst invalidated the API cache. Requests are served '
+        'in-process by a pool of threads, each with its own database connection, and even '
+        'fresh entries are recomputed. Cache keys include the host of the request, '
+        'so --host must be the host clients use.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            default='30,90,365',
+            help='Comma separated lengths, in days, of the aggregated periods ending today.',
+        )
+        parser.add_argument(
+            '--aggregate-by',
+            default='month,category',
+            help='Comma separated aggregation groups of each period.',
+        )
+        parser.add_argument(
+            '--list-pages',
+            type=int,
+            default=1,
+            help='Number of sales records list pages.',
+        )
+        parser.add_argument(
+            '--url',
+            action='append',
+            default=[],
+            help='Additional path and query string to warm up, can be repeated.',
+        )
+        parser.add_argument('--workers', type=int, default=4, help='Concurrent requests.')
+        parser.add_argument('--host', help='Host header, defaults to the first allowed host.')
+        parser.add_argument('--secure', action='store_true', help='Send HTTPS requests.')
+
+    def handle(self, *args, **options):
+        try:
+            days = [int(period) for period in parse_list(options['days'])]
+        except ValueError:
+            raise CommandError(f'Invalid --days "{options["days"]}", expected numbers of days.')
+
+        aggregate_by = parse_list(options['aggregate_by'])
+        unknown_groups = set(aggregate_by) - set(SalesRecord.AggregateByChoices.values)
+        if unknown_groups:
+            raise CommandError(f'Unknown aggregation groups: {", ".join(sorted(unknown_groups))}.')
+
+        requests = get_warmup_requests(
+            today=timezone.localdate(),
+            days=days,
+            aggregate_by=aggregate_by,
+            list_pages=options['list_pages'],
+        )
+        for url in options['url']:
+            parts = urlsplit(url)
+            requests.append((url, parts.path, dict(parse_qsl(parts.query))))
+
+        host = options['host'] or next(
+            (host.lstrip('.') for host in settings.ALLOWED_HOSTS if host and host != '*'),
+            'localhost',
+        )
+        # requests are authenticated with this user directly, it is never saved
+        user = get_user_model()(username='cache-warmup')
+
+        def warm(name: str, path: str, params: dict) -> dict:
+            client = APIClient()
+            client.force_authenticate(user)
+            client.raise_request_exception = False
+
+            start_time = time.perf_counter()
+            try:
+                with refreshing_cache():
+                    response = client.get(path, params, HTTP_HOST=host, secure=options['secure'])
+            finally:
+                # connections are per thread, the pool threads do not serve other requests
+                connections.close_all()
+
+            return {
+                'name': name,
+                'status': response.status_code,
+                'duration_ms': (time.perf_counter() - start_time) * 1000,
+                'size': len(response.content),
+            }
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            results = list(executor.map(lambda request: warm(*request), requests))
+        elapsed = time.perf_counter() - start_time
+
+        self.stdout.write(f'{"entry":<45} {"status":>6} {"time (ms)":>10} {"size (B)":>10}')
+        for result in results:
+            self.stdout.write(
+                f'{result["name"]:<45} {result["status"]:>6} {result["duration_ms"]:>10.1f} '
+                f'{result["size"]:>10}'
+            )
+
+        failures = [result['name'] for result in results if result['status'] != 200]
+        if failures:
+            raise CommandError(f'Failed to warm up: {", ".join(failures)}.')
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Warmed up {len(results)} responses in {elapsed:.2f} seconds '
+                f'with {options["workers"]} workers.'
+            )
+        )
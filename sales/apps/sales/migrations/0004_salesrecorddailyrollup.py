@@ -0,0 +1,118 @@
+# Generated by Django 5.1.1 on 2026-10-16 22:27
+
+from datetime import timezone
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+from sales.apps.sales import models as sales_models
+
+
+def backfill_daily_rollup(apps, schema_editor):
+    SalesRecord = apps.get_model('sales', 'SalesRecord')
+    SalesRecordDailyRollup = apps.get_model('sales', 'SalesRecordDailyRollup')
+
+    grouped_records = (
+        SalesRecord.objects.filter(quantity_sold__gt=0)
+        .annotate(day=TruncDate('date_of_sale', tzinfo=timezone.utc))
+        .values('day', 'product_id', 'product__category')
+        .annotate(
+            total_sales_amount_sum=models.Sum('total_sales_amount'),
+            quantity_sold_sum=models.Sum('quantity_sold'),
+            records_count=models.Count('id'),
+            # rounded and cast like the unit prices of the rollup rows maintained by the model
+            unit_price_sum=models.Sum(
+                sales_models.SalesRecord.get_unit_price_expression(),
+                output_field=models.DecimalField(),
+            ),
+        )
+        .order_by()
+    )
+
+    rows = []
+    for group in grouped_records.iterator(chunk_size=5000):
+        rows.append(
+            SalesRecordDailyRollup(
+                day=group['day'],
+                category=group['product__category'] or '',
+                product_id=group['product_id'],
+                total_sales_amount=group['total_sales_amount_sum'],
+                quantity_sold=group['quantity_sold_sum'],
+                records_count=group['records_count'],
+                unit_price_sum=group['unit_price_sum'],
+            )
+        )
+        if len(rows) >= 5000:
+            SalesRecordDailyRollup.objects.bulk_create(rows)
+            rows = []
+
+    if rows:
+        SalesRecordDailyRollup.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+        ('sales', '0003_alter_salesrecord_quantity_sold'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRecordDailyRollup',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                ('day', models.DateField(verbose_name='day')),
+                (
+                    'category',
+                    models.CharField(
+                        blank=True, default='', max_length=255, verbose_name='category'
+                    ),
+                ),
+                (
+                    'total_sales_amount',
+                    models.DecimalField(
+                        decimal_places=4,
+                        default=0,
+                        max_digits=19,
+                        verbose_name='total sales amount',
+                    ),
+                ),
+                ('quantity_sold', models.BigIntegerField(default=0, verbose_name='quantity sold')),
+                ('records_count', models.BigIntegerField(default=0, verbose_name='records count')),
+                (
+                    'unit_price_sum',
+                    models.DecimalField(
+                        decimal_places=10, default=0, max_digits=28, verbose_name='unit price sum'
+                    ),
+                ),
+                (
+                    'product',
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='+',
+                        to='products.product',
+                        verbose_name='product',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'sales record daily rollup',
+                'verbose_name_plural': 'sales record daily rollups',
+                'constraints': [
+                    models.UniqueConstraint(
+                        fields=('day', 'category', 'product'),
+                        name='unique_sales_rollup_day_category_product',
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_daily_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-16 22:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+        ('sales', '0004_salesrecorddailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='salesrecord',
+            index=models.Index(fields=['-date_of_sale', 'id'], name='sales_record_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.1 on 2026-10-16 22:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_productcategory'),
+        ('sales', '0005_salesrecord_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salesrecord',
+            name='category',
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='+',
+                to='products.productcategory',
+                verbose_name='category',
+            ),
+        ),
+        # rollup rows are rebuilt below, so the text category is dropped instead of converted
+        migrations.RemoveConstraint(
+            model_name='salesrecorddailyrollup',
+            name='unique_sales_rollup_day_category_product',
+        ),
+        migrations.RemoveField(
+            model_name='salesrecorddailyrollup',
+            name='category',
+        ),
+        migrations.AddField(
+            model_name='salesrecorddailyrollup',
+            name='category',
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='+',
+                to='products.productcategory',
+                verbose_name='category',
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='salesrecorddailyrollup',
+            constraint=models.UniqueConstraint(
+                fields=('day', 'category', 'product'),
+                name='unique_sales_rollup_day_category_product',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='salesrecord',
+            index=models.Index(
+                fields=['category', 'date_of_sale'], name='sales_record_category_date_idx'
+            ),
+        ),
+    ]
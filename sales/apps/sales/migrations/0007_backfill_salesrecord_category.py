@@ -0,0 +1,94 @@
+# Generated by Django 5.1.1 on 2026-10-16 22:56
+
+from datetime import timezone
+
+from django.db import migrations, models
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import TruncDate
+
+from sales.apps.sales import models as sales_models
+
+
+def backfill_salesrecord_category(apps, schema_editor):
+    ProductCategory = apps.get_model('products', 'ProductCategory')
+    SalesRecord = apps.get_model('sales', 'SalesRecord')
+
+    # records store the category of their product at the time of sale in their snapshot
+    snapshot_category = KeyTextTransform('category', 'product_snapshot')
+    names = (
+        SalesRecord.objects.annotate(snapshot_category=snapshot_category)
+        .filter(snapshot_category__isnull=False)
+        .values_list('snapshot_category', flat=True)
+        .distinct()
+        .order_by()
+    )
+    ProductCategory.objects.bulk_create(
+        [ProductCategory(name=name) for name in names],
+        ignore_conflicts=True,
+    )
+
+    SalesRecord.objects.update(
+        category_id=models.Subquery(
+            ProductCategory.objects.filter(
+                name=KeyTextTransform('category', models.OuterRef('product_snapshot'))
+            ).values('id')[:1]
+        )
+    )
+
+
+def rebuild_daily_rollup(apps, schema_editor):
+    SalesRecord = apps.get_model('sales', 'SalesRecord')
+    SalesRecordDailyRollup = apps.get_model('sales', 'SalesRecordDailyRollup')
+
+    SalesRecordDailyRollup.objects.all().delete()
+
+    grouped_records = (
+        SalesRecord.objects.filter(quantity_sold__gt=0)
+        .annotate(day=TruncDate('date_of_sale', tzinfo=timezone.utc))
+        .values('day', 'category_id', 'product_id')
+        .annotate(
+            total_sales_amount_sum=models.Sum('total_sales_amount'),
+            quantity_sold_sum=models.Sum('quantity_sold'),
+            records_count=models.Count('id'),
+            # rounded and cast like the unit prices of the rollup rows maintained by the model
+            unit_price_sum=models.Sum(
+                sales_models.SalesRecord.get_unit_price_expression(),
+                output_field=models.DecimalField(),
+            ),
+        )
+        .order_by()
+    )
+
+    rows = []
+    for group in grouped_records.iterator(chunk_size=5000):
+        rows.append(
+            SalesRecordDailyRollup(
+                day=group['day'],
+                category_id=group['category_id'],
+                product_id=group['product_id'],
+                total_sales_amount=group['total_sales_amount_sum'],
+                quantity_sold=group['quantity_sold_sum'],
+                records_count=group['records_count'],
+                unit_price_sum=group['unit_price_sum'],
+            )
+        )
+        if len(rows) >= 5000:
+            SalesRecordDailyRollup.objects.bulk_create(rows)
+            rows = []
+
+    if rows:
+        SalesRecordDailyRollup.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+    # kept apart from the schema changes of 0006, whose deferred constraints and indexes
+    # cannot be created on tables with pending trigger events (PostgreSQL)
+
+    dependencies = [
+        ('sales', '0006_salesrecord_category'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_salesrecord_category, migrations.RunPython.noop),
+        migrations.RunPython(rebuild_daily_rollup, migrations.RunPython.noop),
+    ]
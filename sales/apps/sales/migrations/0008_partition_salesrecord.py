@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-16 23:20
+
+from django.db import migrations
+from django.utils import timezone
+
+from sales.apps.sales.partitions import is_partitioned, partition_sales_records_table
+
+
+def partition_salesrecord_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        if is_partitioned(cursor):
+            return
+
+        partition_sales_records_table(cursor, today=timezone.now().date())
+
+
+class Migration(migrations.Migration):
+    # the model state is unchanged: Django still sees `id` as the primary key and `uuid` as unique,
+    # while the database enforces both per partition, together with `date_of_sale`
+
+    dependencies = [
+        ('sales', '0007_backfill_salesrecord_category'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_salesrecord_table, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 5.1.1 on 2026-10-17 00:11
+
+from django.db import migrations, models
+
+CREATE_VIEW_SQL = '''
+CREATE MATERIALIZED VIEW sales_salesrecordmonthlysummary AS
+SELECT
+    to_char(month, 'YYYY-MM') || ':' || coalesce(category_id::text, '') AS id,
+    month,
+    category_id,
+    sum(total_sales_amount) AS total_sales_amount,
+    sum(quantity_sold) AS quantity_sold,
+    count(*) AS records_count,
+    sum(total_sales_amount / quantity_sold) AS unit_price_sum
+FROM (
+    SELECT
+        date_trunc('month', date_of_sale AT TIME ZONE 'UTC')::date AS month,
+        category_id,
+        total_sales_amount,
+        quantity_sold
+    FROM sales_salesrecord
+    WHERE quantity_sold > 0
+) AS records
+GROUP BY month, category_id
+WITH NO DATA
+'''
+
+
+def create_salesrecordmonthlysummary_view(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    # populated by the first refresh, so the migration does not scan the sales records
+    schema_editor.execute(CREATE_VIEW_SQL)
+    # required by `REFRESH MATERIALIZED VIEW CONCURRENTLY`
+    schema_editor.execute(
+        'CREATE UNIQUE INDEX sales_salesrecordmonthlysummary_month_category '
+        'ON sales_salesrecordmonthlysummary (month, category_id)'
+    )
+
+
+def drop_salesrecordmonthlysummary_view(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('DROP MATERIALIZED VIEW IF EXISTS sales_salesrecordmonthlysummary')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0008_partition_salesrecord'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_salesrecordmonthlysummary_view, drop_salesrecordmonthlysummary_view
+        ),
+        migrations.CreateModel(
+            name='SalesRecordMonthlySummary',
+            fields=[
+                ('id', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('month', models.DateField(verbose_name='month')),
+                (
+                    'total_sales_amount',
+                    models.DecimalField(
+                        decimal_places=4, max_digits=19, verbose_name='total sales amount'
+                    ),
+                ),
+                ('quantity_sold', models.BigIntegerField(verbose_name='quantity sold')),
+                ('records_count', models.BigIntegerField(verbose_name='records count')),
+                (
+                    'unit_price_sum',
+                    models.DecimalField(
+                        decimal_places=10, max_digits=28, verbose_name='unit price sum'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'sales record monthly summary',
+                'verbose_name_plural': 'sales record monthly summaries',
+                'db_table': 'sales_salesrecordmonthlysummary',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='MaterializedViewRefresh',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                (
+                    'view_name',
+                    models.CharField(max_length=63, unique=True, verbose_name='view name'),
+                ),
+                ('refreshed_at', models.DateTimeField(verbose_name='refreshed at')),
+            ],
+            options={
+                'verbose_name': 'materialized view refresh',
+                'verbose_name_plural': 'materialized view refreshes',
+            },
+        ),
+    ]
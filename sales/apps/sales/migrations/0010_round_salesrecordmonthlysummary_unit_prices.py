@@ -0,0 +1,66 @@
+from django.db import migrations
+
+VIEW_NAME = 'sales_salesrecordmonthlysummary'
+
+CREATE_VIEW_SQL = '''
+CREATE MATERIALIZED VIEW sales_salesrecordmonthlysummary AS
+SELECT
+    to_char(month, 'YYYY-MM') || ':' || coalesce(category_id::text, '') AS id,
+    month,
+    category_id,
+    sum(total_sales_amount) AS total_sales_amount,
+    sum(quantity_sold) AS quantity_sold,
+    count(*) AS records_count,
+    sum({unit_price}) AS unit_price_sum
+FROM (
+    SELECT
+        date_trunc('month', date_of_sale AT TIME ZONE 'UTC')::date AS month,
+        category_id,
+        total_sales_amount,
+        quantity_sold
+    FROM sales_salesrecord
+    WHERE quantity_sold > 0
+) AS records
+GROUP BY month, category_id
+WITH NO DATA
+'''
+
+# rounded like the unit prices of the raw and rollup aggregations
+ROUNDED_UNIT_PRICE_SQL = 'round(total_sales_amount / quantity_sold, 10)'
+UNIT_PRICE_SQL = 'total_sales_amount / quantity_sold'
+
+
+def recreate_view(apps, schema_editor, unit_price: str) -> None:
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(f'DROP MATERIALIZED VIEW IF EXISTS {VIEW_NAME}')
+    schema_editor.execute(CREATE_VIEW_SQL.format(unit_price=unit_price))
+    schema_editor.execute(
+        f'CREATE UNIQUE INDEX {VIEW_NAME}_month_category ON {VIEW_NAME} (month, category_id)'
+    )
+
+    # the view is empty until its next refresh, aggregations fall back to the sales records
+    MaterializedViewRefresh = apps.get_model('sales', 'MaterializedViewRefresh')
+    MaterializedViewRefresh.objects.using(schema_editor.connection.alias).filter(
+        view_name=VIEW_NAME
+    ).delete()
+
+
+def round_unit_prices(apps, schema_editor):
+    recreate_view(apps, schema_editor, ROUNDED_UNIT_PRICE_SQL)
+
+
+def unround_unit_prices(apps, schema_editor):
+    recreate_view(apps, schema_editor, UNIT_PRICE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0009_salesrecordmonthlysummary'),
+    ]
+
+    operations = [
+        migrations.RunPython(round_unit_prices, unround_unit_prices),
+    ]
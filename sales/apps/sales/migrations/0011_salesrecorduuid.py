@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-17 01:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0010_round_salesrecordmonthlysummary_unit_prices'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRecordUUID',
+            fields=[
+                ('uuid', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+            ],
+            options={
+                'verbose_name': 'sales record uuid',
+                'verbose_name_plural': 'sales record uuids',
+            },
+        ),
+    ]
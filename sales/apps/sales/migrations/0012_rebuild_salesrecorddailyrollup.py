@@ -0,0 +1,22 @@
+# Generated by Django 5.1.1 on 2026-10-17 02:10
+
+from django.db import migrations
+
+from sales.apps.sales.models import SalesRecordDailyRollup
+
+
+def rebuild_daily_rollup(apps, schema_editor):
+    # rollup rows backfilled by earlier migrations summed unrounded unit prices, so their
+    # average prices differed from the rows maintained by the model and from raw aggregations
+    SalesRecordDailyRollup.objects.db_manager(schema_editor.connection.alias).rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0011_salesrecorduuid'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_daily_rollup, migrations.RunPython.noop),
+    ]
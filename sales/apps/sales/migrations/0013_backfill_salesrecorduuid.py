@@ -0,0 +1,26 @@
+# Generated by Django 5.1.1 on 2026-10-17 02:40
+
+from django.db import migrations
+
+# `WHERE true` lets SQLite parse the `ON CONFLICT` clause of an `INSERT ... SELECT`
+BACKFILL_SQL = '''
+INSERT INTO sales_salesrecorduuid (uuid)
+SELECT DISTINCT uuid FROM sales_salesrecord WHERE true
+ON CONFLICT DO NOTHING
+'''
+
+
+def backfill_salesrecorduuid(apps, schema_editor):
+    # records created before `0011`, or since then other than by ingestion, were not claimed
+    schema_editor.execute(BACKFILL_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0012_rebuild_salesrecorddailyrollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_salesrecorduuid, migrations.RunPython.noop),
+    ]
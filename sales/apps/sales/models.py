@@ -1,27 +1,89 @@
 import uuid
-from typing import TYPE_CHECKING, Optional
+from datetime import timezone as dt_timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING, Iterable, Optional
 
 from django.core.validators import MinValueValidator
-from django.db import models
-from django.db.models.functions import TruncMonth
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models.functions import (
+    Cast,
+    Coalesce,
+    NullIf,
+    Round,
+    Sqrt,
+    TruncDate,
+    TruncDay,
+    TruncMonth,
+    TruncQuarter,
+    TruncWeek,
+    TruncYear,
+)
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from sales.apps.products.models import Product
+from sales.apps.products.models import Product, ProductCategory
+from sales.utils.sampling import tablesample
 
-from .interfaces import ProductSnapshot
+from .interfaces import ProductSnapshot, SalesRollupDelta
 
 if TYPE_CHECKING:
+    from datetime import datetime  # pragma: no cover
+
     from django.db.models import Expression, QuerySet  # pragma: no cover
 
 
+class DecimalQuotient(models.Func):
+    """
+    Decimal quotient of two expressions (`dividend / divisor`).
+
+    SQLite divides integral decimal values as integers, so the dividend is cast to a floating
+    point number there.
+    """
+
+    arg_joiner = ' / '
+    template = '(%(expressions)s)'
+    output_field = models.DecimalField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        dividend, divisor = self.get_source_expressions()
+        clone = self.copy()
+        clone.set_source_expressions([Cast(dividend, models.FloatField()), divisor])
+        return super(DecimalQuotient, clone).as_sqlite(compiler, connection, **extra_context)
+
+
 class SalesRecord(models.Model):
     class AggregateByChoices(models.TextChoices):
+        DAY = 'day', _('Day')
+        WEEK = 'week', _('Week')
         MONTH = 'month', _('Month')
+        QUARTER = 'quarter', _('Quarter')
+        YEAR = 'year', _('Year')
         CATEGORY = 'category', _('Category')
+        PRODUCT = 'product', _('Product')
 
     AGGREGATE_BY_CHOICES = AggregateByChoices
 
+    class AggregateOrderingChoices(models.TextChoices):
+        GROUP = 'group', _('Group')
+        TOTAL_SALES = 'total_sales', _('Total sales')
+        TOTAL_SALES_DESC = '-total_sales', _('Total sales (descending)')
+        AVERAGE_PRICE = 'average_price', _('Average price')
+        AVERAGE_PRICE_DESC = '-average_price', _('Average price (descending)')
+
+    # aggregations with a top-N mode, the groups with the highest total sales
+    TOP_AGGREGATIONS = (AggregateByChoices.PRODUCT, AggregateByChoices.CATEGORY)
+
+    # z-score of the 95% confidence intervals of approximate aggregations
+    CONFIDENCE_Z_SCORE = Decimal('1.96')
+
+    DATE_TRUNCATIONS = {
+        AggregateByChoices.DAY: TruncDay,
+        AggregateByChoices.WEEK: TruncWeek,
+        AggregateByChoices.MONTH: TruncMonth,
+        AggregateByChoices.QUARTER: TruncQuarter,
+        AggregateByChoices.YEAR: TruncYear,
+    }
+
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     product = models.ForeignKey(
         Product,
@@ -30,6 +92,16 @@ class SalesRecord(models.Model):
         verbose_name=_('product'),
     )
     product_snapshot: ProductSnapshot = models.JSONField(default=dict)
+    # dictionary encoded category of the product at the time of sale
+    category = models.ForeignKey(
+        ProductCategory,
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name='+',
+        db_index=False,  # covered by the (category, date_of_sale) index
+        verbose_name=_('category'),
+    )
     quantity_sold = models.PositiveIntegerField(
         _('quantity sold'),
         default=1,
@@ -50,6 +122,11 @@ class SalesRecord(models.Model):
         indexes = [
             models.Index(fields=['uuid']),
             models.Index(fields=['date_of_sale']),
+            # matches the keyset pagination ordering of the sales data list endpoint
+            models.Index(fields=['-date_of_sale', 'id'], name='sales_record_date_id_idx'),
+            models.Index(
+                fields=['category', 'date_of_sale'], name='sales_record_category_date_idx'
+            ),
         ]
 
     def __str__(self) -> str:
@@ -57,17 +134,85 @@ class SalesRecord(models.Model):
 
     def save(self, *args, **kwargs) -> None:
         if not self.pk and self.product:
-            self.product_snapshot = ProductSnapshot(
-                name=self.product.name,
-                category=self.product.category,
-                price=str(self.product.price),
-            )
-        super().save(*args, **kwargs)
+            self.product_snapshot = self.build_product_snapshot(self.product)
+            category_name = self.product_snapshot['category']
+            self.category_id = ProductCategory.objects.get_ids([category_name])[category_name]
+
+        if not self._state.adding:
+            super().save(*args, **kwargs)
+            return
+
+        # the partitioned table only enforces the uniqueness of uuids per date of sale
+        using = kwargs.get('using') or router.db_for_write(self.__class__, instance=self)
+        with transaction.atomic(using=using):
+            if not SalesRecordUUID.objects.db_manager(using).claim([self.uuid]):
+                raise IntegrityError(f'Sales record uuid {self.uuid} is already claimed.')
+            super().save(*args, **kwargs)
+
+    @staticmethod
+    def build_product_snapshot(product: Product) -> ProductSnapshot:
+        return ProductSnapshot(
+            name=product.name,
+            category=product.category,
+            price=str(product.price),
+        )
+
+    @staticmethod
+    def get_unit_price_expression() -> Round:
+        """
+        Returns the unit price of a record (`total_sales_amount / quantity_sold`) as an expression,
+        rounded like the unit prices summed in `SalesRecordDailyRollup`, so raw and rollup
+        average prices are equal.
+        """
+
+        return Round(
+            DecimalQuotient(models.F('total_sales_amount'), models.F('quantity_sold')),
+            SalesRecordDailyRollup.UNIT_PRICE_DECIMAL_PLACES,
+        )
+
+    def get_rollup_delta(self, sign: int = 1) -> Optional[SalesRollupDelta]:
+        """
+        Returns the contribution of this record to its `SalesRecordDailyRollup` row.
+
+        Records with no quantity sold are excluded from aggregations, so they have no contribution.
+
+        Args:
+            sign (`int`):
+                `1` when the record is added to the rollup, `-1` when it is removed from it.
+
+        Returns:
+            Optional[SalesRollupDelta]: The signed contribution, or `None` if there is none.
+        """
+
+        if not self.quantity_sold:
+            return None
+
+        total_sales_amount = (
+            self._meta.get_field('total_sales_amount')
+            .to_python(self.total_sales_amount)
+            .quantize(SalesRecordDailyRollup.AMOUNT_QUANTUM)
+        )
+        # half up, like SQL `ROUND` in `get_unit_price_expression`
+        unit_price = (total_sales_amount / self.quantity_sold).quantize(
+            SalesRecordDailyRollup.UNIT_PRICE_QUANTUM, rounding=ROUND_HALF_UP
+        )
+
+        return SalesRollupDelta(
+            day=self.date_of_sale.astimezone(dt_timezone.utc).date(),
+            category_id=self.category_id,
+            product_id=self.product_id,
+            total_sales_amount=sign * total_sales_amount,
+            quantity_sold=sign * self.quantity_sold,
+            records_count=sign,
+            unit_price_sum=sign * unit_price,
+        )
 
     @staticmethod
     def _get_data_aggregated_queryset(
         queryset: 'QuerySet[SalesRecord]',
         aggregation_expression: 'Expression',
+        group_by: 'Optional[str]' = None,
+        aggregates: 'Optional[dict[str, Expression]]' = None,
     ):
         """
         Perform aggregation on the sales records queryset
@@ -78,24 +223,56 @@ class SalesRecord(models.Model):
                 The queryset of `SalesRecord` instances to be aggregated.
             aggregation_expression (`Expression`):
                 The aggregation expression defining how to group the results.
+            group_by (`Optional[str]`):
+                A field to group the results by instead, in which case
+                `aggregation_expression` must be an aggregate computing the group value.
+            aggregates (`Optional[dict[str, Expression]]`):
+                The aggregates computed per group.
+                If `None`, falls back to `total_sales` and `average_price`.
 
         Returns:
-            QuerySet: A queryset with annotations for `group`, `total_sales`, and `average_price`.
+            QuerySet: A queryset with annotations for `group` and the aggregates.
         """
 
-        return (
-            queryset.filter(quantity_sold__gt=0)
-            .annotate(group=aggregation_expression)
-            .values('group')
-            .annotate(
-                total_sales=models.Sum('total_sales_amount'),
-                average_price=models.Avg(
-                    models.F('total_sales_amount') / models.F('quantity_sold'),
+        if aggregates is None:
+            aggregates = {
+                'total_sales': models.Sum('total_sales_amount'),
+                'average_price': models.Avg(
+                    SalesRecord.get_unit_price_expression(),
                     output_field=models.DecimalField(),
                 ),
-            )
-            .order_by('group')
-        )
+            }
+
+        queryset = queryset.filter(quantity_sold__gt=0)
+        if group_by:
+            queryset = queryset.values(group_by).annotate(group=aggregation_expression)
+        else:
+            queryset = queryset.annotate(group=aggregation_expression).values('group')
+
+        return queryset.annotate(**aggregates).order_by('group')
+
+    @classmethod
+    def _get_aggregation_expression(
+        cls,
+        aggregate_by: 'SalesRecord.AggregateByChoices',
+    ) -> 'tuple[Expression, Optional[str]]':
+        aggregation_expression = None
+        group_by = None
+
+        if aggregate_by in cls.DATE_TRUNCATIONS:
+            aggregation_expression = cls.DATE_TRUNCATIONS[aggregate_by]('date_of_sale')
+
+        elif aggregate_by == cls.AGGREGATE_BY_CHOICES.PRODUCT:
+            aggregation_expression = models.F('product__uuid')
+
+        elif aggregate_by == cls.AGGREGATE_BY_CHOICES.CATEGORY:
+            # grouped by the integer category key, the name is looked up once per group
+            group_by = 'category_id'
+            aggregation_expression = cls.get_category_name_aggregate()
+
+        assert aggregation_expression is not None, 'Invalid SaleRecord aggregation attempt'
+
+        return aggregation_expression, group_by
 
     @classmethod
     def get_data_aggregated_queryset(
@@ -119,23 +296,596 @@ class SalesRecord(models.Model):
         """
 
         if queryset is None:
-            queryset = cls.objects.all().select_related('product')
+            queryset = cls.objects.all()
 
-        aggregation_expression = None
+        aggregation_expression, group_by = cls._get_aggregation_expression(aggregate_by)
 
-        if aggregate_by == cls.AGGREGATE_BY_CHOICES.MONTH:
-            aggregation_expression = TruncMonth('date_of_sale')
+        return cls._get_data_aggregated_queryset(
+            queryset=queryset,
+            aggregation_expression=aggregation_expression,
+            group_by=group_by,
+        )
 
-        elif aggregate_by == cls.AGGREGATE_BY_CHOICES.CATEGORY:
-            aggregation_expression = models.Case(
-                models.When(product__isnull=True, then=models.Value('Unknown')),
-                default=models.F('product__category'),
-                output_field=models.CharField(),
+    @classmethod
+    def get_product_sales_summaries(
+        cls,
+        product_ids: 'Iterable[int]',
+        queryset: 'Optional[QuerySet[SalesRecord]]' = None,
+    ) -> 'dict[int, dict]':
+        """
+        Returns the sales summaries of the given products, computed in a single grouped query.
+
+        Args:
+            product_ids (`Iterable[int]`):
+                The ids of the summarized products.
+            queryset (`Optional[QuerySet[SalesRecord]]`):
+                The sales records to summarize, e.g. of a date range.
+                If `None`, falls back to all existing `SalesRecord`.
+
+        Returns:
+            dict[int, dict]: The `units_sold`, `revenue` and `last_sale_date` of the products
+                with sales, by product id.
+        """
+
+        if queryset is None:
+            queryset = cls.objects.all()
+
+        summaries = (
+            queryset.filter(product_id__in=product_ids)
+            .values('product_id')
+            .annotate(
+                units_sold=models.Sum('quantity_sold'),
+                revenue=models.Sum('total_sales_amount'),
+                last_sale_date=models.Max('date_of_sale'),
             )
+            .order_by()
+        )
+        return {summary.pop('product_id'): summary for summary in summaries}
 
-        assert aggregation_expression is not None, 'Invalid SaleRecord aggregation attempt'
+    @classmethod
+    def get_approximate_data_aggregated_queryset(
+        cls,
+        aggregate_by: 'SalesRecord.AggregateByChoices',
+        sample_percent: Decimal,
+        queryset: 'Optional[QuerySet[SalesRecord]]' = None,
+        sample_method: str = 'SYSTEM',
+    ):
+        """
+        Approximate counterpart of `get_data_aggregated_queryset`, computed from a random
+        sample of `sample_percent` % of the sales records table (PostgreSQL `TABLESAMPLE`).
+
+        Sums are scaled up by the sampling fraction. Margins are the half widths of 95%
+        confidence intervals, estimated as if rows were sampled independently, which holds
+        for the `BERNOULLI` method and is optimistic for page based `SYSTEM` sampling.
+
+        Args:
+            aggregate_by (`SalesRecord.AggregateByChoices`):
+                The parameter specifying the aggregation type.
+            sample_percent (`Decimal`):
+                The percentage of the table to sample, in `(0, 100]`.
+            queryset (`Optional[QuerySet[SalesRecord]]`):
+                A custom queryset to aggregate.
+                If `None`, falls back to default queryset of all existing `SalesRecord`.
+            sample_method (`str`):
+                `SYSTEM` (samples table pages) or `BERNOULLI` (samples rows).
+
+        Returns:
+            QuerySet:
+                A queryset with estimated total sales and average price per group, their
+                margins (`total_sales_margin`, `average_price_margin`) and `sample_size`.
+        """
+
+        if queryset is None:
+            queryset = cls.objects.all()
+
+        fraction = Decimal(sample_percent) / 100
+        unit_price = cls.get_unit_price_expression()
+        sample_size = Cast(
+            models.Count('id'), output_field=models.DecimalField(max_digits=20, decimal_places=0)
+        )
+
+        aggregation_expression, group_by = cls._get_aggregation_expression(aggregate_by)
 
         return cls._get_data_aggregated_queryset(
-            queryset=queryset,
+            queryset=tablesample(queryset, percent=sample_percent, method=sample_method),
             aggregation_expression=aggregation_expression,
+            group_by=group_by,
+            aggregates={
+                'sample_size': models.Count('id'),
+                'total_sales': models.ExpressionWrapper(
+                    models.Sum('total_sales_amount') / fraction,
+                    output_field=models.DecimalField(),
+                ),
+                'average_price': models.Avg(unit_price, output_field=models.DecimalField()),
+                # Horvitz-Thompson variance of a sum under independent sampling
+                'total_sales_margin': models.ExpressionWrapper(
+                    cls.CONFIDENCE_Z_SCORE
+                    * Sqrt(
+                        models.Sum(models.F('total_sales_amount') * models.F('total_sales_amount'))
+                        * (1 - fraction)
+                    )
+                    / fraction,
+                    output_field=models.DecimalField(),
+                ),
+                # standard error of the mean, with finite population correction
+                'average_price_margin': models.ExpressionWrapper(
+                    cls.CONFIDENCE_Z_SCORE
+                    * Coalesce(
+                        models.StdDev(unit_price, sample=True),
+                        models.Value(Decimal(0)),
+                        output_field=models.DecimalField(),
+                    )
+                    * Sqrt((1 - fraction) / sample_size),
+                    output_field=models.DecimalField(),
+                ),
+            },
+        )
+
+    @staticmethod
+    def get_category_name_aggregate() -> 'Expression':
+        """
+        Returns the name of the category of a group of rows sharing the same `category_id`,
+        or `Unknown` for rows without category (created without product).
+        """
+
+        return Coalesce(
+            models.Max('category__name'),
+            models.Value('Unknown'),
+            output_field=models.CharField(),
+        )
+
+
+class SalesRecordDailyRollupManager(models.Manager):
+    def apply_deltas(self, deltas: 'Iterable[Optional[SalesRollupDelta]]') -> None:
+        """
+        Merges the given deltas per rollup key and applies them in a single transaction.
+
+        Args:
+            deltas (`Iterable[Optional[SalesRollupDelta]]`):
+                Signed contributions to apply. `None` entries are skipped.
+        """
+
+        merged: dict[tuple, SalesRollupDelta] = {}
+        for delta in deltas:
+            if delta is None:
+                continue
+
+            key = (delta.day, delta.category_id, delta.product_id)
+            current = merged.get(key)
+            if current is not None:
+                delta = delta._replace(
+                    total_sales_amount=current.total_sales_amount + delta.total_sales_amount,
+                    quantity_sold=current.quantity_sold + delta.quantity_sold,
+                    records_count=current.records_count + delta.records_count,
+                    unit_price_sum=current.unit_price_sum + delta.unit_price_sum,
+                )
+            merged[key] = delta
+
+        with transaction.atomic(using=self.db):
+            for delta in merged.values():
+                if delta.records_count or delta.quantity_sold or delta.total_sales_amount:
+                    self._apply_delta(delta)
+
+    def _apply_delta(self, delta: SalesRollupDelta) -> None:
+        lookup = {
+            'day': delta.day,
+            'category_id': delta.category_id,
+            'product_id': delta.product_id,
+        }
+        increments = {
+            'total_sales_amount': models.F('total_sales_amount') + delta.total_sales_amount,
+            'quantity_sold': models.F('quantity_sold') + delta.quantity_sold,
+            'records_count': models.F('records_count') + delta.records_count,
+            'unit_price_sum': models.F('unit_price_sum') + delta.unit_price_sum,
+        }
+
+        # rows without product are not covered by the unique constraint (NULLs are distinct),
+        # so they are always appended instead of updated - the aggregation sums them anyway
+        if delta.product_id is not None and self.filter(**lookup).update(**increments):
+            return
+
+        try:
+            with transaction.atomic(using=self.db):
+                self.create(
+                    **lookup,
+                    total_sales_amount=delta.total_sales_amount,
+                    quantity_sold=delta.quantity_sold,
+                    records_count=delta.records_count,
+                    unit_price_sum=delta.unit_price_sum,
+                )
+        except IntegrityError:
+            # a concurrent writer created the row in the meantime
+            self.filter(**lookup).update(**increments)
+
+    def rebuild(self, batch_size: int = 5000) -> int:
+        """
+        Recomputes all rollup rows from the raw `SalesRecord` table.
+
+        Needed after writes that bypass model signals, like `QuerySet.update` or `bulk_create`.
+
+        Returns:
+            int: The number of created rollup rows.
+        """
+
+        grouped_records = (
+            SalesRecord.objects.using(self.db)
+            .filter(quantity_sold__gt=0)
+            .annotate(day=TruncDate('date_of_sale', tzinfo=dt_timezone.utc))
+            .values('day', 'category_id', 'product_id')
+            .annotate(
+                total_sales_amount_sum=models.Sum('total_sales_amount'),
+                quantity_sold_sum=models.Sum('quantity_sold'),
+                records_count=models.Count('id'),
+                unit_price_sum=models.Sum(
+                    SalesRecord.get_unit_price_expression(),
+                    output_field=models.DecimalField(),
+                ),
+            )
+            .order_by()
+        )
+
+        created = 0
+        with transaction.atomic(using=self.db):
+            self.all().delete()
+
+            rows: list[SalesRecordDailyRollup] = []
+            for group in grouped_records.iterator(chunk_size=batch_size):
+                rows.append(
+                    self.model(
+                        day=group['day'],
+                        category_id=group['category_id'],
+                        product_id=group['product_id'],
+                        total_sales_amount=group['total_sales_amount_sum'],
+                        quantity_sold=group['quantity_sold_sum'],
+                        records_count=group['records_count'],
+                        unit_price_sum=group['unit_price_sum'],
+                    )
+                )
+                if len(rows) >= batch_size:
+                    created += len(self.bulk_create(rows))
+                    rows = []
+
+            if rows:
+                created += len(self.bulk_create(rows))
+
+        return created
+
+
+class SalesRecordDailyRollup(models.Model):
+    """
+    Pre-aggregated `SalesRecord` totals per UTC day, category (at the time of sale) and product.
+
+    Kept up to date by `SalesRecord` signals, so month and category aggregations
+    can be answered without scanning the raw sales table.
+    """
+
+    AMOUNT_QUANTUM = Decimal('0.0001')
+    UNIT_PRICE_DECIMAL_PLACES = 10
+    UNIT_PRICE_QUANTUM = Decimal(10) ** -UNIT_PRICE_DECIMAL_PLACES
+
+    SUPPORTED_AGGREGATIONS = (
+        SalesRecord.AggregateByChoices.DAY,
+        SalesRecord.AggregateByChoices.WEEK,
+        SalesRecord.AggregateByChoices.MONTH,
+        SalesRecord.AggregateByChoices.QUARTER,
+        SalesRecord.AggregateByChoices.YEAR,
+        SalesRecord.AggregateByChoices.CATEGORY,
+        SalesRecord.AggregateByChoices.PRODUCT,
+    )
+
+    day = models.DateField(_('day'))
+    category = models.ForeignKey(
+        ProductCategory,
+        null=True,
+        on_delete=models.PROTECT,
+        related_name='+',
+        verbose_name=_('category'),
+    )
+    product = models.ForeignKey(
+        Product,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        verbose_name=_('product'),
+    )
+    total_sales_amount = models.DecimalField(
+        _('total sales amount'),
+        default=0,
+        max_digits=19,
+        decimal_places=4,
+    )
+    quantity_sold = models.BigIntegerField(_('quantity sold'), default=0)
+    records_count = models.BigIntegerField(_('records count'), default=0)
+    # sum of per-record unit prices, needed to reproduce the average price of the raw aggregation
+    unit_price_sum = models.DecimalField(
+        _('unit price sum'),
+        default=0,
+        max_digits=28,
+        decimal_places=10,
+    )
+
+    objects = SalesRecordDailyRollupManager()
+
+    class Meta:
+        verbose_name = _('sales record daily rollup')
+        verbose_name_plural = _('sales record daily rollups')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'category', 'product'],
+                name='unique_sales_rollup_day_category_product',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.day} {self.category_id} {self.product_id}'
+
+    @classmethod
+    def get_data_aggregated_queryset(
+        cls,
+        aggregate_by: 'SalesRecord.AggregateByChoices',
+        queryset: 'Optional[QuerySet[SalesRecordDailyRollup]]' = None,
+    ):
+        """
+        Rollup counterpart of `SalesRecord.get_data_aggregated_queryset`.
+
+        Args:
+            aggregate_by (`SalesRecord.AggregateByChoices`):
+                The parameter specifying the aggregation type.
+                Must be one of `SUPPORTED_AGGREGATIONS`.
+            queryset (`Optional[QuerySet[SalesRecordDailyRollup]]`):
+                A custom queryset to aggregate.
+                If `None`, falls back to all existing rollup rows.
+
+        Returns:
+            QuerySet:
+                A queryset with aggregated data including total sales and average price per group.
+        """
+
+        if queryset is None:
+            queryset = cls.objects.all()
+
+        return get_summary_aggregated_queryset(queryset, aggregate_by, date_field='day')
+
+
+def get_summary_aggregated_queryset(
+    queryset: 'QuerySet',
+    aggregate_by: 'SalesRecord.AggregateByChoices',
+    date_field: str,
+):
+    """
+    Aggregates pre-aggregated summary rows, which hold the `total_sales_amount`,
+    `records_count` and `unit_price_sum` totals of the sales records of a period
+    (`date_field`), category and optionally product, like `SalesRecord` records are aggregated.
+    """
+
+    grouped_queryset = None
+
+    if aggregate_by in SalesRecord.DATE_TRUNCATIONS:
+        grouped_queryset = queryset.annotate(
+            group=SalesRecord.DATE_TRUNCATIONS[aggregate_by](date_field)
+        ).values('group')
+
+    elif aggregate_by == SalesRecord.AGGREGATE_BY_CHOICES.PRODUCT:
+        grouped_queryset = queryset.annotate(group=models.F('product__uuid')).values('group')
+
+    elif aggregate_by == SalesRecord.AGGREGATE_BY_CHOICES.CATEGORY:
+        grouped_queryset = queryset.values('category_id').annotate(
+            group=SalesRecord.get_category_name_aggregate()
+        )
+
+    assert grouped_queryset is not None, f'Invalid {queryset.model.__name__} aggregation'
+
+    return (
+        grouped_queryset.annotate(
+            records_count_sum=models.Sum('records_count'),
+            total_sales=models.Sum('total_sales_amount'),
+            average_price=DecimalQuotient(
+                models.Sum('unit_price_sum'), NullIf(models.Sum('records_count'), 0)
+            ),
         )
+        .filter(records_count_sum__gt=0)
+        .order_by('group')
+    )
+
+
+class MaterializedViewRefresh(models.Model):
+    """
+    Last refresh of a materialized view, which PostgreSQL does not keep track of.
+    """
+
+    view_name = models.CharField(_('view name'), max_length=63, unique=True)
+    refreshed_at = models.DateTimeField(_('refreshed at'))
+
+    class Meta:
+        verbose_name = _('materialized view refresh')
+        verbose_name_plural = _('materialized view refreshes')
+
+    def __str__(self) -> str:
+        return f'{self.view_name} {self.refreshed_at.isoformat()}'
+
+
+class SalesRecordUUIDManager(models.Manager):
+    def claim(self, uuids: 'Iterable[uuid.UUID]') -> 'set[uuid.UUID]':
+        """
+        Inserts `uuids`, skipping the existing ones, in a single query.
+
+        A transaction inserting a uuid inserted by another, uncommitted, transaction waits
+        for it to end, so concurrent transactions never both claim the same uuid.
+
+        Args:
+            uuids (`Iterable[uuid.UUID]`):
+                The uuids to claim.
+
+        Returns:
+            set[uuid.UUID]: The claimed uuids, which did not exist yet.
+        """
+
+        uuids = list(uuids)
+        if not uuids:
+            return set()
+
+        db = self._db or router.db_for_write(self.model)
+        connection = connections[db]
+        field = self.model._meta.pk
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        column = connection.ops.quote_name(field.column)
+        placeholders = ', '.join(['(%s)'] * len(uuids))
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} ({column}) VALUES {placeholders} '
+                f'ON CONFLICT DO NOTHING RETURNING {column}',
+                [field.get_db_prep_value(value, connection) for value in uuids],
+            )
+            return {field.to_python(value) for (value,) in cursor.fetchall()}
+
+
+class SalesRecordUUID(models.Model):
+    """
+    Uuid claimed by a sales record, which keeps ingestion idempotent.
+
+    Once partitioned (see migration `0008`), the sales records table only enforces the
+    uniqueness of `uuid` together with `date_of_sale`. Records claim their uuid here when
+    created, by `SalesRecord.save`, ingestion or seeding, so a record re-sent with another date,
+    even by a concurrent batch, is not inserted twice. Uuids of deleted records are kept.
+    """
+
+    uuid = models.UUIDField(primary_key=True, editable=False)
+
+    objects = SalesRecordUUIDManager()
+
+    class Meta:
+        verbose_name = _('sales record uuid')
+        verbose_name_plural = _('sales record uuids')
+
+    def __str__(self) -> str:
+        return str(self.uuid)
+
+
+class SalesRecordMonthlySummaryManager(models.Manager):
+    def get_refreshed_at(self) -> 'Optional[datetime]':
+        """
+        Returns:
+            datetime | None: The start of the last refresh of the view, whose data is as
+                of that time, or `None` if it was never refreshed (or on other databases).
+        """
+
+        if connections[self.db].vendor != 'postgresql':
+            return None
+
+        return (
+            MaterializedViewRefresh.objects.using(self.db)
+            .filter(view_name=self.model._meta.db_table)
+            .values_list('refreshed_at', flat=True)
+            .first()
+        )
+
+    def refresh(self, concurrently: bool = True) -> 'datetime':
+        """
+        Recomputes the materialized view from the `SalesRecord` table.
+
+        Concurrent refreshes let queries read the previous data meanwhile, at the cost of a
+        slower refresh, and require the view to have been populated once.
+
+        Args:
+            concurrently (`bool`):
+                Refresh with `CONCURRENTLY` when the view is populated.
+
+        Returns:
+            datetime: The time the refreshed data is as of.
+        """
+
+        connection = connections[self.db]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+
+        with transaction.atomic(using=self.db), connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT relispopulated FROM pg_class WHERE oid = %s::regclass',
+                [self.model._meta.db_table],
+            )
+            (is_populated,) = cursor.fetchone()
+
+            # taken before the refresh, which sees at least the data committed by then
+            refreshed_at = timezone.now()
+            concurrently_sql = 'CONCURRENTLY ' if concurrently and is_populated else ''
+            cursor.execute(f'REFRESH MATERIALIZED VIEW {concurrently_sql}{table}')
+
+            MaterializedViewRefresh.objects.using(self.db).update_or_create(
+                view_name=self.model._meta.db_table,
+                defaults={'refreshed_at': refreshed_at},
+            )
+
+        return refreshed_at
+
+
+class SalesRecordMonthlySummary(models.Model):
+    """
+    `SalesRecord` totals per UTC month and category (at the time of sale), computed by a
+    PostgreSQL materialized view (see migration `0009`).
+
+    Unlike `SalesRecordDailyRollup`, the view is not kept up to date by the application:
+    its data is as of its last refresh (`refresh_sales_materialized_views` command).
+    """
+
+    SUPPORTED_AGGREGATIONS = (
+        SalesRecord.AggregateByChoices.MONTH,
+        SalesRecord.AggregateByChoices.QUARTER,
+        SalesRecord.AggregateByChoices.YEAR,
+        SalesRecord.AggregateByChoices.CATEGORY,
+    )
+
+    # `month:category_id`, as views have no primary key
+    id = models.CharField(primary_key=True, max_length=32)
+    month = models.DateField(_('month'))
+    category = models.ForeignKey(
+        ProductCategory,
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        verbose_name=_('category'),
+    )
+    total_sales_amount = models.DecimalField(
+        _('total sales amount'), max_digits=19, decimal_places=4
+    )
+    quantity_sold = models.BigIntegerField(_('quantity sold'))
+    records_count = models.BigIntegerField(_('records count'))
+    unit_price_sum = models.DecimalField(_('unit price sum'), max_digits=28, decimal_places=10)
+
+    objects = SalesRecordMonthlySummaryManager()
+
+    class Meta:
+        managed = False
+        db_table = 'sales_salesrecordmonthlysummary'
+        verbose_name = _('sales record monthly summary')
+        verbose_name_plural = _('sales record monthly summaries')
+
+    def __str__(self) -> str:
+        return self.id
+
+    @classmethod
+    def get_data_aggregated_queryset(
+        cls,
+        aggregate_by: 'SalesRecord.AggregateByChoices',
+        queryset: 'Optional[QuerySet[SalesRecordMonthlySummary]]' = None,
+    ):
+        """
+        Materialized view counterpart of `SalesRecord.get_data_aggregated_queryset`.
+
+        Args:
+            aggregate_by (`SalesRecord.AggregateByChoices`):
+                The parameter specifying the aggregation type.
+                Must be one of `SUPPORTED_AGGREGATIONS`.
+            queryset (`Optional[QuerySet[SalesRecordMonthlySummary]]`):
+                A custom queryset to aggregate.
+                If `None`, falls back to all the rows of the view.
+
+        Returns:
+            QuerySet:
+                A queryset with aggregated data including total sales and average price per group.
+        """
+
+        if queryset is None:
+            queryset = cls.objects.all()
+
+        return get_summary_aggregated_queryset(queryset, aggregate_by, date_field='month')
@@ -0,0 +1,196 @@
+"""
+Monthly range partitioning of the `SalesRecord` table on `date_of_sale` (PostgreSQL only).
+
+Each partition holds one UTC calendar month and is named `sales_salesrecord_pYYYY_MM`.
+Rows outside of every month partition land in the `sales_salesrecord_default` partition,
+from which they are moved once their month partition is created.
+"""
+
+import re
+from datetime import date
+from typing import NamedTuple, Optional
+
+PARTITIONED_TABLE = 'sales_salesrecord'
+DEFAULT_PARTITION = f'{PARTITIONED_TABLE}_default'
+PARTITION_KEY = 'date_of_sale'
+
+_PARTITION_NAME_RE = re.compile(rf'^{PARTITIONED_TABLE}_p(?P<year>\d{{4}})_(?P<month>\d{{2}})$')
+
+
+class MonthPartition(NamedTuple):
+    name: str
+    start: date
+    end: date
+
+    @property
+    def bounds_sql(self) -> str:
+        return f'FROM ({_timestamp_sql(self.start)}) TO ({_timestamp_sql(self.end)})'
+
+
+def _timestamp_sql(value: date) -> str:
+    return f"'{value.isoformat()} 00:00:00+00'"
+
+
+def get_month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    month_index = month.year * 12 + month.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def get_month_partition(month: date) -> MonthPartition:
+    start = get_month_start(month)
+    return MonthPartition(
+        name=f'{PARTITIONED_TABLE}_p{start.year:04d}_{start.month:02d}',
+        start=start,
+        end=add_months(start, 1),
+    )
+
+
+def is_partitioned(cursor) -> bool:
+    cursor.execute(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(%s)",
+        [PARTITIONED_TABLE],
+    )
+    row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def get_month_partitions(cursor) -> list[MonthPartition]:
+    """
+    Returns the month partitions attached to the sales records table, oldest first.
+    """
+
+    cursor.execute(
+        'SELECT child.relname FROM pg_inherits '
+        'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+        'WHERE pg_inherits.inhparent = to_regclass(%s)',
+        [PARTITIONED_TABLE],
+    )
+
+    partitions = []
+    for (name,) in cursor.fetchall():
+        match = _PARTITION_NAME_RE.match(name)
+        if match:
+            partitions.append(get_month_partition(date(int(match['year']), int(match['month']), 1)))
+
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+def create_month_partition(cursor, month: date) -> Optional[MonthPartition]:
+    """
+    Creates and attaches the partition of the given month, unless it already exists.
+
+    Rows of that month which landed in the default partition are moved to the new partition
+    before it is attached, as PostgreSQL refuses to attach a range the default partition holds.
+
+    Returns:
+        Optional[MonthPartition]: The created partition, or `None` if it already existed.
+    """
+
+    partition = get_month_partition(month)
+    if partition in get_month_partitions(cursor):
+        return None
+
+    cursor.execute(
+        f'CREATE TABLE {partition.name} '
+        f'(LIKE {PARTITIONED_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    )
+    cursor.execute(
+        f'WITH moved AS ('
+        f'DELETE FROM {DEFAULT_PARTITION} '
+        f'WHERE {PARTITION_KEY} >= {_timestamp_sql(partition.start)} '
+        f'AND {PARTITION_KEY} < {_timestamp_sql(partition.end)} '
+        f'RETURNING *'
+        f') INSERT INTO {partition.name} SELECT * FROM moved'
+    )
+    cursor.execute(
+        f'ALTER TABLE {PARTITIONED_TABLE} ATTACH PARTITION {partition.name} '
+        f'FOR VALUES {partition.bounds_sql}'
+    )
+
+    return partition
+
+
+def detach_month_partition(cursor, partition: MonthPartition, drop: bool = False) -> None:
+    """
+    Detaches a month partition, keeping it as a standalone table unless `drop` is set.
+    """
+
+    cursor.execute(f'ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {partition.name}')
+    if drop:
+        cursor.execute(f'DROP TABLE {partition.name}')
+
+
+def partition_sales_records_table(cursor, today: date, months_ahead: int = 3) -> None:
+    """
+    Converts the plain sales records table into a partitioned table, keeping its rows.
+
+    PostgreSQL requires unique constraints of partitioned tables to include the partition key,
+    so the primary key becomes `(id, date_of_sale)` and the `uuid` unique constraint becomes
+    `(uuid, date_of_sale)`. `id` values are still unique, as they are drawn from one sequence.
+    Identity columns are not supported on partitioned tables (before PostgreSQL 17),
+    so `id` is backed by a sequence owned by the column instead.
+
+    Month partitions are created from the month of the oldest record up to `months_ahead`
+    months after `today`, next to the default partition.
+    """
+
+    table = PARTITIONED_TABLE
+    unpartitioned_table = f'{table}_unpartitioned'
+
+    # non unique indexes and foreign keys are recreated as is, once their names are free again
+    cursor.execute(
+        'SELECT pg_get_indexdef(indexrelid) FROM pg_index '
+        'WHERE indrelid = %s::regclass AND NOT indisunique',
+        [table],
+    )
+    index_definitions = [definition for (definition,) in cursor.fetchall()]
+    cursor.execute(
+        'SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint '
+        "WHERE conrelid = %s::regclass AND contype = 'f'",
+        [table],
+    )
+    foreign_keys = cursor.fetchall()
+
+    cursor.execute(f'ALTER TABLE {table} RENAME TO {unpartitioned_table}')
+    cursor.execute(
+        f'CREATE TABLE {table} '
+        f'(LIKE {unpartitioned_table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE ({PARTITION_KEY})'
+    )
+
+    cursor.execute(f'SELECT MIN({PARTITION_KEY}) FROM {unpartitioned_table}')
+    oldest_date_of_sale = cursor.fetchone()[0]
+    month = get_month_start(oldest_date_of_sale.date() if oldest_date_of_sale else today)
+    last_month = add_months(get_month_start(today), months_ahead)
+    while month <= last_month:
+        partition = get_month_partition(month)
+        cursor.execute(
+            f'CREATE TABLE {partition.name} PARTITION OF {table} '
+            f'FOR VALUES {partition.bounds_sql}'
+        )
+        month = partition.end
+    cursor.execute(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {table} DEFAULT')
+
+    cursor.execute(f'INSERT INTO {table} SELECT * FROM {unpartitioned_table}')
+    cursor.execute(f'DROP TABLE {unpartitioned_table}')
+
+    cursor.execute(f'CREATE SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    cursor.execute(
+        f"SELECT setval('{table}_id_seq', COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+    )
+    cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')")
+
+    cursor.execute(
+        f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, {PARTITION_KEY})'
+    )
+    cursor.execute(
+        f'ALTER TABLE {table} ADD CONSTRAINT {table}_uuid_key UNIQUE (uuid, {PARTITION_KEY})'
+    )
+    for definition in index_definitions:
+        cursor.execute(definition)
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
@@ -0,0 +1,219 @@
+"""
+Generation of sample products and sales records, for development and benchmark databases.
+"""
+
+import io
+import json
+import random
+import uuid
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from itertools import accumulate, islice
+from typing import Iterator, NamedTuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from sales.apps.products.models import Product, ProductCategory
+
+from .models import SalesRecord, SalesRecordDailyRollup, SalesRecordUUID
+
+SALES_RECORD_COPY_COLUMNS = (
+    'uuid',
+    'product_id',
+    'product_snapshot',
+    'category_id',
+    'quantity_sold',
+    'total_sales_amount',
+    'date_of_sale',
+)
+
+
+class SeedProduct(NamedTuple):
+    """
+    The fields of a product copied into its sales records, in a picklable form
+    which can be sent to seeding worker processes.
+    """
+
+    id: int
+    price_cents: int
+    category_id: int
+    snapshot: dict
+
+
+class SalesRecordRow(NamedTuple):
+    uuid: uuid.UUID
+    product: SeedProduct
+    quantity_sold: int
+    date_of_sale: datetime
+
+    @property
+    def total_sales_amount(self) -> Decimal:
+        return Decimal(self.product.price_cents * self.quantity_sold) / 100
+
+
+def create_products(count: int, categories: int, rng: random.Random) -> 'list[SeedProduct]':
+    """
+    Creates `count` products spread over `categories` categories.
+    """
+
+    products = Product.objects.bulk_create(
+        [
+            Product(
+                uuid=uuid.UUID(int=rng.getrandbits(128), version=4),
+                name=f'Product {index + 1}',
+                category=f'category {index % categories + 1}',
+                price=Decimal(rng.randrange(1000, 50000)) / 100,
+            )
+            for index in range(count)
+        ]
+    )
+    category_ids = ProductCategory.objects.get_ids(product.category for product in products)
+
+    return [
+        SeedProduct(
+            id=product.pk,
+            price_cents=int(product.price * 100),
+            category_id=category_ids[product.category],
+            snapshot=SalesRecord.build_product_snapshot(product),
+        )
+        for product in products
+    ]
+
+
+def get_product_cum_weights(count: int, skew: float = 0) -> 'list[float]':
+    """
+    Returns cumulative popularity weights of `count` products, following a Zipf distribution
+    of exponent `skew`: the n-th product sells `n ** skew` times less than the first one.
+    A `skew` of 0 gives every product the same popularity.
+    """
+
+    return list(accumulate(1 / rank**skew for rank in range(1, count + 1)))
+
+
+def generate_sales_record_rows(
+    products: 'list[SeedProduct]',
+    cum_weights: 'list[float]',
+    count: int,
+    start: datetime,
+    end: datetime,
+    rng: random.Random,
+) -> Iterator[SalesRecordRow]:
+    """
+    Generates `count` sales records of `products`, picked as per their `cum_weights`,
+    sold uniformly between `start` and `end`.
+    """
+
+    start_timestamp = start.timestamp()
+    span = end.timestamp() - start_timestamp
+
+    for product in rng.choices(products, cum_weights=cum_weights, k=count):
+        yield SalesRecordRow(
+            uuid=uuid.UUID(int=rng.getrandbits(128), version=4),
+            product=product,
+            quantity_sold=rng.randint(1, 10),
+            date_of_sale=datetime.fromtimestamp(
+                start_timestamp + rng.random() * span, tz=dt_timezone.utc
+            ),
+        )
+
+
+def create_sales_records(rows: Iterator[SalesRecordRow], batch_size: int = 5000) -> None:
+    """
+    Inserts sales records with `bulk_create`, `batch_size` at a time, and claims their uuids.
+    Must be used inside a transaction.
+    """
+
+    while batch := list(islice(rows, batch_size)):
+        # uuids of records deleted before seeding again with the same seed are already claimed
+        SalesRecordUUID.objects.bulk_create(
+            [SalesRecordUUID(uuid=row.uuid) for row in batch], ignore_conflicts=True
+        )
+        SalesRecord.objects.bulk_create(
+            SalesRecord(
+                uuid=row.uuid,
+                product_id=row.product.id,
+                product_snapshot=row.product.snapshot,
+                category_id=row.product.category_id,
+                quantity_sold=row.quantity_sold,
+                total_sales_amount=row.total_sales_amount,
+                date_of_sale=row.date_of_sale,
+            )
+            for row in batch
+        )
+
+
+def copy_sales_records(cursor, rows: Iterator[SalesRecordRow]) -> None:
+    """
+    Loads sales records with a single `COPY` (PostgreSQL only), much faster than `INSERT`s,
+    and claims their uuids with a single `INSERT`. Must be used inside a transaction.
+    """
+
+    snapshots = {}
+    uuids = []
+    buffer = io.StringIO()
+    for row in rows:
+        uuids.append(str(row.uuid))
+        if row.product.id not in snapshots:
+            snapshot = json.dumps(row.product.snapshot).replace('"', '""')
+            snapshots[row.product.id] = f'"{snapshot}"'
+
+        buffer.write(
+            f'{row.uuid},{row.product.id},{snapshots[row.product.id]},{row.product.category_id},'
+            f'{row.quantity_sold},{row.total_sales_amount},{row.date_of_sale.isoformat()}\n'
+        )
+
+    buffer.seek(0)
+    cursor.copy_expert(
+        f'COPY {SalesRecord._meta.db_table} ({", ".join(SALES_RECORD_COPY_COLUMNS)}) '
+        'FROM STDIN WITH (FORMAT csv)',
+        buffer,
+    )
+    # uuids of records deleted before seeding again with the same seed are already claimed
+    cursor.execute(
+        f'INSERT INTO {SalesRecordUUID._meta.db_table} (uuid) SELECT unnest(%s::uuid[]) '
+        'ON CONFLICT DO NOTHING',
+        [uuids],
+    )
+
+
+def seed_sales_data(
+    products: int,
+    records: int,
+    categories: int = 10,
+    days: int = 365,
+    skew: float = 0,
+    seed: int = 0,
+    batch_size: int = 5000,
+) -> 'list[SeedProduct]':
+    """
+    Creates `products` products spread over `categories` categories, and `records` sales records
+    of those products, sold over the last `days` days, then rebuilds the daily rollup.
+
+    The same `seed` always creates the same data (relative to the current time),
+    so datasets created for benchmarks are comparable between runs.
+
+    Returns:
+        list[SeedProduct]: The created products.
+    """
+
+    rng = random.Random(seed)
+    end = timezone.now()
+
+    with transaction.atomic():
+        created_products = create_products(products, categories=categories, rng=rng)
+        create_sales_records(
+            generate_sales_record_rows(
+                created_products,
+                cum_weights=get_product_cum_weights(products, skew=skew),
+                count=records,
+                start=end - timedelta(days=days),
+                end=end,
+                rng=rng,
+            ),
+            batch_size=batch_size,
+        )
+        SalesRecordDailyRollup.objects.rebuild(batch_size=batch_size)
+
+    return created_products
@@ -1,15 +1,51 @@
-from django.core.cache import cache
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import SalesRecord
+from sales.utils.cache import bump_cache_generation
+
+from .cache import SALESRECORD_API_CACHE_PREFIXES
+from .models import SalesRecord, SalesRecordDailyRollup
 
 
 @receiver(post_save, sender=SalesRecord)
 @receiver(post_delete, sender=SalesRecord)
 def invalidate_salesrecord_api_cache(sender, instance, **kwargs):
     try:
-        cache.delete_pattern('*api_salesrecord_list*')
-        cache.delete_pattern('*api_salesdataaggregate_list*')
+        bump_cache_generation(*SALESRECORD_API_CACHE_PREFIXES)
     except Exception as e:
         print(f'Failed to invalidate SalesRecord API cache: {e}')
+
+
+@receiver(pre_save, sender=SalesRecord)
+def capture_salesrecord_rollup_delta(sender, instance, raw=False, **kwargs):
+    """
+    Stores the rollup contribution of the persisted state of an updated record,
+    so it can be subtracted from the rollup once the new state is saved.
+    """
+
+    instance._previous_rollup_delta = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+
+    previous = SalesRecord.objects.filter(pk=instance.pk).first()
+    if previous is not None:
+        instance._previous_rollup_delta = previous.get_rollup_delta(sign=-1)
+
+
+@receiver(post_save, sender=SalesRecord)
+def update_salesrecord_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    SalesRecordDailyRollup.objects.apply_deltas(
+        [
+            getattr(instance, '_previous_rollup_delta', None),
+            instance.get_rollup_delta(),
+        ]
+    )
+    instance._previous_rollup_delta = None
+
+
+@receiver(post_delete, sender=SalesRecord)
+def update_salesrecord_rollup_on_delete(sender, instance, **kwargs):
+    SalesRecordDailyRollup.objects.apply_deltas([instance.get_rollup_delta(sign=-1)])
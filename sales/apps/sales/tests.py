@@ -1,11 +1,37 @@
+import random
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
 from django.utils import timezone
+from rest_framework.test import APIClient
 
 from sales.apps.products.models import Product
 
 from .interfaces import ProductSnapshot
-from .models import SalesRecord
+from .models import (
+    SalesRecord,
+    SalesRecordDailyRollup,
+    SalesRecordMonthlySummary,
+    SalesRecordUUID,
+)
+from .partitions import (
+    DEFAULT_PARTITION,
+    create_month_partition,
+    get_month_partition,
+    get_month_partitions,
+    is_partitioned,
+)
+from .seeding import seed_sales_data
 
 
 class SalesRecordModelTest(TestCase):
@@ -53,6 +79,29 @@ class SalesRecordModelTest(TestCase):
         with self.assertRaises(ValidationError):
             sales_record.full_clean()
 
+    def test_create_claims_uuid(self):
+        sales_record = SalesRecord.objects.create(product=self.product, total_sales_amount=99.99)
+        # updates do not claim it again
+        sales_record.save()
+
+        self.assertEqual(
+            list(SalesRecordUUID.objects.values_list('uuid', flat=True)), [sales_record.uuid]
+        )
+
+    def test_create_with_claimed_uuid(self):
+        sales_record = SalesRecord.objects.create(product=self.product, total_sales_amount=99.99)
+        sales_record.delete()
+
+        # the date of sale differs, which the partitioned table alone would accept
+        with self.assertRaises(IntegrityError):
+            SalesRecord.objects.create(
+                uuid=sales_record.uuid,
+                product=self.product,
+                total_sales_amount=99.99,
+                date_of_sale=sales_record.date_of_sale - timedelta(days=1),
+            )
+        self.assertFalse(SalesRecord.objects.exists())
+
     def test_product_snapshot_stored(self):
         sales_record = SalesRecord.objects.create(
             product=self.product,
@@ -107,3 +156,392 @@ class SalesRecordModelTest(TestCase):
         self.assertEqual(aggregated_data[0]['group'], 'Electronics')
         self.assertEqual(aggregated_data[0]['total_sales'], 1000.00)
         self.assertEqual(aggregated_data[0]['average_price'], 50.00)
+
+    def test_category_stored_at_time_of_sale(self):
+        sales_record = SalesRecord.objects.create(
+            product=self.product,
+            quantity_sold=5,
+            total_sales_amount=500.00,
+        )
+        self.product.category = 'Gadgets'
+        self.product.save()
+        self.product.delete()
+
+        sales_record.refresh_from_db()
+        self.assertEqual(sales_record.category.name, 'Electronics')
+
+        aggregated_data = SalesRecord.get_data_aggregated_queryset(
+            aggregate_by=SalesRecord.AggregateByChoices.CATEGORY
+        )
+        self.assertEqual([group['group'] for group in aggregated_data], ['Electronics'])
+
+    def test_aggregate_by_category_without_category(self):
+        SalesRecord.objects.create(quantity_sold=5, total_sales_amount=500.00)
+
+        aggregated_data = SalesRecord.get_data_aggregated_queryset(
+            aggregate_by=SalesRecord.AggregateByChoices.CATEGORY
+        )
+        self.assertEqual(aggregated_data[0]['group'], 'Unknown')
+
+
+class SalesRecordDailyRollupTest(TestCase):
+    def setUp(self):
+        self.product = Product.objects.create(
+            name='Test Product',
+            category='Electronics',
+            price=99.99,
+        )
+        self.other_product = Product.objects.create(
+            name='Other Product',
+            category='Books',
+            price=10.50,
+        )
+        self.date_of_sale = datetime(2024, 9, 1, 23, 30, tzinfo=dt_timezone.utc)
+
+    def _create_sales_record(self, product, quantity_sold, date_of_sale=None):
+        return SalesRecord.objects.create(
+            product=product,
+            quantity_sold=quantity_sold,
+            total_sales_amount=product.price * quantity_sold if product else 10,
+            date_of_sale=date_of_sale or self.date_of_sale,
+        )
+
+    def _assert_rollup_matches_raw(self, **filters):
+        for aggregate_by in SalesRecordDailyRollup.SUPPORTED_AGGREGATIONS:
+            raw_queryset = SalesRecord.objects.all()
+            rollup_queryset = SalesRecordDailyRollup.objects.all()
+            if 'start_date' in filters:
+                raw_queryset = raw_queryset.filter(date_of_sale__date__gte=filters['start_date'])
+                rollup_queryset = rollup_queryset.filter(day__gte=filters['start_date'])
+
+            raw = SalesRecord.get_data_aggregated_queryset(
+                aggregate_by=aggregate_by,
+                queryset=raw_queryset,
+            )
+            rollup = SalesRecordDailyRollup.get_data_aggregated_queryset(
+                aggregate_by=aggregate_by,
+                queryset=rollup_queryset,
+            )
+
+            self.assertEqual(len(raw), len(rollup))
+            for raw_group, rollup_group in zip(raw, rollup):
+                raw_group_value = raw_group['group']
+                if isinstance(raw_group_value, datetime):
+                    raw_group_value = raw_group_value.date()
+                self.assertEqual(raw_group_value, rollup_group['group'])
+                # at the precision of the API, SQLite sums decimals as floats
+                self.assertEqual(
+                    raw_group['total_sales'].quantize(Decimal('0.01')),
+                    rollup_group['total_sales'].quantize(Decimal('0.01')),
+                )
+                self.assertEqual(
+                    raw_group['average_price'].quantize(Decimal('0.01')),
+                    rollup_group['average_price'].quantize(Decimal('0.01')),
+                )
+
+    def test_rollup_created_on_save(self):
+        self._create_sales_record(self.product, quantity_sold=5)
+        self._create_sales_record(self.product, quantity_sold=3)
+
+        rollup = SalesRecordDailyRollup.objects.get()
+        self.assertEqual(rollup.day, self.date_of_sale.date())
+        self.assertEqual(rollup.category.name, 'Electronics')
+        self.assertEqual(rollup.product, self.product)
+        self.assertEqual(rollup.quantity_sold, 8)
+        self.assertEqual(rollup.records_count, 2)
+        self.assertEqual(rollup.total_sales_amount, Decimal('799.92'))
+
+    def test_rollup_updated_on_change(self):
+        sales_record = self._create_sales_record(self.product, quantity_sold=5)
+
+        sales_record.product = self.other_product
+        sales_record.date_of_sale = self.date_of_sale + timedelta(days=1)
+        sales_record.save()
+
+        rollup = SalesRecordDailyRollup.objects.get(records_count__gt=0)
+        self.assertEqual(rollup.product, self.other_product)
+        # the record keeps the category it was sold with
+        self.assertEqual(rollup.category.name, 'Electronics')
+        self.assertEqual(rollup.day, (self.date_of_sale + timedelta(days=1)).date())
+        self.assertFalse(
+            SalesRecordDailyRollup.objects.filter(
+                product=self.product, records_count__gt=0
+            ).exists()
+        )
+
+    def test_rollup_updated_on_delete(self):
+        sales_record = self._create_sales_record(self.product, quantity_sold=5)
+        self._create_sales_record(self.product, quantity_sold=3)
+
+        sales_record.delete()
+
+        rollup = SalesRecordDailyRollup.objects.get()
+        self.assertEqual(rollup.quantity_sold, 3)
+        self.assertEqual(rollup.records_count, 1)
+
+    def test_rollup_ignores_zero_quantity(self):
+        self._create_sales_record(self.product, quantity_sold=0)
+        self.assertFalse(SalesRecordDailyRollup.objects.exists())
+
+    def test_rollup_keeps_category_at_time_of_sale(self):
+        self._create_sales_record(self.product, quantity_sold=5)
+
+        self.product.category = 'Gadgets'
+        self.product.save()
+        self._create_sales_record(self.product, quantity_sold=3)
+
+        aggregated_data = SalesRecordDailyRollup.get_data_aggregated_queryset(
+            aggregate_by=SalesRecord.AggregateByChoices.CATEGORY
+        )
+        self.assertEqual(
+            [(group['group'], group['records_count_sum']) for group in aggregated_data],
+            [('Electronics', 1), ('Gadgets', 1)],
+        )
+        self._assert_rollup_matches_raw()
+
+    def test_rollup_matches_raw_aggregation(self):
+        products = [self.product, self.other_product, None]
+        sales_records = [
+            self._create_sales_record(
+                random.choice(products),
+                quantity_sold=random.randint(0, 10),
+                date_of_sale=self.date_of_sale - timedelta(hours=random.randint(0, 24 * 90)),
+            )
+            for _ in range(60)
+        ]
+        for sales_record in sales_records[:10]:
+            sales_record.delete()
+        for sales_record in sales_records[10:20]:
+            sales_record.quantity_sold += 1
+            sales_record.save()
+        self.other_product.delete()
+
+        self._assert_rollup_matches_raw()
+        self._assert_rollup_matches_raw(start_date=(self.date_of_sale - timedelta(days=30)).date())
+
+    def test_rebuild_matches_incremental_rollup(self):
+        for _ in range(20):
+            self._create_sales_record(
+                random.choice([self.product, self.other_product]),
+                quantity_sold=random.randint(1, 10),
+                date_of_sale=self.date_of_sale - timedelta(days=random.randint(0, 60)),
+            )
+        fields = ('day', 'category', 'product', 'quantity_sold', 'records_count')
+        incremental = sorted(SalesRecordDailyRollup.objects.values_list(*fields))
+
+        call_command('rebuild_sales_rollup', stdout=StringIO())
+
+        self.assertEqual(sorted(SalesRecordDailyRollup.objects.values_list(*fields)), incremental)
+        self._assert_rollup_matches_raw()
+
+
+class SeedSalesDataTest(TestCase):
+    def test_seeded_data(self):
+        products = seed_sales_data(products=20, records=300, categories=4, seed=1, batch_size=100)
+
+        self.assertEqual(len(products), 20)
+        self.assertEqual(len({product.category_id for product in products}), 4)
+        self.assertEqual(SalesRecord.objects.count(), 300)
+        self.assertEqual(SalesRecordUUID.objects.count(), 300)
+        self.assertFalse(SalesRecord.objects.filter(category__isnull=True).exists())
+        self.assertEqual(
+            sum(SalesRecordDailyRollup.objects.values_list('records_count', flat=True)), 300
+        )
+
+    def test_same_seed_creates_same_data(self):
+        seed_sales_data(products=5, records=50, seed=1)
+        uuids = set(SalesRecord.objects.values_list('uuid', flat=True))
+        SalesRecord.objects.all().delete()
+        Product.objects.all().delete()
+
+        seed_sales_data(products=5, records=50, seed=1)
+
+        self.assertEqual(set(SalesRecord.objects.values_list('uuid', flat=True)), uuids)
+
+
+class SeedSalesDataCommandTest(TransactionTestCase):
+    # worker processes only see committed products
+
+    def test_seed_sales_data(self):
+        call_command(
+            'seed_sales_data',
+            products=5,
+            records=500,
+            start_date='2024-01-01',
+            end_date='2024-03-31',
+            skew=1,
+            workers=2,
+            chunk_size=100,
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(Product.objects.count(), 5)
+        self.assertEqual(
+            SalesRecord.objects.filter(
+                date_of_sale__gte=datetime(2024, 1, 1, tzinfo=dt_timezone.utc),
+                date_of_sale__lt=datetime(2024, 4, 1, tzinfo=dt_timezone.utc),
+            ).count(),
+            500,
+        )
+        self.assertEqual(SalesRecordUUID.objects.count(), 500)
+        self.assertEqual(
+            sum(SalesRecordDailyRollup.objects.values_list('records_count', flat=True)), 500
+        )
+
+        call_command('seed_sales_data', records=500, if_empty=True, stdout=StringIO())
+        self.assertEqual(SalesRecord.objects.count(), 500)
+
+    def test_invalid_date_span(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                'seed_sales_data', start_date='2024-02-01', end_date='2024-01-01', stdout=StringIO()
+            )
+
+
+class WarmAPICacheCommandTest(TransactionTestCase):
+    # responses are computed by threads, with their own database connections
+
+    def setUp(self):
+        cache.clear()
+        seed_sales_data(products=5, records=100, days=30)
+
+    def test_warm_api_cache(self):
+        stdout = StringIO()
+        call_command('warm_api_cache', days='30', list_pages=2, host='testserver', stdout=stdout)
+
+        output = stdout.getvalue()
+        for name in ('aggregate_month_last_30_days', 'aggregate_category_last_30_days'):
+            self.assertIn(name, output)
+        self.assertIn('Warmed up 4 responses', output)
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='testuser'))
+        start_date = (timezone.localdate() - timedelta(days=30)).isoformat()
+        with self.assertNumQueries(0):
+            response = client.get(
+                reverse('sales-data-aggregate'),
+                {'start_date': start_date, 'aggregate_by': 'category'},
+            )
+            client.get(reverse('sales-data-list'), {'page': 2})
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_aggregation_group(self):
+        with self.assertRaises(CommandError):
+            call_command('warm_api_cache', aggregate_by='month,decade', stdout=StringIO())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Materialized views require PostgreSQL')
+class SalesRecordMonthlySummaryTest(TestCase):
+    def setUp(self):
+        self.product = Product.objects.create(name='Test Product', category='Books', price=10)
+        for day, quantity_sold in ((1, 1), (30, 3), (30, 0)):
+            SalesRecord.objects.create(
+                product=self.product,
+                quantity_sold=quantity_sold,
+                total_sales_amount=10 * quantity_sold,
+                date_of_sale=datetime(2024, 9, day, 23, 30, tzinfo=dt_timezone.utc),
+            )
+
+    def test_refresh_command(self):
+        self.assertIsNone(SalesRecordMonthlySummary.objects.get_refreshed_at())
+
+        call_command('refresh_sales_materialized_views', stdout=StringIO())
+        refreshed_at = SalesRecordMonthlySummary.objects.get_refreshed_at()
+        self.assertIsNotNone(refreshed_at)
+
+        summary = SalesRecordMonthlySummary.objects.get()
+        self.assertEqual(summary.month, date(2024, 9, 1))
+        self.assertEqual(summary.category.name, 'Books')
+        self.assertEqual(summary.total_sales_amount, 40)
+        self.assertEqual(summary.records_count, 2)
+
+        # concurrently, now that the view is populated
+        SalesRecord.objects.create(
+            product=self.product,
+            quantity_sold=1,
+            total_sales_amount=10,
+            date_of_sale=datetime(2024, 10, 1, tzinfo=dt_timezone.utc),
+        )
+        call_command('refresh_sales_materialized_views', stdout=StringIO())
+
+        self.assertEqual(SalesRecordMonthlySummary.objects.count(), 2)
+        self.assertGreater(SalesRecordMonthlySummary.objects.get_refreshed_at(), refreshed_at)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Table partitioning requires PostgreSQL')
+class SalesRecordPartitionTest(TestCase):
+    def setUp(self):
+        self.product = Product.objects.create(
+            name='Test Product',
+            category='Electronics',
+            price=10,
+        )
+
+    def _create_sales_record(self, date_of_sale):
+        return SalesRecord.objects.create(
+            product=self.product,
+            quantity_sold=1,
+            total_sales_amount=10,
+            date_of_sale=date_of_sale,
+        )
+
+    def _count_rows(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {table}')
+            return cursor.fetchone()[0]
+
+    def _get_partition_names(self):
+        with connection.cursor() as cursor:
+            return [partition.name for partition in get_month_partitions(cursor)]
+
+    def test_table_is_partitioned(self):
+        with connection.cursor() as cursor:
+            self.assertTrue(is_partitioned(cursor))
+
+        current_month = get_month_partition(timezone.now().date())
+        self.assertIn(current_month.name, self._get_partition_names())
+
+    def test_command_creates_partitions_and_moves_default_rows(self):
+        sales_record = self._create_sales_record(datetime(2024, 9, 15, tzinfo=dt_timezone.utc))
+        self.assertEqual(self._count_rows(DEFAULT_PARTITION), 1)
+
+        call_command(
+            'manage_sales_partitions',
+            start='2024-09',
+            months_ahead=1,
+            stdout=StringIO(),
+        )
+
+        self.assertIn('sales_salesrecord_p2024_09', self._get_partition_names())
+        self.assertIn('sales_salesrecord_p2025_01', self._get_partition_names())
+        self.assertEqual(self._count_rows(DEFAULT_PARTITION), 0)
+        self.assertEqual(self._count_rows('sales_salesrecord_p2024_09'), 1)
+        self.assertEqual(SalesRecord.objects.get(), sales_record)
+
+    def test_date_filter_prunes_partitions(self):
+        with connection.cursor() as cursor:
+            create_month_partition(cursor, date(2024, 9, 1))
+            create_month_partition(cursor, date(2024, 10, 1))
+        self._create_sales_record(datetime(2024, 9, 15, tzinfo=dt_timezone.utc))
+        self._create_sales_record(datetime(2024, 10, 15, tzinfo=dt_timezone.utc))
+
+        plan = SalesRecord.objects.filter(
+            date_of_sale__gte=datetime(2024, 9, 1, tzinfo=dt_timezone.utc),
+            date_of_sale__lt=datetime(2024, 10, 1, tzinfo=dt_timezone.utc),
+        ).explain()
+
+        self.assertIn('sales_salesrecord_p2024_09', plan)
+        self.assertNotIn('sales_salesrecord_p2024_10', plan)
+        self.assertNotIn(DEFAULT_PARTITION, plan)
+
+    def test_command_detaches_old_partitions(self):
+        with connection.cursor() as cursor:
+            create_month_partition(cursor, date(2024, 9, 1))
+        self._create_sales_record(datetime(2024, 9, 15, tzinfo=dt_timezone.utc))
+        recent_sales_record = self._create_sales_record(timezone.now())
+
+        call_command('manage_sales_partitions', detach_older_than=12, drop=True, stdout=StringIO())
+
+        self.assertNotIn('sales_salesrecord_p2024_09', self._get_partition_names())
+        self.assertEqual(list(SalesRecord.objects.all()), [recent_sales_record])
+        self.assertEqual(SalesRecordDailyRollup.objects.get().records_count, 1)
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 import os
 import sys
+from decimal import Decimal
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -32,9 +33,17 @@ SECRET_KEY = 'django-insecure-sqqbemokta8d-f@*m&$#e+-=wphxzqio+3-hk7%skk%0xh+(bd
 DEBUG = os.getenv('DEBUG', '0') == '1'
 TESTING = 'test' in sys.argv
 
+# SQLite and a local-memory cache instead of PostgreSQL and Redis, to run the project
+# (e.g. `benchmark_api`) where those services are unavailable. PostgreSQL specific features,
+# like partitioning and approximate aggregations, are disabled.
+LOCAL_BACKENDS = os.getenv('LOCAL_BACKENDS', '0') == '1'
+
 ALLOWED_HOSTS = os.getenv('DJANGO_ALLOWED_HOSTS', '').split(',')
 INTERNAL_IPS = ['127.0.0.1', '172.18.0.1']
 
+# Bearer token required to scrape `/metrics`. When unset, only `INTERNAL_IPS` may scrape it.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
 ENABLE_DEBUG_TOOLBAR = DEBUG and not TESTING
 
 INSTALLED_APPS = [
@@ -53,6 +62,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'sales.utils.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -97,6 +107,43 @@ DATABASES = {
     }
 }
 
+# Read replicas of `default`, as comma separated hosts sharing its credentials.
+# Replicas are mirrors of `default` in tests.
+for index, host in enumerate(filter(None, os.getenv('POSTGRES_REPLICA_HOSTS', '').split(',')), 1):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+if LOCAL_BACKENDS:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        },
+        # stands in for a replica with `DATABASE_REPLICAS=replica`, after
+        # `migrate --database replica` (its data is not replicated from `default`)
+        'replica': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.replica.sqlite3',
+        },
+    }
+
+# Aliases of the databases reads of `ReplicaReadViewMixin` views are balanced between,
+# the `POSTGRES_REPLICA_HOSTS` ones by default.
+DATABASE_REPLICAS = [
+    alias
+    for alias in os.getenv(
+        'DATABASE_REPLICAS', ','.join(alias for alias in DATABASES if alias.startswith('replica_'))
+    ).split(',')
+    if alias
+]
+# Seconds during which users who wrote read from the primary database, longer than the
+# replication lag
+DATABASE_REPLICA_PIN_TIMEOUT = int(os.getenv('DATABASE_REPLICA_PIN_TIMEOUT', '5'))
+DATABASE_ROUTERS = ['sales.utils.routers.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -158,6 +205,11 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'sales.utils.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'sales.utils.renderers.MessagePackRenderer',
+    ],
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.UserRateThrottle',
@@ -167,6 +219,7 @@ REST_FRAMEWORK = {
         'token_obtain': '10/minute',
         'token_refresh': '20/minute',
         'user': '2000/hour',
+        'sales_export': '60/hour',
     },
 }
 
@@ -200,3 +253,31 @@ CACHES = {
         'TIMEOUT': 60 * 60,
     }
 }
+
+if LOCAL_BACKENDS:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'TIMEOUT': 60 * 60,
+        }
+    }
+
+# Answer month and category aggregations from `SalesRecordDailyRollup` rows when possible,
+# instead of scanning the raw `SalesRecord` table.
+SALES_AGGREGATE_USE_ROLLUP = os.getenv('SALES_AGGREGATE_USE_ROLLUP', '1') == '1'
+
+# Answer month, quarter, year and category aggregations over whole UTC months from the
+# `SalesRecordMonthlySummary` materialized view (PostgreSQL only), before the rollup. Its data
+# is as of its last refresh (`refresh_sales_materialized_views`), reported in responses.
+SALES_AGGREGATE_USE_MATERIALIZED_VIEW = (
+    os.getenv('SALES_AGGREGATE_USE_MATERIALIZED_VIEW', '0') == '1'
+)
+
+# Seconds during which outdated aggregate responses keep being served from the cache
+# (stale-while-revalidate), while a fresh response is computed in the background. 0 disables it.
+SALES_AGGREGATE_CACHE_STALE_TIMEOUT = int(os.getenv('SALES_AGGREGATE_CACHE_STALE_TIMEOUT', '0'))
+
+# Default sampled percentage of the sales records table and `TABLESAMPLE` method
+# (`SYSTEM` or `BERNOULLI`) of approximate aggregations (`approximate=true`, PostgreSQL only).
+SALES_AGGREGATE_SAMPLE_PERCENT = Decimal(os.getenv('SALES_AGGREGATE_SAMPLE_PERCENT', '1'))
+SALES_AGGREGATE_SAMPLE_METHOD = os.getenv('SALES_AGGREGATE_SAMPLE_METHOD', 'SYSTEM')
@@ -0,0 +1,306 @@
+import asyncio
+import threading
+import time
+from contextvars import ContextVar
+from datetime import date
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from sales.utils.cache import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_STALE,
+    AsyncCache,
+    CacheEntry,
+    _background_tasks,
+    aget_cache_generation,
+    aget_or_set_single_flight,
+    async_cache,
+    bump_cache_generation,
+    delete_if_equal,
+    get_cache_generation,
+    get_canonical_query,
+    get_or_set_single_flight,
+    refreshing_cache,
+    run_in_background,
+)
+
+
+class CacheGenerationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_generation_is_stable_until_bumped(self):
+        generation = get_cache_generation('test_namespace')
+        self.assertEqual(get_cache_generation('test_namespace'), generation)
+
+        bump_cache_generation('test_namespace')
+        self.assertEqual(get_cache_generation('test_namespace'), generation + 1)
+
+    def test_bump_only_affects_given_namespaces(self):
+        generation = get_cache_generation('test_namespace')
+        other_generation = get_cache_generation('other_namespace')
+
+        bump_cache_generation('other_namespace')
+
+        self.assertEqual(get_cache_generation('test_namespace'), generation)
+        self.assertEqual(get_cache_generation('other_namespace'), other_generation + 1)
+
+    def test_bump_missing_generation_does_not_reuse_previous_values(self):
+        generation = get_cache_generation('test_namespace')
+        cache.delete('cache_generation:test_namespace')
+
+        bump_cache_generation('test_namespace')
+
+        self.assertGreaterEqual(get_cache_generation('test_namespace'), generation)
+
+
+class AsyncCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    async def test_entries_are_shared_with_the_sync_cache(self):
+        cache.set('sync_key', {'value': 1})
+        self.assertEqual(await async_cache.get('sync_key'), {'value': 1})
+
+        await async_cache.set('async_key', [1, 2], timeout=60)
+        self.assertEqual(cache.get('async_key'), [1, 2])
+        self.assertFalse(await async_cache.add('async_key', [3], timeout=60))
+        self.assertIsNone(await async_cache.get('missing_key'))
+
+    async def test_generation_matches_the_sync_generation(self):
+        generation = await aget_cache_generation('test_namespace')
+        self.assertEqual(get_cache_generation('test_namespace'), generation)
+
+        bump_cache_generation('test_namespace')
+        self.assertEqual(await aget_cache_generation('test_namespace'), generation + 1)
+
+    @override_settings(
+        CACHES={
+            'default': {
+                'BACKEND': 'django_redis.cache.RedisCache',
+                'LOCATION': 'redis://primary:6380/2,redis://replica:6380/2',
+                'OPTIONS': {
+                    'PASSWORD': 'secret',
+                    'SOCKET_TIMEOUT': 5,
+                    'CONNECTION_POOL_KWARGS': {'max_connections': 10},
+                },
+            }
+        }
+    )
+    def test_client_uses_the_cache_settings(self):
+        connection_pool = AsyncCache().build_client().connection_pool
+
+        self.assertEqual(connection_pool.max_connections, 10)
+        self.assertEqual(
+            {
+                name: connection_pool.connection_kwargs[name]
+                for name in ('host', 'port', 'db', 'password', 'socket_timeout')
+            },
+            {'host': 'primary', 'port': 6380, 'db': 2, 'password': 'secret', 'socket_timeout': 5},
+        )
+
+
+class CanonicalQueryTests(SimpleTestCase):
+    def test_parameters_are_sorted_and_cleaned(self):
+        cleaned_data = {'start_date': date(2024, 1, 1), 'category': '', 'approximate': None}
+
+        self.assertEqual(
+            get_canonical_query(
+                QueryDict('start_date=2024-1-1&page=2&category=&format=json'), cleaned_data
+            ),
+            get_canonical_query(
+                QueryDict('format=json&page=2&start_date=2024-01-01'), cleaned_data
+            ),
+        )
+        self.assertEqual(
+            get_canonical_query(QueryDict('page=2&start_date=2024-1-1'), cleaned_data),
+            'page=2&start_date=2024-01-01',
+        )
+
+    def test_repeated_parameters_keep_their_order(self):
+        self.assertEqual(get_canonical_query(QueryDict('b=2&a=3&b=1')), 'a=3&b=2&b=1')
+
+
+class RunInBackgroundTests(SimpleTestCase):
+    def test_runs_in_the_current_context(self):
+        time_zones = []
+        done = threading.Event()
+
+        def func():
+            time_zones.append(timezone.get_current_timezone_name())
+            done.set()
+
+        with timezone.override('Europe/Paris'):
+            run_in_background(func)
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(time_zones, ['Europe/Paris'])
+
+    def test_runs_with_the_context_variables_of_the_caller(self):
+        variable = ContextVar('variable', default=None)
+        values = []
+        done = threading.Event()
+
+        def func():
+            values.append(variable.get())
+            done.set()
+
+        token = variable.set('replica')
+        self.addCleanup(variable.reset, token)
+        run_in_background(func)
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(values, ['replica'])
+
+
+class DeleteIfEqualTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_deletes_only_equal_values(self):
+        cache.set('key', 'token')
+
+        self.assertFalse(delete_if_equal('key', 'other token'))
+        self.assertEqual(cache.get('key'), 'token')
+        self.assertTrue(delete_if_equal('key', 'token'))
+        self.assertIsNone(cache.get('key'))
+        self.assertFalse(delete_if_equal('key', 'token'))
+
+    async def test_async_deletes_only_equal_values(self):
+        await async_cache.set('key', 'token')
+
+        self.assertFalse(await async_cache.delete_if_equal('key', 'other token'))
+        self.assertEqual(await async_cache.get('key'), 'token')
+        self.assertTrue(await async_cache.delete_if_equal('key', 'token'))
+        self.assertIsNone(await async_cache.get('key'))
+
+
+class SingleFlightTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _get(self, compute, generation=1, **kwargs):
+        return get_or_set_single_flight('key', compute, generation=generation, timeout=60, **kwargs)
+
+    def test_computes_missing_entries_once(self):
+        self.assertEqual(self._get(lambda: [1]), ([1], CACHE_MISS))
+        self.assertEqual(self._get(lambda: [2]), ([1], CACHE_HIT))
+        self.assertIsNone(cache.get('key.lock'))
+
+    def test_outdated_entries_are_recomputed(self):
+        self._get(lambda: [1])
+
+        self.assertEqual(self._get(lambda: [2], generation=2), ([2], CACHE_MISS))
+        self.assertEqual(self._get(lambda: [3], generation=2), ([2], CACHE_HIT))
+
+    def test_locked_outdated_entries_are_not_served(self):
+        self._get(lambda: [1])
+        cache.set('key.lock', 1)
+
+        self.assertEqual(self._get(lambda: [2], generation=2, wait_timeout=0.1), ([2], CACHE_MISS))
+
+    def test_locked_entries_are_served_stale_within_the_window(self):
+        self._get(lambda: [1], stale_timeout=60)
+        cache.set('key.lock', 1)
+
+        self.assertEqual(self._get(lambda: [2], generation=2, stale_timeout=60), ([1], CACHE_STALE))
+
+    def test_waiting_callers_get_the_new_entry(self):
+        self._get(lambda: [1])
+        cache.set('key.lock', 1)
+
+        def set_new_entry():
+            time.sleep(0.1)
+            cache.set('key', CacheEntry([2], generation=2, created_at=time.time()))
+
+        thread = threading.Thread(target=set_new_entry)
+        thread.start()
+        self.addCleanup(thread.join)
+
+        self.assertEqual(self._get(lambda: [3], generation=2), ([2], CACHE_HIT))
+
+    def test_locked_entries_are_computed_after_waiting(self):
+        cache.set('key.lock', 1)
+
+        self.assertEqual(self._get(lambda: [1], wait_timeout=0.1), ([1], CACHE_MISS))
+        # the lock of the other caller is kept
+        self.assertEqual(cache.get('key.lock'), 1)
+
+    def test_refreshing_cache_recomputes_fresh_entries(self):
+        self._get(lambda: [1])
+
+        with refreshing_cache():
+            self.assertEqual(self._get(lambda: [2]), ([2], CACHE_MISS))
+        self.assertEqual(self._get(lambda: [3]), ([2], CACHE_HIT))
+
+    def test_lock_of_another_caller_is_kept(self):
+        def compute():
+            # the lock expired meanwhile, and another caller acquired it
+            cache.set('key.lock', 'other token')
+            return [1]
+
+        self.assertEqual(self._get(compute), ([1], CACHE_MISS))
+        self.assertEqual(cache.get('key.lock'), 'other token')
+
+    def test_lock_is_released_when_computing_fails(self):
+        def compute():
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            self._get(compute)
+
+        self.assertIsNone(cache.get('key.lock'))
+
+    @patch('sales.utils.cache.run_in_background')
+    def test_stale_while_revalidate(self, mock_run_in_background):
+        self._get(lambda: [1], stale_timeout=60)
+
+        self.assertEqual(self._get(lambda: [2], generation=2, stale_timeout=60), ([1], CACHE_STALE))
+        # a single refresh at a time
+        self.assertEqual(self._get(lambda: [2], generation=2, stale_timeout=60), ([1], CACHE_STALE))
+        mock_run_in_background.assert_called_once()
+
+        refresh = mock_run_in_background.call_args.args[0]
+        refresh()
+        self.assertEqual(self._get(lambda: [3], generation=2, stale_timeout=60), ([2], CACHE_HIT))
+        self.assertIsNone(cache.get('key.lock'))
+
+    @patch('sales.utils.cache.run_in_background')
+    def test_expired_entries_are_served_stale_within_the_window(self, mock_run_in_background):
+        cache.set('key', CacheEntry([1], generation=1, created_at=time.time() - 90))
+
+        self.assertEqual(self._get(lambda: [2], stale_timeout=60), ([1], CACHE_STALE))
+        cache.delete('key.lock')
+
+        cache.set('key', CacheEntry([1], generation=1, created_at=time.time() - 150))
+        self.assertEqual(self._get(lambda: [2], stale_timeout=60), ([2], CACHE_MISS))
+        mock_run_in_background.assert_called_once()
+
+    async def test_async_single_flight(self):
+        async def compute():
+            return [1]
+
+        self.assertEqual(
+            await aget_or_set_single_flight('key', compute, generation=1, timeout=60),
+            ([1], CACHE_MISS),
+        )
+        self.assertEqual(cache.get('key').value, [1])
+        self.assertIsNone(cache.get('key.lock'))
+
+        async def compute_fresh():
+            return [2]
+
+        self.assertEqual(
+            await aget_or_set_single_flight(
+                'key', compute_fresh, generation=2, timeout=60, stale_timeout=60
+            ),
+            ([1], CACHE_STALE),
+        )
+        await asyncio.gather(*_background_tasks)
+        self.assertEqual(cache.get('key').value, [2])
+        self.assertIsNone(cache.get('key.lock'))
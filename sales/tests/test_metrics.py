@@ -0,0 +1,142 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from sales.apps.products.models import Product
+from sales.apps.sales.cache import SALESRECORD_LIST_CACHE_PREFIX
+from sales.apps.sales.models import SalesRecord
+from sales.utils.metrics import (
+    CACHE_ENTRY_SIZE,
+    CACHE_LOOKUPS,
+    COMPRESSED_RESPONSES,
+    REQUEST_DB_QUERIES,
+    REQUEST_DURATION,
+    REQUEST_PHASE_DURATION,
+    RESPONSE_SIZE,
+    Counter,
+    Histogram,
+    Metric,
+    registry,
+)
+
+
+class MetricsExpositionTests(SimpleTestCase):
+    def test_metrics_must_implement_samples(self):
+        class Gauge(Metric):
+            type = 'gauge'
+
+        with self.assertRaises(TypeError):
+            Gauge('test', 'Test.')
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram('test_seconds', 'Test.', ('route',), buckets=(0.1, 1))
+        for value in (0.05, 0.1, 0.5, 2):
+            histogram.observe(value, 'a"b')
+
+        self.assertEqual(histogram.get('a"b'), (4, 2.65))
+        self.assertEqual(
+            histogram.render().splitlines(),
+            [
+                '# HELP test_seconds Test.',
+                '# TYPE test_seconds histogram',
+                'test_seconds_bucket{route="a\\"b",le="0.1"} 2',
+                'test_seconds_bucket{route="a\\"b",le="1"} 3',
+                'test_seconds_bucket{route="a\\"b",le="+Inf"} 4',
+                'test_seconds_sum{route="a\\"b"} 2.65',
+                'test_seconds_count{route="a\\"b"} 4',
+            ],
+        )
+
+    def test_counter(self):
+        counter = Counter('test_lookups', 'Test.', ('result',))
+        counter.inc('hit')
+        counter.inc('hit')
+        counter.inc('miss')
+
+        self.assertEqual(
+            counter.render().splitlines()[2:],
+            ['test_lookups_total{result="hit"} 2', 'test_lookups_total{result="miss"} 1'],
+        )
+
+
+class MetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser')
+        self.client.force_authenticate(self.user)
+
+        product = Product.objects.create(name='Test Product', category='Test', price=10)
+        SalesRecord.objects.create(
+            product=product,
+            quantity_sold=1,
+            total_sales_amount=10,
+            date_of_sale=timezone.now(),
+        )
+
+    def test_records_request_metrics(self):
+        self.client.get(reverse('sales-data-list'))
+        self.client.get(reverse('sales-data-list'), headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(REQUEST_DURATION.get('sales-data-list', 'GET', '200')[0], 2)
+        self.assertEqual(CACHE_LOOKUPS.get(SALESRECORD_LIST_CACHE_PREFIX, 'miss'), 1)
+        self.assertEqual(CACHE_LOOKUPS.get(SALESRECORD_LIST_CACHE_PREFIX, 'hit'), 1)
+        self.assertLess(
+            CACHE_ENTRY_SIZE.get(SALESRECORD_LIST_CACHE_PREFIX, 'gzip'),
+            CACHE_ENTRY_SIZE.get(SALESRECORD_LIST_CACHE_PREFIX, 'identity'),
+        )
+        self.assertEqual(COMPRESSED_RESPONSES.get('identity'), 1)
+        self.assertEqual(COMPRESSED_RESPONSES.get('gzip'), 1)
+
+        # observed for both requests, although only the first one queried the database
+        self.assertEqual(REQUEST_DB_QUERIES.get('sales-data-list')[0], 2)
+        self.assertGreater(REQUEST_DB_QUERIES.get('sales-data-list')[1], 0)
+        self.assertEqual(RESPONSE_SIZE.get('sales-data-list')[0], 2)
+
+        for phase in ('authentication', 'throttling', 'cache', 'render'):
+            self.assertEqual(REQUEST_PHASE_DURATION.get('sales-data-list', phase)[0], 2)
+
+    def test_unmatched_route(self):
+        self.client.get('/missing/')
+
+        self.assertEqual(REQUEST_DURATION.get('unmatched', 'GET', '404')[0], 1)
+
+    async def test_records_async_view_metrics(self):
+        url = reverse('async-sales-data-list')
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+        await self.async_client.get(url, headers=headers)
+        await self.async_client.get(url, headers=headers)
+
+        self.assertEqual(REQUEST_DURATION.get('async-sales-data-list', 'GET', '200')[0], 2)
+        self.assertEqual(CACHE_LOOKUPS.get(SALESRECORD_LIST_CACHE_PREFIX, 'miss'), 1)
+        self.assertEqual(CACHE_LOOKUPS.get(SALESRECORD_LIST_CACHE_PREFIX, 'hit'), 1)
+        self.assertEqual(
+            REQUEST_PHASE_DURATION.get('async-sales-data-list', 'authentication')[0], 2
+        )
+
+
+class MetricsViewTests(TestCase):
+    def test_internal_ips_can_scrape_without_token(self):
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertIn(
+            '# TYPE sales_http_request_duration_seconds histogram', response.content.decode()
+        )
+
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token_is_required_when_set(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+        response = self.client.get(reverse('metrics'), headers={'Authorization': 'Bearer secret'})
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,66 @@
+import json
+import random
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from uuid import UUID
+
+import msgpack
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+
+from sales.apps.sales.api.serializers import SalesRecordSerializer
+from sales.apps.sales.management.commands.benchmark_rendering import build_sales_records
+from sales.utils.renderers import MessagePackRenderer, ORJSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def assertRendersLikeJSONRenderer(self, data):
+        self.assertEqual(
+            ORJSONRenderer().render(data, 'application/json'),
+            JSONRenderer().render(data, 'application/json'),
+        )
+
+    def test_sales_records_page(self):
+        records = build_sales_records(20, rng=random.Random(0))
+        self.assertRendersLikeJSONRenderer(
+            {'count': 20, 'results': SalesRecordSerializer(records, many=True).data}
+        )
+
+    def test_values_encoded_like_json_renderer(self):
+        self.assertRendersLikeJSONRenderer(
+            {
+                'decimal': Decimal('10.50'),
+                'datetime': timezone.now(),
+                'date': timezone.now().date(),
+                'uuid': UUID(int=1),
+                'lazy': _('Category'),
+                'errors': {1: [ErrorDetail('Invalid.', code='invalid')]},
+                'text': 'café \u2028\u2029',
+                'none': None,
+            }
+        )
+
+    def test_indented_output_falls_back(self):
+        data = {'a': [1, 2]}
+        self.assertEqual(
+            ORJSONRenderer().render(data, 'application/json; indent=4'),
+            JSONRenderer().render(data, 'application/json; indent=4'),
+        )
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+class MessagePackRendererTests(SimpleTestCase):
+    def test_values_converted_like_json(self):
+        data = {
+            'decimal': Decimal('10.50'),
+            'datetime': datetime(2024, 9, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            'uuid': UUID(int=1),
+        }
+
+        content = MessagePackRenderer().render(data)
+
+        self.assertEqual(msgpack.unpackb(content), json.loads(JSONRenderer().render(data)))
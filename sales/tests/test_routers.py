@@ -0,0 +1,105 @@
+import json
+import uuid
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from sales.apps.products.models import Product
+from sales.apps.sales.models import SalesRecord
+from sales.utils.routers import ReplicaRouter, choose_replica, set_read_database
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1', 'replica_2'])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(set_read_database, None)
+        self.router = ReplicaRouter()
+
+    def test_reads_are_balanced_between_replicas(self):
+        self.assertIsNone(self.router.db_for_read(SalesRecord))
+
+        aliases = set()
+        for _ in range(50):
+            set_read_database(choose_replica())
+            aliases.add(self.router.db_for_read(SalesRecord))
+
+        self.assertEqual(aliases, {'replica_1', 'replica_2'})
+
+    def test_writes_go_to_primary(self):
+        set_read_database(choose_replica())
+
+        self.assertEqual(self.router.db_for_write(SalesRecord), 'default')
+
+
+@skipUnless('replica' in settings.DATABASES, 'requires the replica database of LOCAL_BACKENDS')
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaReadViewTests(TestCase):
+    # the test runner sets up the databases of skipped tests too
+    databases = {'default', 'replica'} & settings.DATABASES.keys()
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_superuser(username='testuser')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        # only written to the primary database, the replica one stays empty
+        self.product = Product.objects.create(name='Test Product', category='Test', price=10)
+        SalesRecord.objects.create(
+            product=self.product,
+            quantity_sold=1,
+            total_sales_amount=10,
+            date_of_sale=timezone.now(),
+        )
+
+    def test_reads_go_to_replica(self):
+        response = self.client.get(reverse('sales-data-list'))
+        self.assertEqual(response.data['count'], 0)
+
+        response = self.client.get(reverse('sales-data-aggregate'), {'aggregate_by': 'category'})
+        self.assertEqual(response.data, [])
+
+        response = self.client.get(reverse('sales-data-export'), {'format': 'ndjson'})
+        self.assertEqual(b''.join(response.streaming_content), b'')
+
+    async def test_async_reads_go_to_replica(self):
+        response = await self.async_client.get(
+            reverse('async-sales-data-list'),
+            headers={'Authorization': f'Bearer {AccessToken.for_user(self.user)}'},
+        )
+
+        self.assertEqual(response.json()['count'], 0)
+
+    def test_writer_is_pinned_to_primary(self):
+        other_client = APIClient()
+        other_client.force_authenticate(User.objects.create_user(username='otheruser'))
+
+        response = self.client.post(
+            reverse('sales-data-ingest'),
+            data=json.dumps(
+                {
+                    'id': str(uuid.uuid4()),
+                    'product': str(self.product.uuid),
+                    'quantity_sold': 2,
+                    'total_sales_amount': '20.00',
+                    'date_of_sale': '2024-09-01T10:00:00Z',
+                }
+            ),
+            content_type='application/x-ndjson',
+        )
+        self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(self.client.get(reverse('sales-data-list')).data['count'], 2)
+        # cached responses are shared between users, so with another query
+        response = other_client.get(reverse('sales-data-list'), {'page_size': 10})
+        self.assertEqual(response.data['count'], 0)
+
+        cache.clear()  # the pin expired
+        self.assertEqual(self.client.get(reverse('sales-data-list')).data['count'], 0)
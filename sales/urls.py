@@ -17,12 +17,14 @@ Including another URLconf
 
 from django.conf import settings
 from django.contrib import admin
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from .utils.api import APIRouter
+from .utils.metrics import metrics_view
 
 router = APIRouter()
 
@@ -50,8 +52,12 @@ urlpatterns = [
     path('api/token/refresh/', ScopedTokenRefreshView.as_view(), name='token_refresh'),
     path('api/schema/', RestrictedSchemaView.as_view(), name='schema'),
     path('api/docs/', RestrictedSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
+# static files of the admin and the browsable API, in debug only, as served by runserver
+urlpatterns += staticfiles_urlpatterns()
+
 
 if settings.ENABLE_DEBUG_TOOLBAR:
     from debug_toolbar.toolbar import debug_toolbar_urls
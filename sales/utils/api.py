@@ -6,6 +6,7 @@ from django.apps import apps
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
 from rest_framework.routers import DefaultRouter
 from drf_spectacular.utils import OpenApiResponse
 
@@ -49,6 +50,12 @@ class APIRouter(DefaultRouter):
         return self.generic_routes + urls
 
 
+class ConflictError(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _('The request conflicts with a concurrent change, retry it.')
+    default_code = 'conflict'
+
+
 class ErrorDetailResponseSerializer(serializers.Serializer):
     field_name = serializers.ListField(
         child=serializers.CharField(),
@@ -0,0 +1,540 @@
+import asyncio
+import contextvars
+import hashlib
+import logging
+import threading
+import time
+import uuid
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from datetime import time as datetime_time
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, NamedTuple, Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import connections
+from django.db.models import Model
+from django.utils import timezone, translation
+from django_redis.cache import RedisCache
+from django_redis.client import DefaultClient
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+if TYPE_CHECKING:
+    from django.http import QueryDict  # pragma: no cover
+
+logger = logging.getLogger(__name__)
+
+
+def _get_cache_generation_key(namespace: str) -> str:
+    return f'cache_generation:{namespace}'
+
+
+def _get_initial_cache_generation() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def get_cache_generation(namespace: str) -> int:
+    """
+    Returns the current generation of a cache namespace.
+
+    A missing counter (first use, or evicted from the cache) is initialised with the current
+    timestamp in milliseconds, so it never restarts from a generation that may still be cached.
+    """
+
+    key = _get_cache_generation_key(namespace)
+    generation = cache.get(key)
+
+    if generation is None:
+        initial_generation = _get_initial_cache_generation()
+        cache.add(key, initial_generation, timeout=None)
+        generation = cache.get(key, initial_generation)
+
+    return generation
+
+
+def bump_cache_generation(*namespaces: str) -> None:
+    """
+    Invalidates every entry of the given cache namespaces in O(1), by incrementing their
+    generation. Entries of older generations are never read again and age out by their TTL.
+    """
+
+    for namespace in namespaces:
+        key = _get_cache_generation_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _get_initial_cache_generation(), timeout=None)
+
+
+CACHE_HIT = 'hit'
+CACHE_STALE = 'stale'
+CACHE_MISS = 'miss'
+
+SINGLE_FLIGHT_LOCK_TIMEOUT = 30
+SINGLE_FLIGHT_WAIT_TIMEOUT = 10
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+
+# deletes the key only if it holds the given value, atomically
+DELETE_IF_EQUAL_SCRIPT = '''
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+'''
+
+# part of response cache keys, to be incremented when the format of cached responses changes,
+# so entries written by previous deployments are not read
+RESPONSE_CACHE_VERSION = 3
+
+
+def _get_canonical_value(value: Any) -> str:
+    if isinstance(value, (date, datetime_time)):
+        return value.isoformat()
+    if isinstance(value, Model):
+        return str(value.pk)
+    return str(value)
+
+
+def get_canonical_query(query_params: 'QueryDict', cleaned_data: Optional[dict] = None) -> str:
+    """
+    Returns `query_params` as a query string in a canonical form, so equivalent queries
+    share their cache entries.
+
+    Parameters are sorted by name. Those in `cleaned_data` (e.g. the cleaned data of the view
+    filterset) are replaced by their cleaned values, so `2024-1-1` and `2024-01-01`,
+    or an empty and a missing parameter, give the same query.
+    """
+
+    cleaned_data = cleaned_data or {}
+    items = []
+
+    for name, value in cleaned_data.items():
+        if value is None or value == '' or value == []:
+            continue
+        values = sorted(value) if isinstance(value, (list, tuple, set)) else [value]
+        items.extend((name, _get_canonical_value(value)) for value in values)
+
+    for name in query_params:
+        if name not in cleaned_data:
+            # the order of repeated parameters is kept, it may be meaningful
+            items.extend((name, value) for value in query_params.getlist(name))
+
+    return urlencode(sorted(items, key=itemgetter(0)))
+
+
+def get_response_cache_key(key_prefix: str, request, query: str) -> str:
+    """
+    Returns the cache key of the response to `request` under `key_prefix`, given the canonical
+    `query` of the request.
+
+    Like with `cache_page`, the key depends on the absolute URL, which responses may link to,
+    and on the active time zone. It does not depend on the cache generation: the generation
+    an entry was computed in is stored in the entry (see `CacheEntry`).
+    """
+
+    url = hashlib.md5(f'{request.build_absolute_uri(request.path)}?{query}'.encode()).hexdigest()
+    return f'{key_prefix}.v{RESPONSE_CACHE_VERSION}.{url}.{timezone.get_current_timezone_name()}'
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    generation: int
+    created_at: float
+
+    def is_fresh(self, generation: int, timeout: Optional[float]) -> bool:
+        return self.generation == generation and (
+            timeout is None or time.time() < self.created_at + timeout
+        )
+
+    def is_servable_stale(self, timeout: Optional[float], stale_timeout: float) -> bool:
+        return stale_timeout > 0 and time.time() < self.created_at + (timeout or 0) + stale_timeout
+
+
+def _is_native_redis_cache(backend) -> bool:
+    return isinstance(backend, RedisCache) and type(backend.client) is DefaultClient
+
+
+def _handle_cache_error(backend, key: str) -> None:
+    if not backend._ignore_exceptions:
+        raise
+    logger.warning(f'Ignored cache error for key "{key}".', exc_info=True)
+
+
+def delete_if_equal(key: str, value: Any) -> bool:
+    """
+    Deletes `key` if it holds `value`, e.g. to release a lock only if the caller still owns it,
+    rather than the lock of another caller acquired after it expired.
+
+    With `django-redis`, the comparison and the deletion are atomic. Other backends
+    (local-memory cache of local runs and tests) read the key first.
+
+    Returns:
+        bool: Whether the key was deleted.
+    """
+
+    backend = caches[DEFAULT_CACHE_ALIAS]
+    if not _is_native_redis_cache(backend):
+        return backend.get(key) == value and backend.delete(key)
+
+    client = backend.client
+    try:
+        return bool(
+            client.get_client(write=True).eval(
+                DELETE_IF_EQUAL_SCRIPT, 1, client.make_key(key), client.encode(value)
+            )
+        )
+    except RedisError:
+        _handle_cache_error(backend, key)
+        return False
+
+
+def run_in_background(func: 'Callable[[], Any]') -> None:
+    """
+    Runs `func` in a daemon thread, in a copy of the context of the caller (context variables,
+    like the database reads are routed to, time zone and language), then closes the database
+    connections of the thread.
+    """
+
+    time_zone = timezone.get_current_timezone()
+    language = translation.get_language()
+
+    def run():
+        try:
+            with timezone.override(time_zone), translation.override(language):
+                func()
+        except Exception:
+            logger.exception('Background cache refresh failed.')
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=contextvars.copy_context().run, args=(run,), daemon=True).start()
+
+
+_background_tasks: 'set[asyncio.Task]' = set()
+
+
+def start_background_task(coroutine: 'Awaitable[Any]') -> None:
+    """
+    Schedules `coroutine` on the running event loop, keeping a reference to the task
+    until it is done.
+    """
+
+    async def run():
+        try:
+            await coroutine
+        except Exception:
+            logger.exception('Background cache refresh failed.')
+
+    task = asyncio.get_running_loop().create_task(run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+_refreshing_cache: 'ContextVar[bool]' = ContextVar('refreshing_cache', default=False)
+
+
+@contextmanager
+def refreshing_cache():
+    """
+    Makes `get_or_set_single_flight` recompute and store the entries requested in this context,
+    even fresh ones, e.g. to warm the cache up.
+    """
+
+    token = _refreshing_cache.set(True)
+    try:
+        yield
+    finally:
+        _refreshing_cache.reset(token)
+
+
+def get_or_set_single_flight(
+    key: str,
+    compute: 'Callable[[], Any]',
+    generation: int,
+    timeout: Optional[float],
+    stale_timeout: float = 0,
+    lock_timeout: float = SINGLE_FLIGHT_LOCK_TIMEOUT,
+    wait_timeout: float = SINGLE_FLIGHT_WAIT_TIMEOUT,
+) -> 'tuple[Any, str]':
+    """
+    Returns the value cached under `key` if it was computed in `generation` less than `timeout`
+    seconds ago, otherwise computes it with `compute` and caches it.
+
+    Only the caller acquiring the lock of an entry recomputes it, so an invalidation does not
+    make every concurrent request run the same query. The other callers wait for the new value
+    up to `wait_timeout` seconds, then compute it themselves. The lock holds a token of its
+    caller, so a caller whose lock expired does not release the lock of another one.
+
+    With a `stale_timeout` (stale-while-revalidate), expired and invalidated values are served
+    instead, to every caller, until they are `timeout + stale_timeout` seconds old, while a
+    background thread recomputes them. Without it, outdated values are never served.
+
+    Returns:
+        tuple[Any, str]: The value, and whether it was a cache hit, a stale hit or a miss.
+    """
+
+    entry = None if _refreshing_cache.get() else cache.get(key)
+    if entry is not None and entry.is_fresh(generation, timeout):
+        return entry.value, CACHE_HIT
+
+    lock_key = f'{key}.lock'
+    lock_token = uuid.uuid4().hex
+    # `None` when the cache is unavailable, then nobody would ever store the entry
+    locked = cache.add(lock_key, lock_token, lock_timeout)
+
+    def compute_and_set():
+        try:
+            value = compute()
+            cache.set(
+                key,
+                CacheEntry(value, generation, time.time()),
+                None if timeout is None else timeout + stale_timeout,
+            )
+            return value
+        finally:
+            if locked:
+                delete_if_equal(lock_key, lock_token)
+
+    if entry is not None and entry.is_servable_stale(timeout, stale_timeout):
+        if locked:
+            run_in_background(compute_and_set)
+        if locked is not None:
+            return entry.value, CACHE_STALE
+
+    if locked is False:
+        deadline = time.monotonic() + wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None and entry.is_fresh(generation, timeout):
+                return entry.value, CACHE_HIT
+
+            # the lock is released without an entry when computing it failed
+            locked = cache.add(lock_key, lock_token, lock_timeout)
+            if locked is not False:
+                break
+
+    return compute_and_set(), CACHE_MISS
+
+
+class AsyncCache:
+    """
+    Minimal asyncio client of a configured cache, for async views.
+
+    Django's async cache methods (`aget`, `aset`, ...) only run the blocking `django-redis`
+    client in a worker thread. Here, `django-redis` entries are read and written with a native
+    `redis.asyncio` client instead, using the key and value encoding of `django-redis`,
+    so sync and async code share the same entries (like the cache generation counters).
+    Other cache backends fall back to Django's async cache methods.
+    """
+
+    def __init__(self, alias: str = DEFAULT_CACHE_ALIAS):
+        self.alias = alias
+        # connection pools are bound to the event loop they were created in
+        self._clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Redis]' = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def is_native(self) -> bool:
+        return _is_native_redis_cache(self.cache)
+
+    def get_client(self) -> Redis:
+        loop = asyncio.get_running_loop()
+        if loop not in self._clients:
+            self._clients[loop] = self.build_client()
+        return self._clients[loop]
+
+    def build_client(self) -> Redis:
+        """
+        Returns a client of the primary server of the cache, with the connection options of
+        its `OPTIONS` setting, as used by the `django-redis` connection factory.
+        """
+
+        cache_settings = settings.CACHES[self.alias]
+        location = cache_settings['LOCATION']
+        if isinstance(location, str):
+            location = location.split(',')
+        options = cache_settings.get('OPTIONS', {})
+
+        kwargs = dict(options.get('CONNECTION_POOL_KWARGS', {}))
+        for option, name in (
+            ('PASSWORD', 'password'),
+            ('SOCKET_TIMEOUT', 'socket_timeout'),
+            ('SOCKET_CONNECT_TIMEOUT', 'socket_connect_timeout'),
+        ):
+            if option in options:
+                kwargs[name] = options[option]
+
+        # the first server is the primary one, like with `DefaultClient` write connections
+        return Redis.from_url(location[0].strip(), **kwargs)
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        if not self.is_native:
+            return await self.cache.aget(key, default)
+
+        client = self.cache.client
+        try:
+            value = await self.get_client().get(client.make_key(key))
+        except RedisError:
+            self._handle_error(key)
+            return default
+
+        return default if value is None else client.decode(value)
+
+    async def set(self, key: str, value: Any, timeout: Optional[float] = DEFAULT_TIMEOUT) -> bool:
+        if not self.is_native:
+            await self.cache.aset(key, value, timeout)
+            return True
+
+        return await self._set(key, value, timeout)
+
+    async def add(
+        self, key: str, value: Any, timeout: Optional[float] = DEFAULT_TIMEOUT
+    ) -> Optional[bool]:
+        if not self.is_native:
+            return await self.cache.aadd(key, value, timeout)
+
+        return await self._set(key, value, timeout, nx=True)
+
+    async def delete(self, key: str) -> bool:
+        if not self.is_native:
+            return await self.cache.adelete(key)
+
+        try:
+            return bool(await self.get_client().delete(self.cache.client.make_key(key)))
+        except RedisError:
+            self._handle_error(key)
+            return False
+
+    async def delete_if_equal(self, key: str, value: Any) -> bool:
+        """
+        Async counterpart of `delete_if_equal`.
+        """
+
+        if not self.is_native:
+            return await self.cache.aget(key) == value and await self.cache.adelete(key)
+
+        client = self.cache.client
+        try:
+            return bool(
+                await self.get_client().eval(
+                    DELETE_IF_EQUAL_SCRIPT, 1, client.make_key(key), client.encode(value)
+                )
+            )
+        except RedisError:
+            self._handle_error(key)
+            return False
+
+    async def _set(
+        self, key: str, value: Any, timeout: Optional[float], nx: bool = False
+    ) -> Optional[bool]:
+        client = self.cache.client
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.cache.default_timeout
+        timeout_ms = None if timeout is None else int(timeout * 1000)
+
+        try:
+            if timeout_ms is not None and timeout_ms <= 0:
+                # like `django-redis`, a non positive timeout expires the entry right away
+                if not nx:
+                    await self.get_client().delete(client.make_key(key))
+                return False
+
+            return bool(
+                await self.get_client().set(
+                    client.make_key(key), client.encode(value), nx=nx, px=timeout_ms
+                )
+            )
+        except RedisError:
+            self._handle_error(key)
+            # like `django-redis`, so callers can tell an unavailable cache from an existing key
+            return None
+
+    def _handle_error(self, key: str) -> None:
+        _handle_cache_error(self.cache, key)
+
+
+async_cache = AsyncCache()
+
+
+async def aget_cache_generation(namespace: str) -> int:
+    """
+    Async counterpart of `get_cache_generation`.
+    """
+
+    key = _get_cache_generation_key(namespace)
+    generation = await async_cache.get(key)
+
+    if generation is None:
+        initial_generation = _get_initial_cache_generation()
+        await async_cache.add(key, initial_generation, timeout=None)
+        generation = await async_cache.get(key, initial_generation)
+
+    return generation
+
+
+async def aget_or_set_single_flight(
+    key: str,
+    compute: 'Callable[[], Awaitable[Any]]',
+    generation: int,
+    timeout: Optional[float],
+    stale_timeout: float = 0,
+    lock_timeout: float = SINGLE_FLIGHT_LOCK_TIMEOUT,
+    wait_timeout: float = SINGLE_FLIGHT_WAIT_TIMEOUT,
+) -> 'tuple[Any, str]':
+    """
+    Async counterpart of `get_or_set_single_flight`, `compute` is a coroutine function.
+    Stale values are recomputed by a task of the running event loop.
+    """
+
+    entry = None if _refreshing_cache.get() else await async_cache.get(key)
+    if entry is not None and entry.is_fresh(generation, timeout):
+        return entry.value, CACHE_HIT
+
+    lock_key = f'{key}.lock'
+    lock_token = uuid.uuid4().hex
+    locked = await async_cache.add(lock_key, lock_token, lock_timeout)
+
+    async def compute_and_set():
+        try:
+            value = await compute()
+            await async_cache.set(
+                key,
+                CacheEntry(value, generation, time.time()),
+                None if timeout is None else timeout + stale_timeout,
+            )
+            return value
+        finally:
+            if locked:
+                await async_cache.delete_if_equal(lock_key, lock_token)
+
+    if entry is not None and entry.is_servable_stale(timeout, stale_timeout):
+        if locked:
+            start_background_task(compute_and_set())
+        if locked is not None:
+            return entry.value, CACHE_STALE
+
+    if locked is False:
+        deadline = time.monotonic() + wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+            entry = None if _refreshing_cache.get() else await async_cache.get(key)
+            if entry is not None and entry.is_fresh(generation, timeout):
+                return entry.value, CACHE_HIT
+
+            locked = await async_cache.add(lock_key, lock_token, lock_timeout)
+            if locked is not False:
+                break
+
+    return await compute_and_set(), CACHE_MISS
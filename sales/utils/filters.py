@@ -0,0 +1,79 @@
+from typing import TYPE_CHECKING
+
+from django.utils.translation import gettext_lazy as _
+from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+
+from .helpers import convert_date_to_utc
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet  # pragma: no cover
+
+
+class DateRangeFilterMixin(filters.FilterSet):
+    """
+    `start_date`/`end_date` filters of the sales records, matched on whole days of the current
+    time zone, whose range is validated before filtering.
+
+    Filtersets of other models can redeclare both filters as no-ops and apply the range to
+    their sales records with `filter_date_range`.
+    """
+
+    start_date = filters.DateFilter(
+        method='filter_start_date',
+        label=_('Start date (ISO 8601)'),
+        help_text=_('Filters records from this date (format: YYYY-MM-DD)'),
+    )
+    end_date = filters.DateFilter(
+        method='filter_end_date',
+        label=_('End date (ISO 8601)'),
+        help_text=_('Filter records up to this date (format: YYYY-MM-DD)'),
+    )
+
+    def filter_start_date(self, queryset: 'QuerySet', name, value):
+        if value:
+            start_datetime = convert_date_to_utc(date=value)
+            queryset = queryset.filter(date_of_sale__gte=start_datetime)
+        return queryset
+
+    def filter_end_date(self, queryset: 'QuerySet', name, value):
+        if value:
+            end_datetime = convert_date_to_utc(date=value, is_end_of_day=True)
+            queryset = queryset.filter(date_of_sale__lte=end_datetime)
+        return queryset
+
+    def filter_date_range(self, queryset: 'QuerySet') -> 'QuerySet':
+        """
+        Returns the records of `queryset` in the requested date range.
+        """
+
+        queryset = self.filter_start_date(
+            queryset, 'start_date', self.form.cleaned_data.get('start_date')
+        )
+        return self.filter_end_date(queryset, 'end_date', self.form.cleaned_data.get('end_date'))
+
+    def validate_date_range(self):
+        start_date = self.form.cleaned_data.get('start_date')
+        end_date = self.form.cleaned_data.get('end_date')
+
+        if start_date and end_date and start_date > end_date:
+            raise ValidationError(
+                detail={
+                    'start_date': ['Must be before or equal to end_date.'],
+                }
+            )
+
+    def filter_queryset(self, queryset: 'QuerySet'):
+        self.validate_date_range()
+        return super().filter_queryset(queryset)
+
+
+class ViewFilterSetBackend(filters.DjangoFilterBackend):
+    """
+    `DjangoFilterBackend` keeping the filterset of the request on the view, as `filterset`,
+    so the view can reuse its cleaned data once the queryset is filtered.
+    """
+
+    def get_filterset(self, request, queryset, view):
+        view.filterset = super().get_filterset(request, queryset, view)
+        return view.filterset
@@ -0,0 +1,391 @@
+"""
+Request metrics, exposed in the Prometheus text format by `metrics_view`.
+
+`MetricsMiddleware` records, per route (the URL name of the resolved view):
+- the request latency, by method and status code,
+- the number of SQL queries and the time spent in them,
+- the time spent in the request phases instrumented with `record_phase`
+  (authentication, throttling, response cache, rendering),
+- the response size.
+
+Response cache hits and misses are counted by key prefix with `record_cache_lookup`, the size of
+stored entries before and after compression with `record_cache_entry_size`, and how compressed
+cached responses are served with `record_compressed_response`.
+
+Metrics are kept in memory, so each server process exposes its own values, which Prometheus
+aggregates when scraping every process. Recording a request costs a few dictionary updates
+under a lock, and one `perf_counter` call around each SQL query.
+"""
+
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.cache import never_cache
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+PHASE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+HTTP_METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+UNMATCHED_ROUTE = 'unmatched'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels: 'dict[str, str]') -> str:
+    if not labels:
+        return ''
+
+    escaped = (
+        (name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels.items()
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+class Metric(ABC):
+    type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: 'tuple[str, ...]' = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    @abstractmethod
+    def samples(self) -> 'Iterator[tuple[str, dict[str, str], float]]':
+        """
+        Returns:
+            Iterator[tuple[str, dict[str, str], float]]: The samples of the metric,
+                as `(name, labels, value)` tuples.
+        """
+
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        lines.extend(
+            f'{name}{_format_labels(labels)} {_format_value(value)}'
+            for name, labels, value in self.samples()
+        )
+        return '\n'.join(lines)
+
+    def _labels(self, labelvalues: 'tuple[str, ...]') -> 'dict[str, str]':
+        return dict(zip(self.labelnames, labelvalues))
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def get(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+
+        for labelvalues, value in sorted(values):
+            yield f'{self.name}_total', self._labels(labelvalues), value
+
+
+class Histogram(Metric):
+    """
+    Histogram of observed values, with the cumulative `le` buckets of Prometheus.
+
+    Observations only increment their own bucket, buckets are accumulated when rendered.
+    """
+
+    type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: 'tuple[str, ...]' = (),
+        buckets: 'tuple[float, ...]' = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labelvalues)
+            if counts is None:
+                # one count per bucket, then the +Inf bucket and the sum of the observed values
+                counts = self._values[labelvalues] = [0] * (len(self.buckets) + 1) + [0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def get(self, *labelvalues: str) -> 'tuple[int, float]':
+        """
+        Returns:
+            tuple[int, float]: The number and the sum of the observed values.
+        """
+
+        counts = self._values.get(labelvalues)
+        if counts is None:
+            return 0, 0
+        return sum(counts[:-1]), counts[-1]
+
+    def samples(self):
+        with self._lock:
+            values = [(labelvalues, list(counts)) for labelvalues, counts in self._values.items()]
+
+        for labelvalues, counts in sorted(values):
+            labels = self._labels(labelvalues)
+            cumulative_count = 0
+            for bound, count in zip((*self.buckets, float('inf')), counts):
+                cumulative_count += count
+                yield f'{self.name}_bucket', {
+                    **labels,
+                    'le': _format_value(bound),
+                }, cumulative_count
+            yield f'{self.name}_sum', labels, counts[-1]
+            yield f'{self.name}_count', labels, cumulative_count
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: 'list[Metric]' = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self.register(Counter(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self.register(Histogram(*args, **kwargs))
+
+    def clear(self) -> None:
+        for metric in self._metrics:
+            metric.clear()
+
+    def render(self) -> str:
+        return '\n'.join(metric.render() for metric in self._metrics) + '\n'
+
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.histogram(
+    'sales_http_request_duration_seconds',
+    'Latency of HTTP requests, from the first middleware to the rendered response.',
+    ('route', 'method', 'status'),
+)
+REQUEST_PHASE_DURATION = registry.histogram(
+    'sales_http_request_phase_duration_seconds',
+    'Time spent by HTTP requests in instrumented phases.',
+    ('route', 'phase'),
+    buckets=PHASE_BUCKETS,
+)
+REQUEST_DB_QUERIES = registry.histogram(
+    'sales_http_request_db_queries',
+    'Number of SQL queries run by HTTP requests.',
+    ('route',),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_DURATION = registry.histogram(
+    'sales_http_request_db_duration_seconds',
+    'Time spent by HTTP requests in SQL queries.',
+    ('route',),
+)
+RESPONSE_SIZE = registry.histogram(
+    'sales_http_response_size_bytes',
+    'Size of HTTP response bodies (streaming responses excluded).',
+    ('route',),
+    buckets=SIZE_BUCKETS,
+)
+CACHE_LOOKUPS = registry.counter(
+    'sales_api_cache_lookups',
+    'Response cache lookups, by cache key prefix and result (hit, stale or miss).',
+    ('prefix', 'result'),
+)
+CACHE_ENTRY_SIZE = registry.counter(
+    'sales_api_cache_entry_bytes',
+    'Size of stored response cache entries, by cache key prefix and encoding (identity for '
+    'the rendered content, gzip for the stored one).',
+    ('prefix', 'encoding'),
+)
+COMPRESSED_RESPONSES = registry.counter(
+    'sales_api_compressed_responses',
+    'Responses of compressed cache entries, by how they were served: gzip (the stored content), '
+    'identity (decompressed) or rendered (by another renderer).',
+    ('encoding',),
+)
+
+
+class RequestMetrics:
+    """
+    Measurements of the current request, shared with the code serving it through a context
+    variable, which follows the request into the worker threads of async views.
+    """
+
+    __slots__ = ('start_time', 'queries', 'db_duration', 'phases')
+
+    def __init__(self):
+        self.start_time = perf_counter()
+        self.queries = 0
+        self.db_duration = 0.0
+        self.phases: 'dict[str, float]' = {}
+
+    def observe(self, request, response) -> None:
+        resolver_match = getattr(request, 'resolver_match', None)
+        route = resolver_match.view_name if resolver_match else UNMATCHED_ROUTE
+        method = request.method if request.method in HTTP_METHODS else 'other'
+
+        REQUEST_DURATION.observe(
+            perf_counter() - self.start_time, route, method, str(response.status_code)
+        )
+        REQUEST_DB_QUERIES.observe(self.queries, route)
+        REQUEST_DB_DURATION.observe(self.db_duration, route)
+        for phase, duration in self.phases.items():
+            REQUEST_PHASE_DURATION.observe(duration, route, phase)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(len(response.content), route)
+
+
+_request_metrics: 'ContextVar[Optional[RequestMetrics]]' = ContextVar(
+    'request_metrics', default=None
+)
+
+
+def record_phase(phase: str, duration: float) -> None:
+    """
+    Adds `duration` seconds to the time spent by the current request in `phase`.
+    Does nothing outside of requests.
+    """
+
+    metrics = _request_metrics.get()
+    if metrics is not None:
+        metrics.phases[phase] = metrics.phases.get(phase, 0) + duration
+
+
+@contextmanager
+def timed_phase(phase: str):
+    start_time = perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, perf_counter() - start_time)
+
+
+def record_cache_lookup(key_prefix: str, result: str) -> None:
+    CACHE_LOOKUPS.inc(key_prefix, result)
+
+
+def record_cache_entry_size(key_prefix: str, size: int, compressed_size: int) -> None:
+    CACHE_ENTRY_SIZE.inc(key_prefix, 'identity', amount=size)
+    CACHE_ENTRY_SIZE.inc(key_prefix, 'gzip', amount=compressed_size)
+
+
+def record_compressed_response(encoding: str) -> None:
+    COMPRESSED_RESPONSES.inc(encoding)
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start_time = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_duration += perf_counter() - start_time
+
+
+@receiver(connection_created)
+def install_query_recorder(sender=None, connection=None, **kwargs) -> None:
+    """
+    Times the queries of `connection`. Wrappers are kept when the connection is reopened,
+    and connections are per thread, so each one is instrumented once.
+    """
+
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class MetricsMiddleware:
+    """
+    Records the metrics of every request. Should be the first middleware, so the latency
+    includes the other ones.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = _request_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_metrics.reset(token)
+
+        metrics.observe(request, response)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _request_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_metrics.reset(token)
+
+        metrics.observe(request, response)
+        return response
+
+
+@never_cache
+def metrics_view(request):
+    """
+    Exposes the metrics of this process in the Prometheus text format.
+
+    Requires the `METRICS_TOKEN` bearer token when it is set, otherwise only answers
+    requests from `INTERNAL_IPS`.
+    """
+
+    if settings.METRICS_TOKEN:
+        authorization = request.headers.get('Authorization', '')
+        if not constant_time_compare(authorization, f'Bearer {settings.METRICS_TOKEN}'):
+            return HttpResponseForbidden()
+    elif request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS:
+        return HttpResponseForbidden()
+
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,12 +1,282 @@
+import hashlib
+from time import perf_counter
+from typing import TYPE_CHECKING, Optional
+
+from django.template.response import SimpleTemplateResponse
+from django.utils.cache import get_conditional_response, patch_response_headers
+from django.utils.http import http_date, parse_http_date_safe
+from django.utils.text import compress_string
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import status
 from rest_framework.authentication import SessionAuthentication
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from .cache import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_STALE,
+    get_cache_generation,
+    get_canonical_query,
+    get_or_set_single_flight,
+    get_response_cache_key,
+)
+from .metrics import record_cache_entry_size, record_cache_lookup, record_phase, timed_phase
+from .renderers import ORJSONRenderer
+from .responses import CompressedJSONResponse
+from .routers import choose_replica, is_pinned_to_primary, pin_to_primary, set_read_database
+
+if TYPE_CHECKING:
+    from django.http import HttpResponseBase  # pragma: no cover
+
+CONDITIONAL_REQUEST_HEADERS = (
+    'If-None-Match',
+    'If-Modified-Since',
+    'If-Match',
+    'If-Unmodified-Since',
+)
+
+
+class MetricsViewMixin:
+    """
+    Records the time spent authenticating, throttling and rendering API requests
+    as request metrics.
+    """
+
+    def perform_authentication(self, request):
+        with timed_phase('authentication'):
+            super().perform_authentication(request)
+
+    def check_throttles(self, request):
+        with timed_phase('throttling'):
+            super().check_throttles(request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        # responses are rendered right after the view returns, cached responses already are
+        if isinstance(response, SimpleTemplateResponse) and not response.is_rendered:
+            render_start_time = perf_counter()
+
+            def record_render_duration(response):
+                record_phase('render', perf_counter() - render_start_time)
+
+            response.add_post_render_callback(record_render_duration)
+
+        return response
+
 
-class AuthenticatedViewMixin:
+class AuthenticatedViewMixin(MetricsViewMixin):
     """
     Enforces JWT authentication and `IsAuthenticated` permission on API views.
     """
 
     authentication_classes = [SessionAuthentication, JWTAuthentication]
     permission_classes = [IsAuthenticated]
+
+
+class ReplicaReadViewMixin:
+    """
+    Reads from a random replica database in safe requests (see `sales.utils.routers`), unless
+    the user is pinned to the primary database: successful unsafe requests pin their user for
+    `DATABASE_REPLICA_PIN_TIMEOUT` seconds, so they read their own writes.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_pinned_to_primary(request.user):
+            set_read_database(choose_replica())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        set_read_database(None)
+        if request.method not in SAFE_METHODS and status.is_success(response.status_code):
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class PaginationModeViewMixin:
+    """
+    Lets clients choose the pagination style of a list view with the `pagination` query parameter.
+
+    `pagination_modes` maps mode names to pagination classes.
+    Views fall back to `pagination_class` when no (or an unknown) mode is requested.
+    """
+
+    pagination_mode_query_param = 'pagination'
+    pagination_modes = {}
+
+    def get_pagination_class(self):
+        query_params = getattr(getattr(self, 'request', None), 'query_params', {})
+        mode = query_params.get(self.pagination_mode_query_param)
+        return self.pagination_modes.get(mode, self.pagination_class)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            pagination_class = self.get_pagination_class()
+            self._paginator = pagination_class() if pagination_class is not None else None
+        return self._paginator
+
+
+class CachedListMixin:
+    """
+    Caches the data of list responses for `cache_timeout` seconds, in the current generation
+    of `cache_key_prefix`, so they can be invalidated with `bump_cache_generation`.
+
+    Entries are keyed on the canonical form of the query (see `get_canonical_query`), with the
+    filter parameters as cleaned by the filterset. Requests with invalid filters are not cached.
+    When an entry is missing or outdated, a single request recomputes it, concurrent ones wait
+    for the new one.
+
+    With a `cache_stale_timeout`, outdated entries are served stale-while-revalidate: they are
+    returned right away, while the fresh response is computed in the background,
+    until they are `cache_timeout + cache_stale_timeout` seconds old.
+
+    Entries store the content rendered by `cache_renderer_class`, gzip compressed, which is sent
+    as is to clients accepting gzip (see `CompressedJSONResponse`), so cache hits are neither
+    rendered nor compressed again.
+
+    Responses have an `ETag`, derived from the cache key and generation the data was computed
+    in, and a `Last-Modified` date, the time it was computed. Conditional requests whose
+    `If-None-Match` matches the current generation get a `304 Not Modified` response without
+    even reading the cache entry, ones matching the entry (or its date) once it is read.
+    """
+
+    cache_key_prefix: Optional[str] = None
+    cache_timeout: Optional[int] = None
+    cache_stale_timeout: int = 0
+    cache_renderer_class = ORJSONRenderer
+
+    def get_cache_key(self, request) -> Optional[str]:
+        """
+        Returns:
+            str | None: The cache key of the response, or `None` if it must not be cached.
+        """
+
+        filterset = DjangoFilterBackend().get_filterset(request, self.get_queryset(), self)
+        if filterset is not None and not filterset.is_valid():
+            return None
+
+        query = get_canonical_query(
+            request.query_params,
+            cleaned_data=filterset.form.cleaned_data if filterset is not None else None,
+        )
+        return get_response_cache_key(self.cache_key_prefix, request, query)
+
+    def get_response_headers(self, request) -> 'dict[str, str]':
+        """
+        Returns the headers describing the data computed for `request`, cached along with it.
+        """
+
+        return {}
+
+    def get_etag(self, cache_key: str, generation: int) -> str:
+        """
+        Returns the `ETag` of the data of `cache_key` computed in `generation`.
+        """
+
+        # weak, as the representation also depends on the negotiated renderer (`Vary: Accept`)
+        return f'W/"{hashlib.md5(f"{cache_key}.{generation}".encode()).hexdigest()}"'
+
+    def get_cache_content(self, data) -> bytes:
+        """
+        Returns the gzip compressed content of `data`, as stored in the cache.
+        """
+
+        content = self.cache_renderer_class().render(data)
+        compressed_content = compress_string(content)
+        record_cache_entry_size(self.cache_key_prefix, len(content), len(compressed_content))
+        return compressed_content
+
+    def get_cached_response(
+        self, compressed_content: Optional[bytes], result: str, headers: 'dict[str, str]'
+    ) -> Response:
+        """
+        Returns the response of a cache entry, without content when `compressed_content` is `None`.
+        """
+
+        response = (
+            Response(headers=headers)
+            if compressed_content is None
+            else CompressedJSONResponse(compressed_content, headers=headers)
+        )
+        # downstream caches must not keep stale responses
+        patch_response_headers(response, 0 if result == CACHE_STALE else self.cache_timeout)
+        return response
+
+    def get_not_modified_response(
+        self, request, result: str, headers: 'dict[str, str]'
+    ) -> 'Optional[HttpResponseBase]':
+        """
+        Returns:
+            HttpResponseBase | None: A `304 Not Modified` (or `412 Precondition Failed`) response
+                when the conditional headers of `request` match the `ETag` and `Last-Modified`
+                `headers`, otherwise `None`.
+        """
+
+        if not any(header in request.headers for header in CONDITIONAL_REQUEST_HEADERS):
+            return None
+
+        # headers of the full response, copied to the `304` one
+        response = self.get_cached_response(None, result, headers)
+        conditional_response = get_conditional_response(
+            request,
+            etag=headers.get('ETag'),
+            last_modified=parse_http_date_safe(headers.get('Last-Modified', '')),
+            response=response,
+        )
+        return conditional_response if conditional_response is not response else None
+
+    def list(self, request, *args, **kwargs):
+        if self.cache_key_prefix is None:
+            return super().list(request, *args, **kwargs)
+
+        start_time = perf_counter()
+        generation = get_cache_generation(self.cache_key_prefix)
+        cache_key = self.get_cache_key(request)
+        if cache_key is None:
+            return super().list(request, *args, **kwargs)
+
+        etag = self.get_etag(cache_key, generation)
+        if 'If-None-Match' in request.headers:
+            not_modified_response = self.get_not_modified_response(
+                request, CACHE_HIT, {'ETag': etag}
+            )
+            if not_modified_response is not None:
+                record_phase('cache', perf_counter() - start_time)
+                return not_modified_response
+
+        compute_duration = 0
+
+        def compute():
+            nonlocal compute_duration
+            compute_start_time = perf_counter()
+            try:
+                data = super(CachedListMixin, self).list(request, *args, **kwargs).data
+                return self.get_cache_content(data), {
+                    'ETag': etag,
+                    'Last-Modified': http_date(),
+                    **self.get_response_headers(request),
+                }
+            finally:
+                compute_duration = perf_counter() - compute_start_time
+
+        (compressed_content, headers), result = get_or_set_single_flight(
+            cache_key,
+            compute,
+            generation=generation,
+            timeout=self.cache_timeout,
+            stale_timeout=self.cache_stale_timeout,
+        )
+
+        record_cache_lookup(self.cache_key_prefix, result)
+        record_phase(
+            'cache',
+            # stale entries are recomputed in the background
+            perf_counter() - start_time - (compute_duration if result == CACHE_MISS else 0),
+        )
+        not_modified_response = self.get_not_modified_response(request, result, headers)
+        if not_modified_response is not None:
+            return not_modified_response
+        return self.get_cached_response(compressed_content, result, headers)
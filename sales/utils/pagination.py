@@ -0,0 +1,208 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import namedtuple
+from datetime import date
+from uuid import UUID
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
+
+KeysetCursor = namedtuple('KeysetCursor', ['position', 'reverse'])
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """
+    `PageNumberPagination` which can also paginate querysets from async views,
+    with `apaginate_queryset`.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # `count` is a cached property, fill it so `page()` does not run a blocking query
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        if paginator.num_pages > 1 and self.template is not None:
+            # The browsable API should display pagination controls.
+            self.display_page_controls = True
+
+        self.page.object_list = [instance async for instance in self.page.object_list]
+        return list(self.page)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a composite, unique ordering (keyset pagination).
+
+    DRF `CursorPagination` keys on the first ordering field only and falls back to an offset
+    for ties. Here the cursor stores the value of every ordering field, so each page is a
+    single index range scan, regardless of how deep it is, and no `COUNT(*)` is issued.
+
+    The last ordering field must be unique (like `id`) for the positions to be unambiguous.
+    """
+
+    ordering = ('-id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view=view)
+        if queryset is None:
+            return None
+
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view=view)
+        if queryset is None:
+            return None
+
+        return self.set_page([instance async for instance in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Returns the (unevaluated) queryset of the requested page, with one extra row
+        telling whether there are more rows after it.
+        """
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.ordering_fields = [
+            queryset.model._meta.get_field(field_name.lstrip('-')) for field_name in self.ordering
+        ]
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_position_filter(self.cursor.position, reverse))
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self._reverse_field_ordering(field_name) for field_name in ordering)
+
+        return queryset.order_by(*ordering)[: self.page_size + 1]
+
+    def set_page(self, results: list) -> list:
+        reverse = self.cursor is not None and self.cursor.reverse
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        return self.page
+
+    def get_position_filter(self, position, reverse: bool = False) -> Q:
+        """
+        Builds the predicate selecting rows strictly after `position` in the pagination ordering
+        (or strictly before it, when paginating in `reverse`).
+
+        For an ordering `(-a, b)` and position `(x, y)` it produces
+        `a <= x AND (a < x OR (a = x AND b > y))`. The redundant bound on the first field
+        lets the database start an index range scan at the position instead of filtering.
+        """
+
+        predicate = Q()
+        preceding_fields = {}
+
+        for field_name, value in zip(self.ordering, position):
+            descending = field_name.startswith('-')
+            field_name = field_name.lstrip('-')
+            lookup = 'lt' if descending != reverse else 'gt'
+
+            predicate |= Q(**preceding_fields, **{f'{field_name}__{lookup}': value})
+            preceding_fields[field_name] = value
+
+        first_field_name = self.ordering[0]
+        first_lookup = 'lte' if first_field_name.startswith('-') != reverse else 'gte'
+
+        return Q(**{f'{first_field_name.lstrip("-")}__{first_lookup}': position[0]}) & predicate
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+
+        return self.encode_cursor(
+            KeysetCursor(position=self._get_position_from_instance(self.page[-1]), reverse=False)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+
+        return self.encode_cursor(
+            KeysetCursor(position=self._get_position_from_instance(self.page[0]), reverse=True)
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            values = tokens['p']
+            if len(values) != len(self.ordering_fields):
+                raise ValueError('Cursor position does not match the ordering')
+
+            position = tuple(
+                field.to_python(value) for field, value in zip(self.ordering_fields, values)
+            )
+            reverse = bool(tokens.get('r', False))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return KeysetCursor(position=position, reverse=reverse)
+
+    def encode_cursor(self, cursor):
+        tokens = {'p': [self._encode_value(value) for value in cursor.position]}
+        if cursor.reverse:
+            tokens['r'] = 1
+
+        encoded = urlsafe_b64encode(json.dumps(tokens, separators=(',', ':')).encode('ascii'))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def _get_position_from_instance(self, instance, ordering=None):
+        position = []
+        for field in self.ordering_fields:
+            if isinstance(instance, dict):
+                position.append(instance[field.attname])
+            else:
+                position.append(getattr(instance, field.attname))
+        return tuple(position)
+
+    @staticmethod
+    def _encode_value(value):
+        # datetimes keep their microseconds, unlike with `DjangoJSONEncoder`
+        if isinstance(value, date):
+            return value.isoformat()
+        if isinstance(value, UUID):
+            return str(value)
+        return value
+
+    @staticmethod
+    def _reverse_field_ordering(field_name: str) -> str:
+        return field_name[1:] if field_name.startswith('-') else f'-{field_name}'
@@ -0,0 +1,70 @@
+import codecs
+import csv
+import json
+from typing import Iterator
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class StreamingRowsParser(BaseParser):
+    """
+    Base class for parsers of row based bodies.
+
+    `parse` returns a lazy iterator of `dict` rows, so `request.data` can be consumed
+    in chunks without loading the whole body into memory.
+    Parse errors are raised while iterating.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None) -> Iterator[dict]:
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        return self.iter_rows(codecs.iterdecode(stream, encoding))
+
+    def iter_rows(self, lines: Iterator[str]) -> Iterator[dict]:
+        raise NotImplementedError('`iter_rows()` must be implemented.')  # pragma: no cover
+
+
+class NDJSONParser(StreamingRowsParser):
+    """
+    Parses newline delimited JSON, one object per line. Blank lines are skipped.
+    """
+
+    media_type = 'application/x-ndjson'
+
+    def iter_rows(self, lines: Iterator[str]) -> Iterator[dict]:
+        for line_number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                raise ParseError(f'NDJSON parse error on line {line_number} - {exc}')
+
+            if not isinstance(row, dict):
+                raise ParseError(f'NDJSON parse error on line {line_number} - expected an object')
+
+            yield row
+
+
+class CSVParser(StreamingRowsParser):
+    """
+    Parses CSV with a header row. Each following line becomes a `dict` keyed by the header.
+    """
+
+    media_type = 'text/csv'
+
+    def iter_rows(self, lines: Iterator[str]) -> Iterator[dict]:
+        reader = csv.DictReader(lines)
+        try:
+            for row in reader:
+                if None in row:
+                    raise ParseError(
+                        f'CSV parse error on line {reader.line_num} - more values than columns'
+                    )
+                yield row
+        except csv.Error as exc:
+            raise ParseError(f'CSV parse error on line {reader.line_num} - {exc}')
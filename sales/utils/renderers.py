@@ -0,0 +1,123 @@
+import csv
+import io
+from typing import Iterable, Iterator, Optional, Sequence
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` encoding with `orjson`, several times faster on large pages. The output is
+    the same: compact UTF-8 JSON, where values orjson does not encode the same way (decimals,
+    dates and times, lazy strings) go through the DRF `JSONEncoder`, so decimals are numbers
+    with `COERCE_DECIMAL_TO_STRING: False`.
+
+    Falls back to `JSONRenderer` for indented output (browsable API) and with non default
+    `UNICODE_JSON` or `COMPACT_JSON` settings.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if (
+            data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type or '', renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+        # like `JSONRenderer`, escape the line separators which are invalid in JavaScript strings
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders MessagePack (`Accept: application/msgpack` or `?format=msgpack`), with `msgpack`.
+    Values are converted like in JSON responses: decimals are floats,
+    dates, times and UUIDs are strings.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b''
+
+        return msgpack.packb(data, default=JSONEncoder().default)
+
+
+class StreamingRowsRenderer(BaseRenderer):
+    """
+    Base class for renderers of row based bodies.
+
+    `iter_render` lazily encodes an iterable of `dict` rows into byte chunks of roughly
+    `chunk_size` rows, to be used as the content of a `StreamingHttpResponse`.
+    `render` encodes small, non-streamed payloads, like error responses.
+    """
+
+    charset = 'utf-8'
+    chunk_size = 500
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b''
+
+        rows = data if isinstance(data, list) else [data]
+        fieldnames = list(rows[0].keys()) if rows else []
+        return b''.join(self.iter_render(rows, fieldnames=fieldnames))
+
+    def iter_render(
+        self,
+        rows: Iterable[dict],
+        fieldnames: Optional[Sequence[str]] = None,
+    ) -> Iterator[bytes]:
+        raise NotImplementedError('`iter_render()` must be implemented.')  # pragma: no cover
+
+
+class NDJSONRenderer(StreamingRowsRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def iter_render(self, rows, fieldnames=None):
+        encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        lines = []
+        for row in rows:
+            lines.append(encoder.encode(row))
+            if len(lines) >= self.chunk_size:
+                yield ('\n'.join(lines) + '\n').encode(self.charset)
+                lines = []
+
+        if lines:
+            yield ('\n'.join(lines) + '\n').encode(self.charset)
+
+
+class CSVRenderer(StreamingRowsRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def iter_render(self, rows, fieldnames=None):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames or [], extrasaction='ignore')
+        writer.writeheader()
+
+        for index, row in enumerate(rows, start=1):
+            writer.writerow(row)
+            if index % self.chunk_size == 0:
+                yield buffer.getvalue().encode(self.charset)
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode(self.charset)
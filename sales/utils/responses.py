@@ -0,0 +1,78 @@
+import gzip
+import json
+import re
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .metrics import record_compressed_response
+
+# like `GZipMiddleware`, which does not parse quality values either
+ACCEPTS_GZIP_RE = re.compile(r'\bgzip\b')
+
+
+class CompressedJSONResponse(Response):
+    """
+    Response of JSON content rendered and gzip compressed in advance, e.g. stored in a cache.
+
+    When the JSON renderer is negotiated, clients accepting gzip get the compressed content as is,
+    with `Content-Encoding: gzip`, and others the decompressed content. Other renderers
+    (browsable API, MessagePack) render `data`, decoded from the content when first accessed.
+    """
+
+    def __init__(self, compressed_content: bytes, **kwargs):
+        self.compressed_content = compressed_content
+        self._data = None
+        super().__init__(**kwargs)
+        patch_vary_headers(self, ('Accept-Encoding',))
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = json.loads(gzip.decompress(self.compressed_content), parse_float=Decimal)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        # `Response` initializes it to `None`, the data is the decoded content
+        pass
+
+    @property
+    def rendered_content(self):
+        renderer = self.accepted_renderer
+        if not isinstance(renderer, JSONRenderer) or renderer.get_indent(
+            self.accepted_media_type, self.renderer_context
+        ):
+            record_compressed_response('rendered')
+            return super().rendered_content
+
+        self['Content-Type'] = renderer.media_type
+        request = self.renderer_context.get('request')
+        if request is not None and ACCEPTS_GZIP_RE.search(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        ):
+            record_compressed_response('gzip')
+            self['Content-Encoding'] = 'gzip'
+            return self.compressed_content
+
+        record_compressed_response('identity')
+        return gzip.decompress(self.compressed_content)
+
+
+class IteratorStreamingHttpResponse(StreamingHttpResponse):
+    """
+    `StreamingHttpResponse` of a synchronous iterator, e.g. of rows read from the database,
+    streamed chunk by chunk by both the WSGI and the ASGI applications.
+
+    The ASGI handler reads synchronous iterators whole before sending them, so chunks are read one
+    at a time, in the thread of the sync view, which holds the database connection of the iterator.
+    """
+
+    async def __aiter__(self):
+        iterator = iter(self.streaming_content)
+        while (chunk := await sync_to_async(next)(iterator, None)) is not None:
+            yield chunk
@@ -0,0 +1,78 @@
+"""
+Routing of reads to the replicas of the primary (`default`) database.
+
+Views opt in with `ReplicaReadViewMixin`, which picks a random replica of `DATABASE_REPLICAS`
+for the reads of each safe request, through a context variable read by `ReplicaRouter`.
+Other reads, and all writes, go to the primary database.
+
+Replicas lag behind the primary, so users who just wrote are pinned to the primary for
+`DATABASE_REPLICA_PIN_TIMEOUT` seconds, to read their own writes.
+"""
+
+import random
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AbstractBaseUser, AnonymousUser  # pragma: no cover
+
+_read_database: 'ContextVar[Optional[str]]' = ContextVar('read_database', default=None)
+
+
+def _get_primary_pin_key(user: 'AbstractBaseUser') -> str:
+    return f'database.primary_pin.{user.pk}'
+
+
+def pin_to_primary(user: 'AbstractBaseUser | AnonymousUser') -> None:
+    """
+    Routes the reads of `user` to the primary database for `DATABASE_REPLICA_PIN_TIMEOUT` seconds.
+    """
+
+    if settings.DATABASE_REPLICAS and user.is_authenticated:
+        cache.set(_get_primary_pin_key(user), True, settings.DATABASE_REPLICA_PIN_TIMEOUT)
+
+
+def is_pinned_to_primary(user: 'AbstractBaseUser | AnonymousUser') -> bool:
+    return user.is_authenticated and cache.get(_get_primary_pin_key(user), False)
+
+
+def choose_replica() -> Optional[str]:
+    """
+    Returns:
+        str | None: The alias of a random replica, or `None` without replicas.
+    """
+
+    replicas = settings.DATABASE_REPLICAS
+    return random.choice(replicas) if replicas else None
+
+
+def set_read_database(alias: Optional[str]) -> None:
+    """
+    Routes the reads of the current context to the `alias` database, or the primary one if `None`.
+    """
+
+    _read_database.set(alias)
+
+
+class ReplicaRouter:
+    """
+    Routes reads to the database set with `set_read_database`, and writes to the primary database.
+    """
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints) -> str:
+        # including instances read from a replica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        # replicas hold the data of the primary
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
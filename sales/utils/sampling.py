@@ -0,0 +1,59 @@
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from django.db.models.sql.datastructures import BaseTable
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet  # pragma: no cover
+
+TABLESAMPLE_METHODS = ('SYSTEM', 'BERNOULLI')
+
+
+class SampledBaseTable(BaseTable):
+    """
+    Base table reference rendered with a `TABLESAMPLE` clause (PostgreSQL), e.g.
+    `FROM "sales_salesrecord" TABLESAMPLE SYSTEM (1)`.
+    """
+
+    def __init__(self, table_name: str, alias: str, percent: Decimal, method: str = 'SYSTEM'):
+        assert method in TABLESAMPLE_METHODS, f'Unsupported TABLESAMPLE method {method}'
+        super().__init__(table_name, alias)
+        self.percent = percent
+        self.method = method
+
+    def as_sql(self, compiler, connection):
+        sql, params = super().as_sql(compiler, connection)
+        return f'{sql} TABLESAMPLE {self.method} (%s)', [*params, self.percent]
+
+    def relabeled_clone(self, change_map):
+        return self.__class__(
+            self.table_name,
+            change_map.get(self.table_alias, self.table_alias),
+            percent=self.percent,
+            method=self.method,
+        )
+
+    @property
+    def identity(self):
+        return *super().identity, self.percent, self.method
+
+
+def tablesample(queryset: 'QuerySet', percent: Decimal, method: str = 'SYSTEM') -> 'QuerySet':
+    """
+    Returns a copy of `queryset` reading a random sample of `percent` % of its base table.
+
+    `SYSTEM` samples whole table pages, so it only reads the sampled fraction of the table,
+    but rows stored together are sampled together. `BERNOULLI` samples individual rows,
+    giving unbiased error estimates, at the cost of reading the whole table.
+    """
+
+    queryset = queryset.all()
+    alias = queryset.query.get_initial_alias()
+    base_table = queryset.query.alias_map[alias]
+    queryset.query.alias_map[alias] = SampledBaseTable(
+        base_table.table_name,
+        base_table.table_alias,
+        percent=percent,
+        method=method,
+    )
+    return queryset
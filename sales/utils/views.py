@@ -0,0 +1,136 @@
+import inspect
+from time import perf_counter
+
+from asgiref.sync import sync_to_async
+from django.utils.http import http_date
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .cache import CACHE_HIT, CACHE_MISS, aget_cache_generation, aget_or_set_single_flight
+from .metrics import record_cache_lookup, record_phase
+from .mixins import CachedListMixin
+
+
+class AsyncAPIView(APIView):
+    """
+    `APIView` with an async `dispatch`, for `async def` handlers served by the ASGI application.
+
+    Authentication, permission and throttle checks may query the database and the cache through
+    blocking clients, so they run in a worker thread. Handlers run on the event loop and should
+    only use the async ORM and cache APIs.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncGenericAPIView(AsyncAPIView, GenericAPIView):
+    """
+    `GenericAPIView` counterpart of `AsyncAPIView`.
+
+    Pagination classes must implement `apaginate_queryset`.
+    """
+
+    async def afilter_queryset(self, queryset):
+        # filter sets may evaluate small lookups while filtering, like category ids
+        return await sync_to_async(self.filter_queryset)(queryset)
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+
+class AsyncListAPIView(CachedListMixin, AsyncGenericAPIView):
+    """
+    Async counterpart of `ListAPIView`, caching responses like `CachedListMixin`
+    when `cache_key_prefix` is set.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        if self.cache_key_prefix is None:
+            return Response(await self.aget_list_data())
+
+        start_time = perf_counter()
+        generation = await aget_cache_generation(self.cache_key_prefix)
+        cache_key = self.get_cache_key(request)
+        if cache_key is None:
+            return Response(await self.aget_list_data())
+
+        etag = self.get_etag(cache_key, generation)
+        if 'If-None-Match' in request.headers:
+            not_modified_response = self.get_not_modified_response(
+                request, CACHE_HIT, {'ETag': etag}
+            )
+            if not_modified_response is not None:
+                record_phase('cache', perf_counter() - start_time)
+                return not_modified_response
+
+        compute_duration = 0
+
+        async def compute():
+            nonlocal compute_duration
+            compute_start_time = perf_counter()
+            try:
+                return self.get_cache_content(await self.aget_list_data()), {
+                    'ETag': etag,
+                    'Last-Modified': http_date(),
+                    **self.get_response_headers(request),
+                }
+            finally:
+                compute_duration = perf_counter() - compute_start_time
+
+        (compressed_content, headers), result = await aget_or_set_single_flight(
+            cache_key,
+            compute,
+            generation=generation,
+            timeout=self.cache_timeout,
+            stale_timeout=self.cache_stale_timeout,
+        )
+
+        record_cache_lookup(self.cache_key_prefix, result)
+        record_phase(
+            'cache',
+            perf_counter() - start_time - (compute_duration if result == CACHE_MISS else 0),
+        )
+        not_modified_response = self.get_not_modified_response(request, result, headers)
+        if not_modified_response is not None:
+            return not_modified_response
+        return self.get_cached_response(compressed_content, result, headers)
+
+    async def aget_list_data(self):
+        queryset = await self.afilter_queryset(self.get_queryset())
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data).data
+
+        serializer = self.get_serializer([instance async for instance in queryset], many=True)
+        return serializer.data